@@ -0,0 +1,73 @@
+"""
+Checks every installed BLS backend against the py_ecc generated vectors in
+bls_vectors.json (out of range private keys must be rejected), then times public key derivation, signing and add_validator
+calldata generation per backend.
+
+    python benchmarks/bls_backends.py --count 20
+"""
+import argparse
+import json
+import os
+import time
+
+from staking_sdk_py.blsBackend import available_backends, get_bls_backend
+from staking_sdk_py.generateCalldata import add_validator
+from staking_sdk_py.keyGenerator import KeyGenerator
+
+VECTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bls_vectors.json")
+
+SECP_PRIVATE_KEY = "0x" + "4c" * 32
+AUTH_ADDRESS = "0x" + "11" * 20
+
+
+def check_vectors(backend, vectors: list):
+    for index, vector in enumerate(vectors):
+        private_key = int(vector["private_key"], 16)
+        message = bytes.fromhex(vector["message"][2:])
+        if vector.get("invalid"):
+            for func, args in ((backend.sk_to_pk, (private_key,)), (backend.sign, (private_key, message))):
+                try:
+                    func(*args)
+                except ValueError:
+                    continue
+                raise SystemExit(f"{backend.name}: {func.__name__} accepts the out of range key of vector {index}")
+            continue
+        if "0x" + backend.sk_to_pk(private_key).hex() != vector["public_key"]:
+            raise SystemExit(f"{backend.name}: public key of vector {index} differs")
+        if "0x" + backend.sign(private_key, message).hex() != vector["signature"]:
+            raise SystemExit(f"{backend.name}: signature of vector {index} differs")
+
+
+def timed(count: int, func) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10, help="operations timed per backend")
+    args = parser.parse_args()
+
+    with open(VECTORS_PATH, "r") as f:
+        vectors = json.load(f)
+
+    print(f"{'backend':<10} {'SkToPk ms':>10} {'Sign ms':>10} {'add_validator ms':>17}")
+    for name in available_backends():
+        backend = get_bls_backend(name)
+        check_vectors(backend, vectors)
+        private_keys = [int(vector["private_key"], 16) for vector in vectors if not vector.get("invalid")]
+
+        def calldata(i):
+            keys = KeyGenerator.from_keys(SECP_PRIVATE_KEY, "%064x" % private_keys[i % len(private_keys)], backend)
+            add_validator(keys, 10**24, AUTH_ADDRESS, i)
+
+        sk_to_pk = timed(args.count, lambda i: backend.sk_to_pk(private_keys[i % len(private_keys)]))
+        sign = timed(args.count, lambda i: backend.sign(private_keys[i % len(private_keys)], i.to_bytes(194, "big")))
+        print(f"{name:<10} {sk_to_pk:>10.2f} {sign:>10.2f} {timed(args.count, calldata):>17.2f}")
+    print(f"All backends match the {len(vectors)} vectors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Import-time regression check for the CLI startup.
+
+Imports main.py plus the module of each command in a fresh interpreter, with
+-X importtime, and fails when a command goes over its budget or loads a heavy
+dependency it does not need (py_ecc, blake3, Ledger libraries).
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 5 --scale 2   # slower machines
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+CLI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "staking-cli")
+
+# command: (modules imported when it runs, budget in ms)
+COMMANDS = {
+    "startup": ([], 200),
+    "query": (["src.query_menu"], 1500),
+    # a query answered by the serve daemon must not load web3
+    "query (daemon)": (["src.serve_client"], 200),
+    "serve": (["src.signer", "src.serve"], 1500),
+    "delegate": (["src.signer", "src.delegate"], 1500),
+    "auto-compound": (["src.signer", "src.auto_compound"], 1500),
+    "batch": (["src.signer", "src.batch"], 1500),
+    "broadcast": (["src.offline"], 1500),
+    "keys": (["src.keys"], 1500),
+    "add-validator": (["src.signer", "src.add_validator"], 1500),
+}
+
+# modules only the commands dealing with validator keys, or Ledger signing, may load
+HEAVY_MODULES = ("py_ecc", "blake3", "ledgerblue", "ledgereth")
+ALLOWED = {
+    "add-validator": ("blake3",),
+}
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(modules: list) -> tuple:
+    """Returns (total import time in ms, names of all imported modules)"""
+    code = "; ".join(["import main"] + [f"import {module}" for module in modules])
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=CLI_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        imported.add(match.group(4))
+        # top level imports carry the cumulative time of everything below them
+        if len(match.group(3)) == 1:
+            total += int(match.group(2))
+    return total / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per command, the median is used")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier applied to every budget")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'command':<15} {'import ms':>10} {'budget ms':>10}")
+    for command, (modules, budget) in COMMANDS.items():
+        samples = [measure(modules) for _ in range(args.runs)]
+        elapsed = statistics.median(sample[0] for sample in samples)
+        imported = samples[0][1]
+        budget *= args.scale
+        print(f"{command:<15} {elapsed:>10.1f} {budget:>10.0f}")
+        if elapsed > budget:
+            failures.append(f"{command}: imports took {elapsed:.1f} ms, budget is {budget:.0f} ms")
+        for heavy in HEAVY_MODULES:
+            if heavy in imported and heavy not in ALLOWED.get(command, ()):
+                failures.append(f"{command}: imports {heavy}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("All commands are within their import budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Load generator for staking RPC workloads: concurrent accounts run a weighted mix of
+getters and delegate / claim / compound transactions at a target total rate, and the
+throughput, latency percentiles and error rates of every operation are reported.
+
+    python benchmarks/loadgen.py --simulator --accounts 50 --rate 200 --duration 30
+    python benchmarks/loadgen.py --rpc-url http://127.0.0.1:8545 --keys-file keys.txt \\
+        --mix get_validator=6,get_delegator=3,delegate=1 --rate 50 --output run.json
+
+Every account is a thread with its own connection, nonce manager and schedule, and all
+of them share a fee oracle, a gas profile and a receipt tracker like the batch command.
+The load is open loop: operations are due at fixed times whatever the endpoint does,
+and latency is measured from the time an operation was due, so an endpoint that falls
+behind shows up in the percentiles instead of silently lowering the rate.
+
+Against a real endpoint the accounts of --keys-file (one private key per line) must be
+funded. Without it the accounts are derived from --seed, which only works against the
+simulator, where every account starts funded.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from eth_utils import keccak
+
+import staking_sdk_py.constants as constants
+from staking_sdk_py import generateCalldata
+from staking_sdk_py.callGetters import call_getter
+from staking_sdk_py.feeOracle import FeeOracle
+from staking_sdk_py.gasProfile import GasProfile
+from staking_sdk_py.generateTransaction import send_transaction
+from staking_sdk_py.metrics import METRICS
+from staking_sdk_py.nonceManager import NonceManager
+from staking_sdk_py.receiptTracker import ReceiptTracker
+from staking_sdk_py.rpcProvider import connect
+from staking_sdk_py.signer_factory import LocalSigner
+from staking_sdk_py.simulator import Simulator, StakingState, serve
+
+CONTRACT_ADDRESS = constants.CONTRACTADDRESS
+ZERO_ADDRESS = "0x" + "00" * 20
+
+DEFAULT_MIX = "get_validator=4,get_delegator=3,get_epoch=1,get_delegations=1,delegate=1,claim=1,compound=1"
+WRITES = ("delegate", "claim", "compound")
+GETTERS = (
+    "get_epoch",
+    "get_validator",
+    "get_delegator",
+    "get_delegations",
+    "get_delegators",
+    "get_consensus_valset",
+    "get_execution_valset",
+)
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for entry in mix.split(","):
+        name, _, weight = entry.strip().partition("=")
+        if name not in GETTERS + WRITES:
+            raise SystemExit(f"Unknown operation {name} in --mix, choose from {', '.join(GETTERS + WRITES)}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: list, percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Latencies and errors per operation, shared by all account threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.reverts: Dict[str, Counter] = {}
+
+    def ok(self, operation: str, latency: float):
+        with self._lock:
+            self.latencies.setdefault(operation, []).append(latency)
+
+    def error(self, operation: str, error: BaseException):
+        """Counts a failure, as a revert when the node executed and rejected the operation"""
+        message = str(error.args[0] if error.args else type(error).__name__).splitlines()[0][:100]
+        failures = self.reverts if "reverted" in message else self.errors
+        with self._lock:
+            failures.setdefault(operation, Counter())[message] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        with self._lock:
+            operations = sorted(set(self.latencies) | set(self.errors) | set(self.reverts))
+            summary = {}
+            for operation in operations:
+                latencies = sorted(self.latencies.get(operation, []))
+                errors = sum(self.errors.get(operation, Counter()).values())
+                reverts = sum(self.reverts.get(operation, Counter()).values())
+                total = len(latencies) + errors + reverts
+                summary[operation] = {
+                    "ok": len(latencies),
+                    "reverts": reverts,
+                    "errors": errors,
+                    "error_rate": errors / total if total else 0.0,
+                    "throughput": len(latencies) / elapsed,
+                    "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+                    "p90_ms": percentile(latencies, 90) * 1000 if latencies else None,
+                    "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+                    "max_ms": latencies[-1] * 1000 if latencies else None,
+                    "top_errors": dict(
+                        (self.errors.get(operation, Counter()) + self.reverts.get(operation, Counter())).most_common(3)
+                    ),
+                }
+            return summary
+
+
+class Account:
+    """One simulated delegator running its share of the schedule on its own thread"""
+
+    def __init__(self, index: int, private_key: str, load: "LoadGenerator"):
+        self.index = index
+        self.load = load
+        self.signer = LocalSigner(private_key)
+        self.address = self.signer.get_address()
+        self.w3 = connect(load.rpc_url)
+        self.nonce_manager = NonceManager(self.w3, self.address)
+        self.random = random.Random(load.seed * 100_003 + index)
+        # validators this account delegated to during the run, targets of claim and compound
+        self.delegated: List[int] = []
+
+    def run(self, start: float, interval: float, end: float):
+        # accounts are offset so the total rate is spread evenly over time
+        due = start + interval * self.index / len(self.load.accounts)
+        while due < end:
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            operation = self.random.choices(self.load.operations, self.load.weights)[0]
+            if operation in ("claim", "compound") and not self.delegated:
+                operation = "delegate"
+            try:
+                self.execute(operation, due)
+            except Exception as e:
+                self.load.recorder.error(operation, e)
+                if operation in WRITES and "reverted" not in str(e):
+                    # a rejected transaction may leave the local nonce ahead of the chain
+                    self.nonce_manager.resync()
+            due += interval
+
+    def execute(self, operation: str, due: float):
+        validator_id = self.random.choice(self.load.validator_ids)
+        if operation in WRITES:
+            if operation == "delegate":
+                data, value = generateCalldata.delegate(validator_id), self.load.amount
+            else:
+                validator_id = self.random.choice(self.delegated)
+                builder = generateCalldata.claim_rewards if operation == "claim" else generateCalldata.compound
+                data, value = builder(validator_id), 0
+            tx_hash = send_transaction(
+                self.w3,
+                self.signer,
+                CONTRACT_ADDRESS,
+                data,
+                self.load.chain_id,
+                value,
+                nonce_manager=self.nonce_manager,
+                fee_oracle=self.load.fee_oracle,
+                gas_profile=self.load.gas_profile,
+            )
+            self.load.recorder.ok(operation, time.perf_counter() - due)
+            if self.load.tracker is not None:
+                self.load.confirm(self, operation, validator_id, tx_hash, due)
+            elif operation == "delegate" and validator_id not in self.delegated:
+                self.delegated.append(validator_id)
+            return
+        args = {
+            "get_epoch": (),
+            "get_validator": (validator_id,),
+            "get_delegator": (validator_id, self.address),
+            "get_delegations": (self.address, 0),
+            "get_delegators": (validator_id, ZERO_ADDRESS),
+            "get_consensus_valset": (0,),
+            "get_execution_valset": (0,),
+        }[operation]
+        call_getter(self.w3, operation, CONTRACT_ADDRESS, *args)
+        self.load.recorder.ok(operation, time.perf_counter() - due)
+
+
+class LoadGenerator:
+    def __init__(
+        self,
+        rpc_url: str,
+        private_keys: List[str],
+        mix: Dict[str, float],
+        amount: int,
+        validator_ids: Optional[List[int]] = None,
+        confirm: bool = True,
+        seed: int = 0,
+    ):
+        self.rpc_url = rpc_url
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.amount = amount
+        self.seed = seed
+        self.recorder = Recorder()
+        self.w3 = connect(rpc_url)
+        self.chain_id = self.w3.eth.chain_id
+        self.validator_ids = validator_ids or self._execution_valset()
+        if not self.validator_ids:
+            raise SystemExit("No validators to target, pass --validator-ids")
+        self.fee_oracle = FeeOracle(self.w3)
+        self.gas_profile = GasProfile()
+        self.tracker = ReceiptTracker(self.w3, poll_interval=0.2) if confirm else None
+        self._confirming: List[Future] = []
+        self.accounts = [Account(index, key, self) for index, key in enumerate(private_keys)]
+
+    def _execution_valset(self) -> List[int]:
+        validator_ids, start, done = [], 0, False
+        while not done:
+            done, start, page = call_getter(self.w3, "get_execution_valset", CONTRACT_ADDRESS, start)
+            validator_ids.extend(page)
+        return validator_ids
+
+    def confirm(self, account: Account, operation: str, validator_id: int, tx_hash: str, due: float):
+        """Records the time until the receipt, and failed transactions as reverts"""
+        name = f"{operation}.receipt"
+
+        def done(future: Future):
+            try:
+                receipt = future.result()
+            except Exception as e:
+                self.recorder.error(name, e)
+                return
+            self.gas_profile.observe(receipt)
+            if receipt["status"] == 1:
+                self.recorder.ok(name, time.perf_counter() - due)
+                if operation == "delegate" and validator_id not in account.delegated:
+                    account.delegated.append(validator_id)
+            else:
+                self.recorder.error(name, RuntimeError("transaction reverted"))
+
+        future = self.tracker.track(tx_hash)
+        future.add_done_callback(done)
+        self._confirming.append(future)
+
+    def run(self, rate: float, duration: float, receipt_timeout: float = 60) -> dict:
+        interval = len(self.accounts) / rate
+        start = time.perf_counter()
+        rpc_requests = METRICS.total("staking_rpc_requests_total")
+        rpc_errors = METRICS.total("staking_rpc_errors_total")
+        threads = [
+            threading.Thread(target=account.run, args=(start, interval, start + duration), daemon=True)
+            for account in self.accounts
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if self.tracker is not None:
+            deadline = time.monotonic() + receipt_timeout
+            for future in self._confirming:
+                try:
+                    future.result(timeout=max(0, deadline - time.monotonic()))
+                except Exception:
+                    pass
+            self.tracker.stop()
+        operations = self.recorder.summary(elapsed)
+        submitted = sum(
+            stats["ok"] + stats["reverts"] + stats["errors"] for name, stats in operations.items() if not name.endswith(".receipt")
+        )
+        return {
+            "rpc_url": self.rpc_url,
+            "accounts": len(self.accounts),
+            "target_rate": rate,
+            "duration": elapsed,
+            "achieved_rate": submitted / elapsed,
+            "rpc_requests": int(METRICS.total("staking_rpc_requests_total") - rpc_requests),
+            "rpc_errors": int(METRICS.total("staking_rpc_errors_total") - rpc_errors),
+            "operations": operations,
+        }
+
+
+def print_report(report: dict):
+    print(
+        f"{report['accounts']} accounts, target {report['target_rate']:.0f} ops/s, "
+        f"achieved {report['achieved_rate']:.1f} ops/s over {report['duration']:.1f}s, "
+        f"{report['rpc_requests']} RPC requests ({report['rpc_requests'] / report['duration']:.0f}/s), "
+        f"{report['rpc_errors']} RPC errors"
+    )
+    print(f"{'operation':<24}{'ok':>8}{'reverts':>8}{'errors':>8}{'err %':>8}{'ops/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, stats in report["operations"].items():
+        latencies = "".join(
+            f"{stats[key]:>9.1f}" if stats[key] is not None else f"{'-':>9}"
+            for key in ("p50_ms", "p90_ms", "p99_ms", "max_ms")
+        )
+        print(
+            f"{name:<24}{stats['ok']:>8}{stats['reverts']:>8}{stats['errors']:>8}{stats['error_rate'] * 100:>8.1f}"
+            f"{stats['throughput']:>9.1f}{latencies}"
+        )
+    for name, stats in report["operations"].items():
+        for message, count in stats["top_errors"].items():
+            print(f"  {name}: {count} x {message}")
+
+
+def private_keys(args) -> List[str]:
+    if args.keys_file:
+        with open(args.keys_file) as f:
+            keys = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        return keys[:args.accounts] if args.accounts else keys
+    return ["0x" + keccak(text=f"loadgen-{args.seed}-{index}").hex() for index in range(args.accounts or 20)]
+
+
+def parse_ids(value: str) -> List[int]:
+    ids = []
+    for part in value.split(","):
+        first, _, last = part.partition("-")
+        ids.extend(range(int(first), int(last or first) + 1))
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--rpc-url", help="endpoint to load")
+    target.add_argument("--simulator", action="store_true", help="start a local staking simulator and load it")
+    parser.add_argument("--accounts", type=int, help="concurrent accounts (default 20, or every key of --keys-file)")
+    parser.add_argument("--keys-file", help="private keys of funded accounts, one per line")
+    parser.add_argument("--seed", type=int, default=0, help="seed of derived accounts and of the operation choices")
+    parser.add_argument("--rate", type=float, default=50, help="target operations per second over all accounts")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to generate load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"weighted operations (default {DEFAULT_MIX})")
+    parser.add_argument("--amount", type=float, default=0.01, help="MON per delegate transaction")
+    parser.add_argument("--validator-ids", type=parse_ids, help="validators to target, e.g. 1-50,60 (default: the execution set)")
+    parser.add_argument("--no-confirm", action="store_true", help="do not wait for receipts of the transactions")
+    parser.add_argument("--receipt-timeout", type=float, default=60, help="seconds to wait for receipts after the run")
+    parser.add_argument("--output", help="also write the report as JSON to this path")
+    simulator = parser.add_argument_group("simulator")
+    simulator.add_argument("--sim-validators", type=int, default=100)
+    simulator.add_argument("--sim-delegators", type=int, default=10_000)
+    simulator.add_argument("--sim-block-time", type=float, default=0.5, help="seconds between blocks")
+    simulator.add_argument("--sim-epoch-blocks", type=int, default=10, help="blocks per epoch")
+    args = parser.parse_args()
+
+    rpc_url = args.rpc_url
+    if args.simulator:
+        state = StakingState()
+        state.populate(args.sim_validators, args.sim_delegators)
+        server = serve(Simulator(state, block_time=args.sim_block_time, epoch_blocks=args.sim_epoch_blocks))
+        rpc_url = f"http://127.0.0.1:{server.server_address[1]}"
+    elif not args.keys_file:
+        print("Warning: derived accounts are not funded on a real endpoint, pass --keys-file", file=sys.stderr)
+
+    load = LoadGenerator(
+        rpc_url,
+        private_keys(args),
+        parse_mix(args.mix),
+        int(args.amount * 10**18),
+        args.validator_ids,
+        confirm=not args.no_confirm,
+        seed=args.seed,
+    )
+    report = load.run(args.rate, args.duration, args.receipt_timeout)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Benchmark suite of the SDK hot paths: every generateCalldata builder, call_getter
+decoding of every GETTER_ABIS entry, LocalSigner signing, KeyGenerator construction,
+add_validator payloads, and the CLI's paginated queries end to end against the
+local staking simulator, and replayed from a recorded RPC cassette (.replay) for
+their CPU cost alone.
+
+Results are stored per release in benchmarks/results/<version>.json, so a run can be
+compared with the numbers of an earlier release:
+
+    python benchmarks/sdk.py                         # run and print
+    python benchmarks/sdk.py --save                  # store as the current version
+    python benchmarks/sdk.py --compare 0.0.1         # fail on regressions against 0.0.1
+    python benchmarks/sdk.py --filter calldata. --repeat 10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+from eth_abi import encode
+
+import staking_sdk_py.constants as constants
+from staking_sdk_py import generateCalldata
+from staking_sdk_py.__about__ import __version__
+from staking_sdk_py.blsBackend import available_backends, get_bls_backend
+from staking_sdk_py.callGetters import call_getter
+from staking_sdk_py.generateTransaction import build_transaction
+from staking_sdk_py.keyGenerator import KeyGenerator
+from staking_sdk_py.rpcCassette import Cassette
+from staking_sdk_py.signer_factory import LocalSigner, is_coincurve_available
+from staking_sdk_py.simulator import Simulator, StakingState, serve
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, "results")
+CLI_DIR = os.path.join(os.path.dirname(BENCHMARKS_DIR), "staking-cli")
+
+PRIVATE_KEY = "0x" + "4c" * 32
+SECP_PRIVATE_KEY = "4c" * 32
+BLS_PRIVATE_KEY = "0x00" + "1d" * 31
+ADDRESS = "0x" + "44" * 20
+ZERO_ADDRESS = "0x" + "00" * 20
+CONTRACT_ADDRESS = constants.CONTRACTADDRESS
+
+# entries per page of the paginated getters, as served by the precompile
+PAGE_SIZE = 100
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Registers a setup function returning the callable to time"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# ===== calldata builders =====
+
+CALLDATA_ARGS = {
+    "delegate": (1,),
+    "undelegate": (1, 10**18, 1),
+    "withdraw": (1, 1),
+    "compound": (1,),
+    "claim_rewards": (1,),
+    "change_commission": (1, 5 * 10**16),
+    "get_epoch": (),
+    "get_validator": (1,),
+    "get_delegator": (1, ADDRESS),
+    "get_withdrawal_request": (1, ADDRESS, 1),
+    "get_proposer_val_id": (),
+    "get_consensus_valset": (0,),
+    "get_snapshot_valset": (0,),
+    "get_execution_valset": (0,),
+    "get_delegations": (ADDRESS, 0),
+    "get_delegators": (1, ZERO_ADDRESS),
+}
+
+for _builder, _args in CALLDATA_ARGS.items():
+    benchmark(f"calldata.{_builder}")(
+        lambda builder=getattr(generateCalldata, _builder), args=_args: lambda: builder(*args)
+    )
+
+
+@benchmark("calldata.add_validator")
+def _add_validator():
+    keys = KeyGenerator.from_keys(SECP_PRIVATE_KEY, BLS_PRIVATE_KEY)
+    return lambda: generateCalldata.add_validator(keys, 100_000 * 10**18, ADDRESS)
+
+
+# ===== getter decoding =====
+
+# realistic responses: full pages for the paginated getters
+GETTER_RESULTS = {
+    "get_epoch": [812, False],
+    "get_validator": [ADDRESS, 1, 10**24, 10**20, 5 * 10**16, 10**18, 10**18, 10**24, 0, 5 * 10**16, b"\x02" * 33, b"\x03" * 48],
+    "get_delegator": [10**22, 10**18, 10**18, 0, 0, 812, 0],
+    "get_withdrawal_request": [10**18, 10**18, 813],
+    "get_proposer_val_id": [1],
+    "get_consensus_valset": [False, PAGE_SIZE, list(range(PAGE_SIZE))],
+    "get_snapshot_valset": [False, PAGE_SIZE, list(range(PAGE_SIZE))],
+    "get_execution_valset": [False, PAGE_SIZE, list(range(PAGE_SIZE))],
+    "get_delegations": [False, PAGE_SIZE, list(range(PAGE_SIZE))],
+    "get_delegators": [False, ADDRESS, ["0x" + f"{i:040x}" for i in range(PAGE_SIZE)]],
+}
+
+
+class _CannedEth:
+    def __init__(self, response: bytes):
+        self.response = response
+
+    def call(self, tx):
+        return self.response
+
+
+class _CannedWeb3:
+    """Answers eth_call with a fixed response, so only calldata building and decoding are timed"""
+
+    def __init__(self, response: bytes):
+        self.eth = _CannedEth(response)
+
+
+for _getter, _abi in constants.GETTER_ABIS.items():
+    benchmark(f"getter.{_getter}")(
+        lambda getter=_getter, abi=_abi: (
+            lambda w3=_CannedWeb3(encode(abi, GETTER_RESULTS[getter])):
+                lambda: call_getter(w3, getter, CONTRACT_ADDRESS, *CALLDATA_ARGS[getter])
+        )()
+    )
+
+
+# ===== signing and keys =====
+
+def _sign(backend: str):
+    signer = LocalSigner(PRIVATE_KEY, backend)
+    tx = build_transaction(
+        CONTRACT_ADDRESS, generateCalldata.delegate(1), 10143, 0, 200_000, 100 * 10**9, 2 * 10**9, 10**18
+    )
+    return lambda: signer.sign_transaction(tx)
+
+
+benchmark("signer.local.eth_account")(lambda: _sign("eth_account"))
+if is_coincurve_available():
+    benchmark("signer.local.coincurve")(lambda: _sign("coincurve"))
+
+
+def _keygen(backend: str):
+    bls_backend = get_bls_backend(backend)
+
+    def construct():
+        keys = KeyGenerator.from_keys(SECP_PRIVATE_KEY, BLS_PRIVATE_KEY, bls_backend)
+        return keys.secp_public_key, keys.bls_public_key, keys.eth_address
+
+    return construct
+
+
+for _backend in available_backends():
+    benchmark(f"keys.from_keys.{_backend}")(lambda backend=_backend: _keygen(backend))
+
+
+# ===== paginated queries against the simulator =====
+
+def _simulator() -> str:
+    """
+    Simulator on a random local port, with 3 pages of validators that ADDRESS delegates
+    to and 5 pages of delegators on validator 1
+    """
+    state = StakingState()
+    state.populate(validators=3 * PAGE_SIZE, delegators=0)
+    for index in range(5 * PAGE_SIZE - 1):
+        state.delegate("0x" + f"{index + 1:040x}", 10**18, 1)
+    for val_id in state.validators:
+        state.delegate(ADDRESS, 10**18, val_id)
+    server = serve(Simulator(state))
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+_stand_in = {}
+
+
+def _query(run, replay: bool = False):
+    """
+    Query against the simulator, or replayed with zero latency from a cassette recorded
+    against it, which leaves only the CPU cost of the query path
+    """
+    if CLI_DIR not in sys.path:
+        sys.path.insert(0, CLI_DIR)
+    from src import query, rpc
+
+    if "url" not in _stand_in:
+        _stand_in["url"] = _simulator()
+    config = {
+        "rpc_url": _stand_in["url"],
+        "contract_address": CONTRACT_ADDRESS,
+        "log_level": "warning",
+    }
+    rpc.use_cassette(None)
+    if replay:
+        path = os.path.join(tempfile.gettempdir(), f"staking-sdk-benchmark-{os.getpid()}.jsonl")
+        rpc.use_cassette(Cassette(path, "record"))
+        run(query, config)
+        rpc.close_cassette()
+        rpc.use_cassette(Cassette(path, "replay"))
+        os.remove(path)
+    return lambda: run(query, config)
+
+
+QUERIES = {
+    "query.validator_set": lambda query, config: query.get_validator_set(config, "consensus"),
+    "query.delegators_list": lambda query, config: query.get_delegators_list(config, 1),
+    "query.validators_list": lambda query, config: query.get_validators_list(config, ADDRESS),
+}
+for _name, _run in QUERIES.items():
+    benchmark(_name)(lambda run=_run: _query(run))
+for _name, _run in QUERIES.items():
+    benchmark(f"{_name}.replay")(lambda run=_run: _query(run, replay=True))
+
+
+# ===== runner =====
+
+def measure(func, repeat: int, min_time: float) -> dict:
+    """Median and best seconds per call over repeat rounds of at least min_time each"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    rounds = [seconds / number for seconds in timer.repeat(repeat=repeat, number=number)]
+    return {"median_us": statistics.median(rounds) * 1e6, "min_us": min(rounds) * 1e6, "calls": number * repeat}
+
+
+def results_path(name: str) -> str:
+    return name if name.endswith(".json") else os.path.join(RESULTS_DIR, f"{name}.json")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Prints the change against a stored run, returns the benchmarks slower by more than threshold"""
+    regressions = []
+    print(f"\nAgainst {baseline['version']} ({baseline['python']}, {baseline['machine']}):")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<36} new")
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<36} {before['median_us']:>12.2f} -> {result['median_us']:>12.2f} us {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed rounds per benchmark, the median is reported")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round")
+    parser.add_argument("--save", nargs="?", const=__version__, help="store results as this version (default: the SDK version)")
+    parser.add_argument("--compare", help="version or results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown reported as a regression (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'benchmark':<36} {'median us':>12} {'min us':>12} {'calls/s':>12}")
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(setup(), args.repeat, args.min_time)
+        print(f"{name:<36} {result['median_us']:>12.2f} {result['min_us']:>12.2f} {1e6 / result['median_us']:>12.0f}")
+
+    run = {
+        "version": args.save or __version__,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "timestamp": int(time.time()),
+        "results": results,
+    }
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = results_path(args.save)
+        if os.path.isfile(path):
+            # keep the benchmarks of a filtered run that are not part of this one
+            with open(path) as f:
+                run["results"] = dict(json.load(f)["results"], **results)
+        with open(path, "w") as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+        print(f"\nResults stored in {path}")
+    if args.compare:
+        with open(results_path(args.compare)) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\nFAIL {len(regressions)} benchmarks are more than {args.threshold:.0%} slower: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares LocalSigner throughput across signing paths and checks that they all produce
+identical signatures.
+
+    python benchmarks/signer_throughput.py --count 2000
+"""
+import argparse
+import time
+
+from eth_account import Account
+
+from staking_sdk_py.generateCalldata import delegate
+from staking_sdk_py.generateTransaction import build_transaction
+from staking_sdk_py.signer_factory import LocalSigner, is_coincurve_available
+
+PRIVATE_KEY = "0x" + "4c" * 32
+CONTRACT_ADDRESS = "0x0000000000000000000000000000000000001000"
+
+
+def transactions(count: int) -> list:
+    calldata = delegate(1)
+    return [
+        build_transaction(CONTRACT_ADDRESS, calldata, 10143, nonce, 200_000, 100 * 10**9, 2 * 10**9, 10**18)
+        for nonce in range(count)
+    ]
+
+
+def run(name: str, sign_many, txs: list) -> list:
+    start = time.perf_counter()
+    signed = sign_many(txs)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {len(txs) / elapsed:>10.0f} tx/s  {elapsed * 1000 / len(txs):>8.3f} ms/tx")
+    return signed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=1000, help="transactions signed per path")
+    args = parser.parse_args()
+
+    txs = transactions(args.count)
+    results = {
+        "eth_account.Account": run(
+            "eth_account.Account",
+            lambda txs: [Account.sign_transaction(tx, PRIVATE_KEY) for tx in txs],
+            txs,
+        ),
+    }
+    backends = ["eth_account"] + (["coincurve"] if is_coincurve_available() else [])
+    for backend in backends:
+        signer = LocalSigner(PRIVATE_KEY, backend)
+        name = f"LocalSigner {backend}"
+        results[name] = run(name, signer.sign_many, txs)
+    if not is_coincurve_available():
+        print("coincurve is not installed, skipped (pip install coincurve)")
+
+    baseline = [signed.raw_transaction for signed in results["eth_account.Account"]]
+    for name, signed in results.items():
+        if [s.raw_transaction for s in signed] != baseline:
+            raise SystemExit(f"{name} produced different signatures than eth_account")
+    print(f"All {len(results)} paths produced identical signatures")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures time-to-first-output and total run time of CLI commands, for the frozen
+binary built from monad-staking-cli.spec and for `python main.py`.
+
+    python benchmarks/startup.py --config-path ~/config.toml
+    python benchmarks/startup.py --binary dist/monad-staking-cli/monad-staking-cli -- query epoch
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+CLI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "staking-cli")
+DEFAULT_BINARY = os.path.join(CLI_DIR, "dist", "monad-staking-cli", "monad-staking-cli")
+
+
+def run(command: list) -> tuple:
+    """Returns (seconds until the first byte on stdout, seconds until exit)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=CLI_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    process.stdout.read(1)
+    first_output = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return first_output, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--binary", default=DEFAULT_BINARY, help="frozen binary to measure, skipped if missing")
+    parser.add_argument("--config-path", help="config passed to the command, required for commands talking to an RPC")
+    parser.add_argument("--runs", type=int, default=5, help="runs per command, the median is reported")
+    parser.add_argument("args", nargs="*", help="command to run (default: --help, and query epoch with a config)")
+    args = parser.parse_args()
+
+    commands = [args.args] if args.args else [["--help"]] + ([["query", "epoch"]] if args.config_path else [])
+    launchers = {"python main.py": [sys.executable, "main.py"]}
+    if os.path.isfile(args.binary):
+        launchers["frozen"] = [os.path.abspath(args.binary)]
+    else:
+        print(f"{args.binary} not found, build it with: pyinstaller --noconfirm monad-staking-cli.spec")
+
+    print(f"{'launcher':<16} {'command':<16} {'first output s':>15} {'total s':>9}")
+    for command in commands:
+        label = " ".join(command)
+        if args.config_path and command != ["--help"]:
+            command = command + ["--config-path", os.path.abspath(os.path.expanduser(args.config_path))]
+        for name, launcher in launchers.items():
+            samples = [run(launcher + command) for _ in range(args.runs)]
+            first_output = statistics.median(sample[0] for sample in samples)
+            total = statistics.median(sample[1] for sample in samples)
+            print(f"{name:<16} {label:<16} {first_output:>15.3f} {total:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
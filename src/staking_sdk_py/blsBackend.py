@@ -0,0 +1,135 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+# Order of the BLS12-381 subgroups, valid private keys are in [1, CURVE_ORDER)
+CURVE_ORDER = 0x73EDA753299D7D483339D80809A1D80553BDA402FFFE5BFEFFFFFFFF00000001
+
+# Domain separation tag of the BLS12-381 G2 proof-of-possession ciphersuite
+POP_DST = b"BLS_SIG_BLS12381G2_XMD:SHA-256_SSWU_RO_POP_"
+
+
+def check_private_key(private_key: int) -> int:
+    """
+    Native backends reduce out of range keys modulo the curve order, or sign with a
+    zero key, instead of rejecting them like py_ecc: every backend checks them here
+    """
+    if not isinstance(private_key, int) or not 0 < private_key < CURVE_ORDER:
+        raise ValueError("Invalid BLS private key, it must be in [1, CURVE_ORDER)")
+    return private_key
+
+
+class BlsBackend(ABC):
+    """
+    BLS12-381 signatures (G2ProofOfPossession ciphersuite, public keys in G1).
+
+    Every backend produces byte-identical public keys and signatures; native ones are
+    only faster than the pure Python py_ecc implementation.
+    """
+
+    name = ""
+
+    def sk_to_pk(self, private_key: int) -> bytes:
+        return self._sk_to_pk(check_private_key(private_key))
+
+    def sign(self, private_key: int, message: bytes) -> bytes:
+        return self._sign(check_private_key(private_key), message)
+
+    @abstractmethod
+    def _sk_to_pk(self, private_key: int) -> bytes:
+        pass
+
+    @abstractmethod
+    def _sign(self, private_key: int, message: bytes) -> bytes:
+        pass
+
+
+class BlstBackend(BlsBackend):
+    """Official supranational blst bindings, built from source (pip has no wheels)."""
+
+    name = "blst"
+
+    def __init__(self):
+        import blst
+        self._blst = blst
+
+    def _secret_key(self, private_key: int):
+        return self._blst.SecretKey().from_bendian(private_key.to_bytes(32, "big"))
+
+    def _sk_to_pk(self, private_key: int) -> bytes:
+        return bytes(self._blst.P1(self._secret_key(private_key)).compress())
+
+    def _sign(self, private_key: int, message: bytes) -> bytes:
+        point = self._blst.P2().hash_to(message, POP_DST, b"")
+        return bytes(point.sign_with(self._secret_key(private_key)).compress())
+
+
+class ArkworksBackend(BlsBackend):
+    """Rust arkworks bindings (pip install py_arkworks_bls12381)."""
+
+    name = "arkworks"
+
+    def __init__(self):
+        from py_arkworks_bls12381 import G1Point, G2Point, Scalar
+        self._g1 = G1Point
+        self._g2 = G2Point
+        self._scalar = Scalar
+
+    def _sk_to_pk(self, private_key: int) -> bytes:
+        return bytes((self._g1() * self._scalar(private_key)).to_compressed_bytes())
+
+    def _sign(self, private_key: int, message: bytes) -> bytes:
+        point = self._g2.hash_to_curve(message, POP_DST)
+        return bytes((point * self._scalar(private_key)).to_compressed_bytes())
+
+
+class PyEccBackend(BlsBackend):
+    """Pure Python reference implementation, always available."""
+
+    name = "py_ecc"
+
+    def __init__(self):
+        from py_ecc.bls import G2ProofOfPossession
+        self._bls = G2ProofOfPossession
+
+    def _sk_to_pk(self, private_key: int) -> bytes:
+        return self._bls.SkToPk(private_key)
+
+    def _sign(self, private_key: int, message: bytes) -> bytes:
+        return self._bls.Sign(private_key, message)
+
+
+# In order of preference
+BACKENDS = {
+    backend.name: backend for backend in (BlstBackend, ArkworksBackend, PyEccBackend)
+}
+
+_instances: Dict[str, BlsBackend] = {}
+
+
+def available_backends() -> List[str]:
+    names = []
+    for name in BACKENDS:
+        try:
+            get_bls_backend(name)
+        except ValueError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_bls_backend(name: Optional[str] = None) -> BlsBackend:
+    """Returns a shared backend instance, the fastest installed one when no name is given."""
+    if name is None:
+        for candidate in BACKENDS:
+            try:
+                return get_bls_backend(candidate)
+            except ValueError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown BLS backend {name}, choose from {', '.join(BACKENDS)}")
+    if name not in _instances:
+        try:
+            _instances[name] = BACKENDS[name]()
+        except ImportError as e:
+            raise ValueError(f"BLS backend {name} is not installed: {e}")
+    return _instances[name]
@@ -1,5 +1,8 @@
+import time
+
 from eth_abi.abi import decode
 import staking_sdk_py.constants as constants
+from staking_sdk_py.metrics import METRICS
 from staking_sdk_py.generateCalldata import (
     get_epoch,
     get_validator,
@@ -26,29 +29,47 @@ def call_contract(w3, contract_address: str, calldata: str) -> bytes:
     return result  # raw bytes
 
 
-def call_getter(w3, getter_name: str, contract_address: str, *args) -> tuple:
-    calldata_builder = {
-        "get_epoch": lambda : get_epoch(),
-        "get_validator": lambda val_id: get_validator(val_id),
-        "get_delegator": lambda val_id, delegator: get_delegator(val_id, delegator),
-        "get_withdrawal_request": lambda val_id, delegator, wid: get_withdrawal_request(val_id, delegator, wid),
-        "get_proposer_val_id": lambda : get_proposer_val_id(),
-        "get_consensus_valset": lambda idx: get_consensus_valset(idx),
-        "get_snapshot_valset": lambda idx: get_snapshot_valset(idx),
-        "get_execution_valset": lambda idx: get_execution_valset(idx),
-        "get_delegations": lambda delegator_address, idx: get_delegations(delegator_address, idx),
-        "get_delegators": lambda val_id, delegator_address: get_delegators(val_id, delegator_address),
-    }
+CALLDATA_BUILDERS = {
+    "get_epoch": lambda : get_epoch(),
+    "get_validator": lambda val_id: get_validator(val_id),
+    "get_delegator": lambda val_id, delegator: get_delegator(val_id, delegator),
+    "get_withdrawal_request": lambda val_id, delegator, wid: get_withdrawal_request(val_id, delegator, wid),
+    "get_proposer_val_id": lambda : get_proposer_val_id(),
+    "get_consensus_valset": lambda idx: get_consensus_valset(idx),
+    "get_snapshot_valset": lambda idx: get_snapshot_valset(idx),
+    "get_execution_valset": lambda idx: get_execution_valset(idx),
+    "get_delegations": lambda delegator_address, idx: get_delegations(delegator_address, idx),
+    "get_delegators": lambda val_id, delegator_address: get_delegators(val_id, delegator_address),
+}
 
-    if getter_name not in calldata_builder:
+
+def getter_calldata(getter_name: str, *args) -> str:
+    if getter_name not in CALLDATA_BUILDERS:
         raise ValueError(f"Unknown getter {getter_name}")
+    return CALLDATA_BUILDERS[getter_name](*args)
+
 
-    calldata = calldata_builder[getter_name](*args)
-    raw_result = call_contract(w3,contract_address, calldata)
+def decode_getter(getter_name: str, raw_result: bytes):
     abi_types = constants.GETTER_ABIS.get(getter_name)
     if not abi_types:
         # return raw if ABI not defined
         return raw_result
+    return decode(abi_types, raw_result)
+
+
+def call_getter(w3, getter_name: str, contract_address: str, *args) -> tuple:
+    if getter_name not in CALLDATA_BUILDERS:
+        raise ValueError(f"Unknown getter {getter_name}")
 
-    decoded = decode(abi_types, raw_result)
-    return decoded
+    labels = {"getter": getter_name}
+    METRICS.inc("staking_getter_calls_total", labels)
+    start = time.perf_counter()
+    try:
+        calldata = getter_calldata(getter_name, *args)
+        raw_result = call_contract(w3,contract_address, calldata)
+        return decode_getter(getter_name, raw_result)
+    except Exception:
+        METRICS.inc("staking_getter_errors_total", labels)
+        raise
+    finally:
+        METRICS.observe("staking_getter_seconds", time.perf_counter() - start, labels)
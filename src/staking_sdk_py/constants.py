@@ -65,3 +65,7 @@ WITHDRAWAL_EVENT_ABI = [
 CLAIM_REWARDS_EVENT_ABI = [
     "event ClaimRewards(uint64 indexed valId, address indexed delegator, uint256 amount, uint64 epoch)"
 ]
+
+COMMISSION_CHANGED_EVENT_ABI = [
+    "event CommissionChanged(uint64 indexed valId, uint256 oldCommission, uint256 newCommission)"
+]
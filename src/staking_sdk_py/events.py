@@ -0,0 +1,87 @@
+import re
+from typing import List, Optional
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+import staking_sdk_py.constants as constants
+
+
+def parse_event(signature: str) -> tuple:
+    """(name, topic0, [(type, indexed, field name)]) of a human readable event ABI from constants"""
+    name, params = re.match(r"event (\w+)\((.*)\)", signature).groups()
+    inputs = []
+    for param in params.split(","):
+        parts = param.split()
+        inputs.append((parts[0], "indexed" in parts[1:], parts[-1]))
+    topic = keccak(text=f"{name}({','.join(type_ for type_, _, _ in inputs)})")
+    return name, topic, inputs
+
+
+EVENTS = {
+    name: (topic, inputs)
+    for name, topic, inputs in (
+        parse_event(abi[0])
+        for abi in (
+            constants.VALIDATOR_CREATED_EVENT_ABI,
+            constants.VALIDATOR_STATUS_CHANGED_EVENT_ABI,
+            constants.DELEGATE_EVENT_ABI,
+            constants.UNDELEGATE_EVENT_ABI,
+            constants.WITHDRAWAL_EVENT_ABI,
+            constants.CLAIM_REWARDS_EVENT_ABI,
+            constants.COMMISSION_CHANGED_EVENT_ABI,
+        )
+    )
+}
+
+EVENTS_BY_TOPIC = {topic: name for name, (topic, _) in EVENTS.items()}
+
+
+def encode_log(name: str, args: tuple, address: str) -> dict:
+    """JSON-RPC log of a staking event emitted by address"""
+    topic, inputs = EVENTS[name]
+    topics = ["0x" + topic.hex()]
+    data_types, data_values = [], []
+    for (type_, indexed, _), value in zip(inputs, args):
+        if indexed:
+            topics.append("0x" + encode([type_], [value]).hex())
+        else:
+            data_types.append(type_)
+            data_values.append(value)
+    return {
+        "address": address,
+        "topics": topics,
+        "data": "0x" + encode(data_types, data_values).hex(),
+    }
+
+
+def decode_log(log) -> Optional[dict]:
+    """
+    Fields of a staking event log, from a web3 receipt or raw JSON-RPC, with its name
+    under "event"; None for logs of other events.
+    """
+    topics = [HexBytes(topic) for topic in log["topics"]]
+    name = EVENTS_BY_TOPIC.get(bytes(topics[0])) if topics else None
+    if name is None:
+        return None
+    _, inputs = EVENTS[name]
+    indexed = iter(topics[1:])
+    data = iter(decode([type_ for type_, is_indexed, _ in inputs if not is_indexed], HexBytes(log["data"])))
+    event = {"event": name}
+    for type_, is_indexed, field in inputs:
+        value = decode([type_], next(indexed))[0] if is_indexed else next(data)
+        event[field] = to_checksum_address(value) if type_ == "address" else value
+    return event
+
+
+def decode_events(receipt, contract_address: Optional[str] = None, name: Optional[str] = None) -> List[dict]:
+    """Staking events of a receipt, only those emitted by contract_address and named name when given"""
+    events = []
+    for log in receipt["logs"]:
+        if contract_address is not None and str(log["address"]).lower() != contract_address.lower():
+            continue
+        event = decode_log(log)
+        if event is not None and (name is None or event["event"] == name):
+            events.append(event)
+    return events
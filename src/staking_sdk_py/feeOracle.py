@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+from web3 import Web3
+
+from staking_sdk_py.metrics import METRICS
+
+# Fees used when no oracle is available or eth_feeHistory fails
+DEFAULT_MAX_FEE_PER_GAS = 500_000_000_000
+DEFAULT_MAX_PRIORITY_FEE_PER_GAS = 1_000_000_000
+
+# strategy: (priority fee percentile sampled from recent blocks, base fee multiplier)
+# The multiplier is the headroom for base fee growth while the tx waits for inclusion.
+STRATEGIES = {
+    "fast": (90, 2.0),
+    "normal": (50, 1.5),
+    "cheap": (10, 1.125),
+}
+
+REWARD_PERCENTILES = sorted(percentile for percentile, _ in STRATEGIES.values())
+
+
+class FeeOracle:
+    """
+    Suggests EIP-1559 fees from eth_feeHistory.
+
+    One fee history sample (all strategy percentiles at once) is cached for max_age
+    seconds, about a block, so any number of transactions built meanwhile cost a single
+    request. The cache is not keyed on the head block: finding the head would cost a
+    request of its own.
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        strategy: str = "normal",
+        block_count: int = 10,
+        max_age: float = 1.0,
+        min_priority_fee: int = 0,
+        max_fee_cap: int = DEFAULT_MAX_FEE_PER_GAS,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown fee strategy {strategy}, choose from {', '.join(STRATEGIES)}")
+        self.w3 = w3
+        self.strategy = strategy
+        self.block_count = block_count
+        self.max_age = max_age
+        self.min_priority_fee = min_priority_fee
+        self.max_fee_cap = max_fee_cap
+        self._lock = threading.Lock()
+        self._sample = None
+        self._sampled_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def fee_history(self) -> dict:
+        """Returns the cached sample: head block, next base fee and priority fee per percentile."""
+        with self._lock:
+            if self._sample is not None and time.monotonic() - self._sampled_at < self.max_age:
+                self.hits += 1
+                METRICS.cache("fee_oracle", True)
+                return self._sample
+            self.misses += 1
+            METRICS.cache("fee_oracle", False)
+            history = self.w3.eth.fee_history(self.block_count, "latest", REWARD_PERCENTILES)
+            rewards = history.get("reward") or []
+            priority_fees = {}
+            for index, percentile in enumerate(REWARD_PERCENTILES):
+                samples = sorted(block_rewards[index] for block_rewards in rewards if block_rewards)
+                priority_fees[percentile] = samples[len(samples) // 2] if samples else 0
+            self._sample = {
+                "head_block": history["oldestBlock"] + len(history["gasUsedRatio"]) - 1,
+                # baseFeePerGas has one more entry than blocks sampled: the next block's base fee
+                "base_fee": history["baseFeePerGas"][-1],
+                "priority_fees": priority_fees,
+            }
+            self._sampled_at = time.monotonic()
+            return self._sample
+
+    def suggest(self, strategy: Optional[str] = None) -> Tuple[int, int]:
+        """Returns (max_fee_per_gas, max_priority_fee_per_gas) in wei."""
+        percentile, multiplier = STRATEGIES[strategy or self.strategy]
+        sample = self.fee_history()
+        priority_fee = max(sample["priority_fees"][percentile], self.min_priority_fee)
+        max_fee = int(sample["base_fee"] * multiplier) + priority_fee
+        if self.max_fee_cap:
+            max_fee = min(max_fee, self.max_fee_cap)
+            priority_fee = min(priority_fee, max_fee)
+        return max_fee, priority_fee
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
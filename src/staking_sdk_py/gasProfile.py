@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from typing import Optional
+
+from web3 import Web3
+
+from staking_sdk_py.metrics import METRICS
+from staking_sdk_py.receiptTracker import normalize_tx_hash
+
+# Headroom applied on top of estimated or previously observed gas usage
+DEFAULT_SAFETY_MARGIN = 1.2
+
+
+def selector_of(data: str) -> str:
+    data = data[2:] if data.startswith("0x") else data
+    return data[:8].lower()
+
+
+class GasProfile:
+    """
+    Learns gas limits per function selector.
+
+    The first transaction for a selector is sized with eth_estimateGas. Once a receipt
+    has been observed, later transactions for the same selector reuse the highest gas
+    used so far and skip the estimation round trip. Both are padded by the margin.
+    """
+
+    def __init__(self, path: Optional[str] = None, margin: float = DEFAULT_SAFETY_MARGIN):
+        self.path = os.path.expanduser(path) if path else None
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._pending = {}
+        self._dropped = set()
+        self.hits = 0
+        self.misses = 0
+        if self.path and os.path.isfile(self.path):
+            self._profiles = self._read()
+
+    def gas_limit(self, w3: Web3, tx: dict) -> int:
+        """Returns the gas limit to use for a transaction dict with from, to, value and data."""
+        selector = selector_of(tx.get("data") or "0x")
+        with self._lock:
+            profile = self._profiles.get(selector)
+            if profile:
+                self.hits += 1
+                METRICS.cache("gas_profile", True)
+                return int(profile["max_gas_used"] * self.margin)
+            self.misses += 1
+            METRICS.cache("gas_profile", False)
+        estimate = w3.eth.estimate_gas({
+            key: tx[key] for key in ("from", "to", "value", "data") if key in tx
+        })
+        return int(estimate * self.margin)
+
+    def learned_limit(self, data: str) -> Optional[int]:
+        """Padded gas limit learned for the selector of some calldata, without estimating."""
+        with self._lock:
+            profile = self._profiles.get(selector_of(data))
+        return int(profile["max_gas_used"] * self.margin) if profile else None
+
+    def register(self, tx_hash, tx: dict):
+        """Remembers the gas limit of a sent transaction until its receipt is observed."""
+        with self._lock:
+            self._pending[normalize_tx_hash(tx_hash)] = (selector_of(tx.get("data") or "0x"), tx["gas"])
+
+    def observe(self, receipt) -> Optional[int]:
+        """Records the gas used by a receipt and returns the gas limit it was sent with."""
+        tx_hash = normalize_tx_hash(receipt["transactionHash"])
+        with self._lock:
+            pending = self._pending.pop(tx_hash, None)
+            if pending is None:
+                return None
+            selector, gas_limit = pending
+            gas_used = receipt["gasUsed"]
+            if receipt["status"] != 1 and gas_used >= gas_limit:
+                # ran out of gas: the learned value was too low, estimate again next time
+                self._profiles.pop(selector, None)
+                self._dropped.add(selector)
+            elif receipt["status"] == 1:
+                self._dropped.discard(selector)
+                profile = self._profiles.setdefault(selector, {"max_gas_used": 0, "samples": 0})
+                profile["max_gas_used"] = max(profile["max_gas_used"], gas_used)
+                profile["samples"] += 1
+            self._save()
+        return gas_limit
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.path:
+            return
+        # merge with what other processes learned since this profile was loaded
+        for selector, stored in self._read().items():
+            if selector in self._dropped:
+                continue
+            profile = self._profiles.setdefault(selector, dict(stored))
+            profile["max_gas_used"] = max(profile["max_gas_used"], stored["max_gas_used"])
+            profile["samples"] = max(profile["samples"], stored["samples"])
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._profiles, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -1,30 +1,30 @@
-from blake3 import blake3
 from eth_keys import keys
 import staking_sdk_py.constants as constants
 import staking_sdk_py.keyGenerator as keyGenerator
-from typing import Union
+from typing import List, Optional, Union
 import eth_abi
 
 
-from blake3 import blake3
 from eth_keys import keys
-from py_ecc.bls import G2ProofOfPossession as bls
-from py_ecc.optimized_bls12_381 import curve_order
 
 from eth_abi import encode
 
+from staking_sdk_py.blsBackend import get_bls_backend
+
 def add_validator(
     k: "keyGenerator.KeyGenerator",
     amount: int,
     auth_address: str,
     commission: int = 0
 ) -> str:
+    # only validator registration needs blake3, keep it out of the getters' imports
+    from blake3 import blake3
+
     secp_pub_key = k.pub_secp_key()
     bls_pub_key = k.pub_bls_key()
     auth_address_bytes = bytes.fromhex(strip_0x(auth_address))
 
     secp_priv_key = k.priv_secp_key()
-    bls_privkey = k.priv_bls_key()
 
     # Build payload (everything except the signatures)
     payload_parts = [
@@ -37,11 +37,47 @@ def add_validator(
     payload = b''.join(payload_parts)
 
     secp_sig = secp_priv_key.sign_msg_hash_non_recoverable(blake3(payload).digest()).to_bytes()
-    bls_sig = bls.Sign(bls_privkey, payload)
+    bls_sig = k.sign_bls(payload)
 
     return "0x" + constants.ADD_VALIDATOR_SELECTOR + eth_abi.encode(['bytes', 'bytes', 'bytes'], [payload, secp_sig, bls_sig]).hex()
 
 
+
+def add_validators(
+    validators: List[dict],
+    processes: Optional[int] = None,
+    bls_backend: Optional[str] = None,
+) -> List[dict]:
+    """
+    Builds add_validator calldata for many validators across a process pool.
+
+    Each entry has secp_private_key, bls_private_key, amount (wei), auth_address and an
+    optional commission. Returns one result per entry, in input order: calldata and both
+    public keys, or an error message for that entry only.
+    """
+    jobs = [(index, entry, bls_backend) for index, entry in enumerate(validators)]
+    return keyGenerator.map_processes(_add_validator_job, jobs, processes)
+
+
+def _add_validator_job(job: tuple) -> dict:
+    index, entry, bls_backend = job
+    try:
+        k = keyGenerator.KeyGenerator.from_keys(
+            entry["secp_private_key"],
+            entry["bls_private_key"],
+            get_bls_backend(bls_backend),
+        )
+        calldata = add_validator(k, entry["amount"], entry["auth_address"], entry.get("commission", 0))
+        return {
+            "index": index,
+            "calldata": calldata,
+            "secp_public_key": k.pub_secp_key().hex(),
+            "bls_public_key": k.pub_bls_key().hex(),
+        }
+    except Exception as e:
+        return {"index": index, "error": str(e).strip()}
+
+
 def strip_0x(s: str) -> str:
     return s[2:] if s.startswith("0x") else s
 
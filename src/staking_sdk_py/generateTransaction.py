@@ -1,6 +1,20 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
 from web3 import Web3
 
+from staking_sdk_py.metrics import METRICS
+from staking_sdk_py.tracing import TRACER
+
 from staking_sdk_py.signer_factory import Signer
+from staking_sdk_py.nonceManager import NonceManager
+from staking_sdk_py.feeOracle import FeeOracle, DEFAULT_MAX_FEE_PER_GAS, DEFAULT_MAX_PRIORITY_FEE_PER_GAS
+from staking_sdk_py.gasProfile import GasProfile, DEFAULT_SAFETY_MARGIN
+
+log = logging.getLogger(__name__)
+
 
 def send_transaction(
     w3: Web3,
@@ -9,13 +23,81 @@ def send_transaction(
     data: str,
     chain_id: int,
     value: int = 0,
-    gas_limit: int = 1_000_000,
-    max_fee_per_gas: int = 500_000_000_000,
-    max_priority_fee_per_gas: int = 1_000_000_000,
+    gas_limit: Optional[int] = None,
+    max_fee_per_gas: Optional[int] = None,
+    max_priority_fee_per_gas: Optional[int] = None,
+    nonce: Optional[int] = None,
+    nonce_manager: Optional[NonceManager] = None,
+    fee_oracle: Optional[FeeOracle] = None,
+    gas_profile: Optional[GasProfile] = None,
+    on_signed: Optional[Callable] = None,
 ) -> str:
-    nonce = w3.eth.get_transaction_count(signer.get_address())
+    """
+    Estimates, prices, signs and sends a transaction, returns its hash. on_signed(tx,
+    signed_tx) runs between signing and sending, to persist the signed transaction
+    before it can reach the network; the transaction is not sent if it raises.
+    """
+    if gas_limit is None:
+        with _step("estimate_gas"):
+            gas_limit = estimate_gas_limit(w3, signer.get_address(), to, data, value, gas_profile)
 
-    tx = {
+    with _step("fees"):
+        max_fee_per_gas, max_priority_fee_per_gas = resolve_fees(
+            max_fee_per_gas, max_priority_fee_per_gas, fee_oracle
+        )
+
+    allocated = nonce is None and nonce_manager is not None
+    if nonce is None:
+        with _step("nonce"):
+            if nonce_manager is not None:
+                nonce = nonce_manager.allocate()
+            else:
+                nonce = w3.eth.get_transaction_count(signer.get_address())
+
+    tx = build_transaction(
+        to, data, chain_id, nonce, gas_limit, max_fee_per_gas, max_priority_fee_per_gas, value
+    )
+
+    try:
+        with _step("sign", nonce=nonce):
+            signed_tx = signer.sign_transaction(tx)
+        if on_signed is not None:
+            on_signed(tx, signed_tx)
+        with _step("send", nonce=nonce):
+            tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    except Exception:
+        METRICS.inc("staking_transaction_errors_total")
+        if allocated:
+            # hand the nonce back so later transactions are not stuck behind a gap
+            nonce_manager.fail(nonce)
+        raise
+    METRICS.inc("staking_transactions_sent_total")
+    if gas_profile is not None:
+        gas_profile.register(tx_hash, tx)
+    return tx_hash.hex()
+
+
+@contextmanager
+def _step(name: str, **attributes):
+    """Times a step of send_transaction into the metrics, and a tracing span when enabled"""
+    start = time.perf_counter()
+    with TRACER.span(name, **attributes):
+        yield
+    METRICS.observe("staking_transaction_step_seconds", time.perf_counter() - start, {"step": name})
+
+
+def build_transaction(
+    to: str,
+    data: str,
+    chain_id: int,
+    nonce: int,
+    gas_limit: int,
+    max_fee_per_gas: int,
+    max_priority_fee_per_gas: int,
+    value: int = 0,
+) -> dict:
+    """Unsigned EIP-1559 transaction dict, built without any network access."""
+    return {
         "to": Web3.to_checksum_address(to),
         "value": value,
         "data": data,
@@ -27,6 +109,45 @@ def send_transaction(
         "type": 2  # EIP-1559 transaction
     }
 
-    signed_tx = signer.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    return tx_hash.hex()
+
+def estimate_gas_limit(
+    w3: Web3,
+    sender: str,
+    to: str,
+    data: str,
+    value: int = 0,
+    gas_profile: Optional[GasProfile] = None,
+) -> int:
+    """Gas limit from the learned profile of the selector, or eth_estimateGas plus a safety margin."""
+    tx = {
+        "from": Web3.to_checksum_address(sender),
+        "to": Web3.to_checksum_address(to),
+        "value": value,
+        "data": data,
+    }
+    if gas_profile is not None:
+        return gas_profile.gas_limit(w3, tx)
+    return int(w3.eth.estimate_gas(tx) * DEFAULT_SAFETY_MARGIN)
+
+
+def resolve_fees(
+    max_fee_per_gas: Optional[int],
+    max_priority_fee_per_gas: Optional[int],
+    fee_oracle: Optional[FeeOracle] = None,
+) -> tuple:
+    """Fills in fees not given explicitly from the oracle, or the static defaults without one."""
+    if max_fee_per_gas is not None and max_priority_fee_per_gas is not None:
+        return max_fee_per_gas, max_priority_fee_per_gas
+    suggested = (DEFAULT_MAX_FEE_PER_GAS, DEFAULT_MAX_PRIORITY_FEE_PER_GAS)
+    if fee_oracle is not None:
+        try:
+            suggested = fee_oracle.suggest()
+        except Exception as e:
+            # nodes without eth_feeHistory keep working with the static fees
+            METRICS.inc("staking_fee_oracle_fallbacks_total")
+            log.warning(f"Fee oracle failed, using the default fees: {e}")
+    if max_priority_fee_per_gas is None:
+        max_priority_fee_per_gas = suggested[1]
+    if max_fee_per_gas is None:
+        max_fee_per_gas = max(suggested[0], max_priority_fee_per_gas)
+    return max_fee_per_gas, max_priority_fee_per_gas
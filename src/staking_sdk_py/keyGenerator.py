@@ -1,21 +1,59 @@
-from blake3 import blake3
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from typing import Callable, List, Optional
+
 from eth_keys import keys
-from py_ecc.bls import G2ProofOfPossession as bls
-from py_ecc.optimized_bls12_381 import curve_order
+
+from staking_sdk_py.blsBackend import BlsBackend, CURVE_ORDER, get_bls_backend
+
+SECP256K1_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
 
 class KeyGenerator:
-    def __init__(self, secp_private_key: keys.PrivateKey , bls_private_key: int):
-        self.secp_private_key = secp_private_key
-        self.secp_public_key = self.secp_private_key.public_key.to_compressed_bytes()
+    """
+    Validator keys. Public keys are derived on first use and cached, BLS operations go
+    through the given backend (the fastest installed one by default).
+    """
 
+    def __init__(self, secp_private_key: keys.PrivateKey , bls_private_key: int, bls_backend: Optional[BlsBackend] = None):
+        self.secp_private_key = secp_private_key
         self.bls_private_key = bls_private_key
-        self.bls_public_key = bls.SkToPk(self.bls_private_key)
+        self.bls_backend = bls_backend or get_bls_backend()
+
+    @cached_property
+    def secp_public_key(self) -> bytes:
+        return self.secp_private_key.public_key.to_compressed_bytes()
 
-        self.eth_address = self.secp_private_key.public_key.to_checksum_address()
+    @cached_property
+    def bls_public_key(self) -> bytes:
+        return self.bls_backend.sk_to_pk(self.bls_private_key)
+
+    @cached_property
+    def eth_address(self) -> str:
+        return self.secp_private_key.public_key.to_checksum_address()
+
+    def sign_bls(self, message: bytes) -> bytes:
+        return self.bls_backend.sign(self.bls_private_key, message)
 
     @classmethod
-    def from_keys(cls, secp_private_key: str, bls_private_key: str):
+    def generate(cls, bls_backend: Optional[BlsBackend] = None):
+        """New random secp256k1 and BLS12-381 keys."""
+        secp_private_key = keys.PrivateKey((secrets.randbelow(SECP256K1_ORDER - 1) + 1).to_bytes(32, "big"))
+        return cls(secp_private_key, secrets.randbelow(CURVE_ORDER - 1) + 1, bls_backend)
+
+    def to_dict(self) -> dict:
+        return {
+            "secp_privkey": self.secp_private_key.to_bytes().hex(),
+            "bls_privkey": "0x" + self.bls_private_key.to_bytes(32, "big").hex(),
+            "secp_pubkey": self.secp_public_key.hex(),
+            "bls_pubkey": self.bls_public_key.hex(),
+            "eth_address": self.eth_address,
+        }
+
+    @classmethod
+    def from_keys(cls, secp_private_key: str, bls_private_key: str, bls_backend: Optional[BlsBackend] = None):
         try:
             secp_private_key = cls.key_sanitation(secp_private_key)
             bls_private_key = cls.key_sanitation(bls_private_key)
@@ -30,8 +68,10 @@ class KeyGenerator:
 
             secp_private_key = keys.PrivateKey(secp_private_key_bytes)
             bls_private_key_int = int.from_bytes(bls_private_key_bytes, 'big')
+            if not 0 < bls_private_key_int < CURVE_ORDER:
+                raise ValueError("KeyGenerator: [Error] Invalid bls private key: it must be between 1 and the curve order.")
 
-            return cls(secp_private_key, bls_private_key_int)
+            return cls(secp_private_key, bls_private_key_int, bls_backend)
 
         except ValueError as e:
             raise ValueError(f"\nKeyGenerator: [Error] Could not process key: {e}")
@@ -63,3 +103,77 @@ class KeyGenerator:
         return self.eth_address
 
 
+def map_processes(func: Callable, jobs: list, processes: Optional[int] = None) -> list:
+    """Maps a picklable function over jobs in a process pool, results in job order."""
+    if processes == 1 or len(jobs) <= 1:
+        return [func(job) for job in jobs]
+    workers = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def generate_keys(
+    count: int,
+    processes: Optional[int] = None,
+    password: Optional[str] = None,
+    bls_backend: Optional[str] = None,
+) -> List[dict]:
+    """
+    Generates keys for count validators across a process pool. Each result has the
+    private keys, public keys and address; with a password the private keys are
+    replaced by secp_keystore and bls_keystore (encrypted JSON keystores).
+    """
+    return map_processes(_generate_job, [(index, password, bls_backend) for index in range(count)], processes)
+
+
+def verify_keys(
+    entries: List[dict],
+    processes: Optional[int] = None,
+    password: Optional[str] = None,
+    bls_backend: Optional[str] = None,
+) -> List[dict]:
+    """
+    Checks that the private keys of each entry (plain secp_privkey/bls_privkey, or
+    keystores with a password) derive its secp_pubkey, bls_pubkey and eth_address,
+    whichever are given. Returns {"index", "ok", "error"} per entry, in order.
+    """
+    jobs = [(index, entry, password, bls_backend) for index, entry in enumerate(entries)]
+    return map_processes(_verify_job, jobs, processes)
+
+
+def _generate_job(job: tuple) -> dict:
+    index, password, bls_backend = job
+    generated = KeyGenerator.generate(get_bls_backend(bls_backend)).to_dict()
+    if password is not None:
+        from eth_account import Account
+
+        generated["secp_keystore"] = Account.encrypt(generated.pop("secp_privkey"), password)
+        generated["bls_keystore"] = Account.encrypt(generated.pop("bls_privkey"), password)
+    return dict(index=index, **generated)
+
+
+def _verify_job(job: tuple) -> dict:
+    index, entry, password, bls_backend = job
+    try:
+        if "secp_keystore" in entry or "bls_keystore" in entry:
+            from eth_account import Account
+
+            if password is None:
+                raise ValueError("keystore entries need a password")
+            secp_private_key = Account.decrypt(entry["secp_keystore"], password).hex()
+            bls_private_key = Account.decrypt(entry["bls_keystore"], password).hex()
+        else:
+            secp_private_key = entry["secp_privkey"]
+            bls_private_key = entry["bls_privkey"]
+        k = KeyGenerator.from_keys(secp_private_key, bls_private_key, get_bls_backend(bls_backend))
+        derived = k.to_dict()
+        mismatches = [
+            field for field in ("secp_pubkey", "bls_pubkey", "eth_address")
+            if entry.get(field)
+            and KeyGenerator.key_sanitation(entry[field]).lower() != KeyGenerator.key_sanitation(derived[field]).lower()
+        ]
+        if mismatches:
+            return {"index": index, "ok": False, "error": f"derived {', '.join(mismatches)} differ"}
+        return {"index": index, "ok": True}
+    except Exception as e:
+        return {"index": index, "ok": False, "error": str(e).strip()}
@@ -0,0 +1,171 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+# Latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "staking_rpc_requests_total": "JSON-RPC requests sent, per method",
+    "staking_rpc_errors_total": "JSON-RPC requests that raised or returned an error, per method",
+    "staking_rpc_retries_total": "HTTP attempts beyond the first one of a JSON-RPC request, per method",
+    "staking_rpc_request_bytes_total": "Bytes of JSON-RPC request bodies, per method",
+    "staking_rpc_response_bytes_total": "Bytes of JSON-RPC response bodies, per method",
+    "staking_rpc_batched_requests_total": "JSON-RPC requests sent inside batches, per method",
+    "staking_rpc_request_seconds": "JSON-RPC request latency, per method",
+    "staking_rpc_endpoint_requests_total": "JSON-RPC requests sent to each endpoint of a multi-endpoint provider",
+    "staking_rpc_endpoint_errors_total": "JSON-RPC requests to each endpoint that failed to get a response",
+    "staking_rpc_endpoint_seconds": "JSON-RPC request latency, per endpoint",
+    "staking_rpc_hedged_requests_total": "Reads sent to a second endpoint after the first one exceeded its p95 latency",
+    "staking_rpc_broadcast_mismatches_total": "Endpoints returning another hash than the first one for a broadcast transaction",
+    "staking_rpc_circuit_opened_total": "Circuit breaker openings after consecutive failed requests, per endpoint",
+    "staking_rpc_circuit_rejected_total": "Requests failed fast while the endpoint's circuit breaker was open, per endpoint",
+    "staking_getter_calls_total": "Staking precompile getter calls, per getter",
+    "staking_getter_errors_total": "Staking precompile getter calls that failed, per getter",
+    "staking_getter_seconds": "Staking precompile getter latency including decoding, per getter",
+    "staking_preflight_repinned_total": "Preflight reads sent again because a block landed while the node answered them",
+    "staking_transaction_step_seconds": "Time spent per step of sending a transaction",
+    "staking_transactions_sent_total": "Transactions accepted by the node",
+    "staking_transaction_errors_total": "Transactions that failed to sign or send",
+    "staking_fee_oracle_fallbacks_total": "Transactions priced with the default fees because the fee oracle failed",
+    "staking_auto_compound_transactions_total": "Compounds of the auto-compound scheduler by final status (confirmed, reverted or dropped)",
+    "staking_cache_requests_total": "Cache lookups, per cache and result (hit or miss)",
+    "staking_cache_hit_ratio": "Share of cache lookups that were hits, per cache",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[dict]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[tuple] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        key + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for key, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe counters and latency histograms with labels.
+
+    A process wide instance (METRICS) is fed by the instrumented RPC provider, the
+    getters, send_transaction and the caches. snapshot() returns plain data, and
+    write_textfile() writes the Prometheus text format for node-exporter's textfile
+    collector.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, dict]] = {}
+
+    def inc(self, name: str, labels: Optional[dict] = None, value: float = 1):
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all its label sets"""
+        with self._lock:
+            return sum(self._counters.get(name, {}).values())
+
+    def observe(self, name: str, value: float, labels: Optional[dict] = None):
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {"count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets)}
+            histogram["count"] += 1
+            histogram["sum"] += value
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+
+    def cache(self, name: str, hit: bool):
+        self.inc("staking_cache_requests_total", {"cache": name, "result": "hit" if hit else "miss"})
+
+    def hit_rates(self) -> Dict[str, float]:
+        totals = {}
+        with self._lock:
+            for labels, value in self._counters.get("staking_cache_requests_total", {}).items():
+                labels = dict(labels)
+                hits, lookups = totals.get(labels["cache"], (0, 0))
+                totals[labels["cache"]] = (hits + (value if labels["result"] == "hit" else 0), lookups + value)
+        return {cache: hits / lookups for cache, (hits, lookups) in totals.items() if lookups}
+
+    def snapshot(self) -> dict:
+        """Copy of all series: {"counters": {name: [{labels, value}]}, "histograms": ..., "cache_hit_rates": ...}"""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(labels), "value": value} for labels, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [
+                    {
+                        "labels": dict(labels),
+                        "count": histogram["count"],
+                        "sum": histogram["sum"],
+                        "buckets": dict(zip(self.buckets, histogram["buckets"])),
+                    }
+                    for labels, histogram in series.items()
+                ]
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms, "cache_hit_rates": self.hit_rates()}
+
+    def to_prometheus(self) -> str:
+        lines = []
+        snapshot = self.snapshot()
+        for name, series in sorted(snapshot["counters"].items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for sample in series:
+                lines.append(f"{name}{_format_labels(_labels(sample['labels']))} {sample['value']}")
+        for name, series in sorted(snapshot["histograms"].items()):
+            lines.append(f"# HELP {name} {HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for sample in series:
+                labels = _labels(sample["labels"])
+                for bound, count in sample["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', str(bound)))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {sample['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {sample['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+        if snapshot["cache_hit_rates"]:
+            name = "staking_cache_hit_ratio"
+            lines.append(f"# HELP {name} {HELP[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            for cache, rate in sorted(snapshot["cache_hit_rates"].items()):
+                lines.append(f"{name}{_format_labels((('cache', cache),))} {rate}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """Writes the Prometheus text format atomically, so a scrape never sees a partial file."""
+        path = os.path.expanduser(path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+METRICS = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return METRICS
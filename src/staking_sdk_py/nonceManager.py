@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from web3 import Web3
+
+try:
+    import fcntl
+except ImportError:  # no cov
+    fcntl = None
+
+# A state file nobody has touched for this long is not trusted over the chain:
+# nonces allocated by a process that died before sending would otherwise leave a gap
+STALE_STATE_SECONDS = 120
+
+
+class NonceManager:
+    """
+    Allocates nonces locally for one signer address.
+
+    After a single sync from the node's `pending` transaction count, nonces are handed
+    out without a round trip so transactions can be submitted back-to-back. Nonces of
+    transactions that never reached the node are released and reused first, so no gap
+    stalls the ones after them. With a state_dir the allocation state is shared between
+    threads and processes through a locked file.
+    """
+
+    def __init__(self, w3: Web3, address: str, state_dir: Optional[str] = None):
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address)
+        self._lock = threading.RLock()
+        self._next_nonce: Optional[int] = None
+        self._released = set()
+        self._needs_resync = True
+        self._state_path = None
+        self._lock_path = None
+        if state_dir:
+            state_dir = os.path.expanduser(state_dir)
+            os.makedirs(state_dir, exist_ok=True)
+            self._state_path = os.path.join(state_dir, f"{self.address.lower()}.json")
+            self._lock_path = os.path.join(state_dir, f"{self.address.lower()}.lock")
+
+    def allocate(self) -> int:
+        """Returns the next nonce to use for this address."""
+        with self._locked():
+            if self._needs_resync:
+                self._sync_from_chain()
+            if self._released:
+                nonce = min(self._released)
+                self._released.discard(nonce)
+            else:
+                nonce = self._next_nonce
+                self._next_nonce += 1
+            self._save()
+            return nonce
+
+    def release(self, nonce: int):
+        """Returns a nonce whose transaction was never accepted by the node."""
+        with self._locked():
+            if self._next_nonce is None:
+                return
+            if nonce == self._next_nonce - 1:
+                self._next_nonce -= 1
+            elif nonce < self._next_nonce:
+                self._released.add(nonce)
+            self._save()
+
+    def fail(self, nonce: int):
+        """
+        Releases a nonce after a failed submission and resyncs before the next allocation,
+        since the node may have accepted the transaction despite the error.
+        """
+        self.release(nonce)
+        with self._lock:
+            self._needs_resync = True
+
+    def resync(self):
+        """Forces the next allocation to start from the node's pending transaction count."""
+        with self._locked():
+            self._needs_resync = True
+            self._sync_from_chain(trust_local=False)
+            self._save()
+
+    def _sync_from_chain(self, trust_local: bool = True):
+        chain_nonce = self.w3.eth.get_transaction_count(self.address, "pending")
+        local_nonce = self._next_nonce
+        if trust_local and local_nonce is not None and local_nonce > chain_nonce:
+            # nonces handed out locally may not have reached the node yet
+            self._next_nonce = local_nonce
+        else:
+            self._next_nonce = chain_nonce
+        self._released = {nonce for nonce in self._released if chain_nonce <= nonce < self._next_nonce}
+        self._needs_resync = False
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._lock_path is None:
+                yield
+                return
+            with open(self._lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._load()
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        try:
+            with open(self._state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if time.time() - state.get("updated_at", 0) > STALE_STATE_SECONDS:
+            self._next_nonce = None
+            self._released = set()
+            self._needs_resync = True
+            return
+        self._next_nonce = state["next_nonce"]
+        self._released = set(state.get("released", []))
+
+    def _save(self):
+        if self._state_path is None or self._next_nonce is None:
+            return
+        tmp_path = self._state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "next_nonce": self._next_nonce,
+                "released": sorted(self._released),
+                "updated_at": time.time(),
+            }, f)
+        os.replace(tmp_path, self._state_path)
+
+
+_managers: Dict[Tuple[str, Optional[str]], NonceManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(w3: Web3, address: str, state_dir: Optional[str] = None) -> NonceManager:
+    """Returns the shared nonce manager of an address within this process."""
+    key = (Web3.to_checksum_address(address), state_dir)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = NonceManager(w3, address, state_dir)
+            _managers[key] = manager
+        manager.w3 = w3
+        return manager
@@ -0,0 +1,234 @@
+from typing import List, Optional, Sequence, Tuple
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from staking_sdk_py.callGetters import decode_getter, getter_calldata
+from staking_sdk_py.metrics import METRICS
+
+# Number of epochs to wait before unstaked tokens can be withdrawn
+WITHDRAWAL_DELAY = 1
+
+# reads of each operation's preflight next to get_validator, "balance" being the delegator's balance
+OPERATION_READS = {
+    "delegate": (),
+    "change-commission": (),
+    "undelegate": ("get_delegator", "get_withdrawal_request"),
+    "withdraw": ("get_withdrawal_request", "get_epoch"),
+    "claim-rewards": ("get_delegator", "balance"),
+    "compound-rewards": ("get_delegator",),
+}
+
+# distinct reads sent per JSON-RPC batch by preflight_many, all at the block of the first
+PREFLIGHT_BATCH_SIZE = 100
+
+
+def _batch(w3: Web3, requests: List[Tuple[str, list]]) -> list:
+    responses = w3.provider.make_batch_request(requests)
+    if isinstance(responses, dict):
+        # some nodes answer a whole batch with a single error object
+        raise RuntimeError(f"Batch request failed: {responses.get('error')}")
+    results = []
+    for (method, _), response in zip(requests, responses):
+        if response.get("error"):
+            raise ValueError(f"{method} failed: {response['error'].get('message')}")
+        results.append(response["result"])
+    return results
+
+
+def read_at_block(w3: Web3, requests: Sequence[Tuple[str, list]], block_number: Optional[int] = None) -> Tuple[int, list]:
+    """
+    Results of block dependent reads (eth_call, eth_getBalance... with params without
+    their block), sent as one JSON-RPC batch and all made at the same block. Returns
+    that block number and the results.
+
+    Without block_number, the reads are made at the latest block, between two
+    eth_blockNumber requests of the same batch. When a block lands while the node
+    answers the batch, the reads are sent again at the first of the two.
+    """
+    if block_number is None:
+        results = _batch(
+            w3, [("eth_blockNumber", [])] + [(method, list(params) + ["latest"]) for method, params in requests] + [("eth_blockNumber", [])]
+        )
+        first, last = int(results[0], 16), int(results[-1], 16)
+        if first == last:
+            return first, results[1:-1]
+        METRICS.inc("staking_preflight_repinned_total")
+        block_number = first
+    return block_number, _batch(w3, [(method, list(params) + [hex(block_number)]) for method, params in requests])
+
+
+class PreflightReport:
+    """
+    On-chain state a write operation is checked against, read at a single block, and
+    the reasons the operation must not be sent (none when it can be).
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        validator_id: int,
+        delegator_address: str,
+        block_number: int,
+        validator: tuple,
+        delegator: Optional[tuple] = None,
+        withdrawal_request: Optional[tuple] = None,
+        epoch: Optional[tuple] = None,
+        balance: Optional[int] = None,
+        amount: int = 0,
+        withdrawal_id: Optional[int] = None,
+    ):
+        self.operation = operation
+        self.validator_id = validator_id
+        self.delegator_address = delegator_address
+        self.block_number = block_number
+        self.validator = validator
+        self.delegator = delegator
+        self.withdrawal_request = withdrawal_request
+        self.epoch = epoch
+        self.balance = balance
+        self.amount = amount
+        self.withdrawal_id = withdrawal_id
+        self.errors = self._check()
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def validator_exists(self) -> bool:
+        # a registered validator always has a secp public key
+        return any(self.validator[10])
+
+    @property
+    def active_stake(self) -> int:
+        return self.delegator[0]
+
+    @property
+    def pending_stake(self) -> int:
+        return self.delegator[1]
+
+    @property
+    def rewards(self) -> int:
+        return self.delegator[2]
+
+    @property
+    def withdrawal_amount(self) -> int:
+        return self.withdrawal_request[0]
+
+    @property
+    def withdrawal_epoch(self) -> int:
+        return self.withdrawal_request[2]
+
+    @property
+    def withdrawable_epoch(self) -> int:
+        return self.withdrawal_epoch + WITHDRAWAL_DELAY
+
+    @property
+    def current_epoch(self) -> int:
+        return self.epoch[0]
+
+    def _check(self) -> List[str]:
+        if not self.validator_exists:
+            return ["Validator does not exist"]
+        errors = []
+        if self.operation in ("claim-rewards", "compound-rewards"):
+            if self.active_stake == 0 and self.rewards == 0:
+                errors.append("No delegation found with this validator")
+            elif self.rewards == 0:
+                errors.append("No rewards available")
+        elif self.operation == "undelegate":
+            if self.withdrawal_amount > 0:
+                errors.append("Withdrawal request already exists for this ID")
+            if self.active_stake < self.amount:
+                errors.append(f"Insufficient stake: {self.active_stake} wei, requested {self.amount} wei")
+        elif self.operation == "withdraw":
+            if self.withdrawal_amount == 0:
+                errors.append("No withdrawal request found for this ID")
+            elif self.current_epoch < self.withdrawable_epoch:
+                errors.append(f"Cannot withdraw before epoch {self.withdrawable_epoch} (current: {self.current_epoch})")
+        return errors
+
+
+def preflight(
+    w3: Web3,
+    contract_address: str,
+    operation: str,
+    validator_id: int,
+    delegator_address: str,
+    amount: int = 0,
+    withdrawal_id: Optional[int] = None,
+    block_number: Optional[int] = None,
+) -> PreflightReport:
+    """
+    Reads everything the checks of an operation need (see OPERATION_READS) in one round
+    trip, at one block, and checks it. amount is in wei, withdrawal_id is needed by
+    undelegate and withdraw.
+    """
+    operations = [{"operation": operation, "validator_id": validator_id, "amount": amount, "withdrawal_id": withdrawal_id}]
+    return preflight_many(w3, contract_address, delegator_address, operations, block_number)[0]
+
+
+def preflight_many(
+    w3: Web3,
+    contract_address: str,
+    delegator_address: str,
+    operations: Sequence[dict],
+    block_number: Optional[int] = None,
+) -> List[PreflightReport]:
+    """
+    preflight for many operations of one delegator, given as dicts of operation,
+    validator_id, amount (wei, optional) and withdrawal_id (optional). Each distinct
+    read is made once, in batches pinned to a single block. Returns a report per
+    operation, in order.
+    """
+    for op in operations:
+        if op["operation"] not in OPERATION_READS:
+            raise ValueError(f"No preflight for operation {op['operation']}, choose from {', '.join(OPERATION_READS)}")
+    to = Web3.to_checksum_address(contract_address)
+
+    def reads(op: dict) -> list:
+        validator_id = int(op["validator_id"])
+        getter_args = {
+            "get_validator": (validator_id,),
+            "get_delegator": (validator_id, delegator_address),
+            "get_withdrawal_request": (validator_id, delegator_address, op.get("withdrawal_id")),
+            "get_epoch": (),
+        }
+        return [
+            (name, ("balance",) if name == "balance" else (name,) + getter_args[name])
+            for name in ("get_validator",) + OPERATION_READS[op["operation"]]
+        ]
+
+    keys = list(dict.fromkeys(key for op in operations for _, key in reads(op)))
+    requests = [
+        ("eth_getBalance", [delegator_address]) if key[0] == "balance"
+        else ("eth_call", [{"to": to, "data": getter_calldata(key[0], *key[1:])}])
+        for key in keys
+    ]
+    results = []
+    for start in range(0, len(requests), PREFLIGHT_BATCH_SIZE):
+        block_number, chunk = read_at_block(w3, requests[start:start + PREFLIGHT_BATCH_SIZE], block_number)
+        results.extend(chunk)
+    state = {
+        key: int(result, 16) if key[0] == "balance" else decode_getter(key[0], HexBytes(result))
+        for key, result in zip(keys, results)
+    }
+
+    reports = []
+    for op in operations:
+        values = {name: state[key] for name, key in reads(op)}
+        reports.append(PreflightReport(
+            op["operation"],
+            int(op["validator_id"]),
+            delegator_address,
+            block_number,
+            values["get_validator"],
+            delegator=values.get("get_delegator"),
+            withdrawal_request=values.get("get_withdrawal_request"),
+            epoch=values.get("get_epoch"),
+            balance=values.get("balance"),
+            amount=op.get("amount") or 0,
+            withdrawal_id=op.get("withdrawal_id"),
+        ))
+    return reports
@@ -0,0 +1,277 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+# web3 only exposes its receipt formatter privately; it is needed to give receipts
+# fetched through a raw batch the same shape as w3.eth.get_transaction_receipt
+from web3._utils.method_formatters import receipt_formatter
+
+# Above this many pending hashes a single eth_getBlockReceipts per block is cheaper
+# than one eth_getTransactionReceipt per hash
+BLOCK_RECEIPTS_THRESHOLD = 8
+
+# After this many polls in a row fail, the pending hashes fail with the last error
+# instead of waiting for their timeout
+MAX_POLL_FAILURES = 10
+
+
+def normalize_tx_hash(tx_hash) -> str:
+    """Returns a lowercase 0x-prefixed hex string for str/bytes/HexBytes hashes."""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        tx_hash = HexBytes(tx_hash).hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+class _Pending:
+    def __init__(self, tx_hash: str, submitted_block: int):
+        self.tx_hash = tx_hash
+        self.future = Future()
+        self.callbacks: List[Callable] = []
+        self.submitted_at = time.monotonic()
+        self.submitted_block = submitted_block
+        # hashes are looked up directly at least once, since they may already have
+        # landed in a block the tracker will never scan
+        self.checked = False
+
+
+class ReceiptTracker:
+    """
+    Watches many pending transaction hashes at once and resolves them as receipts land.
+
+    A single background thread polls the chain head. For every new block it fetches
+    receipts either with one batched eth_getTransactionReceipt request for all pending
+    hashes, or with eth_getBlockReceipts per block when many hashes are pending.
+    When max_poll_failures polls fail in a row, every pending hash fails with the last
+    error.
+    """
+
+    def __init__(self, w3: Web3, poll_interval: float = 0.5, timeout: float = 120, max_poll_failures: int = MAX_POLL_FAILURES):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.max_poll_failures = max_poll_failures
+        self._pending: Dict[str, _Pending] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_block: Optional[int] = None
+        self._block_receipts_supported = True
+        self._latencies: List[float] = []
+        self._inclusion_blocks: List[int] = []
+        self._failed = 0
+        self._last_error: Optional[Exception] = None
+        self._poll_failures = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def track(self, tx_hash, callback: Optional[Callable] = None) -> Future:
+        """Starts watching a hash. Returns a future resolving to its receipt."""
+        tx_hash = normalize_tx_hash(tx_hash)
+        with self._lock:
+            pending = self._pending.get(tx_hash)
+            if pending is None:
+                pending = _Pending(tx_hash, self._last_block or 0)
+                self._pending[tx_hash] = pending
+            if callback is not None:
+                pending.callbacks.append(callback)
+            self._ensure_running()
+        self._wakeup.set()
+        return pending.future
+
+    def wait(self, tx_hash, timeout: Optional[float] = None) -> AttributeDict:
+        """Blocks until the receipt of a single hash is available."""
+        future = self.track(tx_hash)
+        return future.result(timeout=self.timeout if timeout is None else timeout)
+
+    def wait_all(self, tx_hashes: list, timeout: Optional[float] = None) -> List[AttributeDict]:
+        """Blocks until all receipts are available, returned in the order of the hashes."""
+        futures = [self.track(tx_hash) for tx_hash in tx_hashes]
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        return [future.result(timeout=max(0, deadline - time.monotonic())) for future in futures]
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def metrics(self) -> dict:
+        """Latency-to-inclusion statistics for all receipts resolved so far."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            blocks = list(self._inclusion_blocks)
+            pending = len(self._pending)
+        stats = {
+            "resolved": len(latencies),
+            "pending": pending,
+            "timed_out": self._failed,
+        }
+        if latencies:
+            stats.update({
+                "latency_avg": sum(latencies) / len(latencies),
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p95": _percentile(latencies, 95),
+                "latency_max": latencies[-1],
+                "blocks_to_inclusion_avg": sum(blocks) / len(blocks),
+            })
+        return stats
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval * 4)
+            self._thread = None
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="receipt-tracker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                if not self._pending:
+                    # forget the head so an idle tracker does not rescan old blocks
+                    self._thread = None
+                    self._last_block = None
+                    return
+            try:
+                self._poll()
+                self._poll_failures = 0
+            except Exception as e:
+                # transient RPC failures are retried on the next tick, a node that keeps
+                # failing fails every pending hash
+                self._last_error = e
+                self._poll_failures += 1
+                if self._poll_failures >= self.max_poll_failures:
+                    self._fail_pending(e)
+            self._expire()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _poll(self):
+        head = self.w3.eth.block_number
+        with self._lock:
+            unchecked = [p.tx_hash for p in self._pending.values() if not p.checked]
+            pending_count = len(self._pending)
+            for pending in self._pending.values():
+                if not pending.submitted_block:
+                    pending.submitted_block = head
+        if self._last_block is not None and head <= self._last_block and not unchecked:
+            return
+        first_block = head if self._last_block is None else self._last_block + 1
+
+        if (
+            self._block_receipts_supported
+            and pending_count - len(unchecked) >= BLOCK_RECEIPTS_THRESHOLD
+        ):
+            self._fetch_block_receipts(first_block, head)
+            self._fetch_by_hash(unchecked)
+        else:
+            with self._lock:
+                hashes = list(self._pending)
+            self._fetch_by_hash(hashes)
+        self._last_block = head
+
+    def _fetch_block_receipts(self, first_block: int, last_block: int):
+        for block_number in range(first_block, last_block + 1):
+            try:
+                receipts = self.w3.eth.get_block_receipts(block_number)
+            except Exception:
+                # node does not implement eth_getBlockReceipts, use per-hash lookups
+                self._block_receipts_supported = False
+                with self._lock:
+                    hashes = list(self._pending)
+                self._fetch_by_hash(hashes)
+                return
+            for receipt in receipts:
+                self._resolve(receipt)
+
+    def _fetch_by_hash(self, hashes: List[str]):
+        if not hashes:
+            return
+        responses = self.w3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+        )
+        if isinstance(responses, dict):
+            # some nodes answer a whole batch with a single error object
+            raise RuntimeError(f"Batch receipt request failed: {responses.get('error')}")
+        for tx_hash, response in zip(hashes, _sort_by_id(responses)):
+            with self._lock:
+                pending = self._pending.get(tx_hash)
+                if pending is not None:
+                    pending.checked = True
+            result = response.get("result")
+            if result:
+                self._resolve(AttributeDict.recursive(receipt_formatter(result)))
+
+    def _resolve(self, receipt: AttributeDict):
+        tx_hash = normalize_tx_hash(receipt["transactionHash"])
+        with self._lock:
+            pending = self._pending.pop(tx_hash, None)
+            if pending is None:
+                return
+            self._latencies.append(time.monotonic() - pending.submitted_at)
+            self._inclusion_blocks.append(max(0, receipt["blockNumber"] - pending.submitted_block))
+        pending.future.set_result(receipt)
+        for callback in pending.callbacks:
+            callback(receipt)
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            failed = list(self._pending.values())
+            self._pending.clear()
+        self._poll_failures = 0
+        for pending in failed:
+            pending.future.set_exception(error)
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [p for p in self._pending.values() if now - p.submitted_at > self.timeout]
+            for pending in expired:
+                del self._pending[pending.tx_hash]
+                self._failed += 1
+        for pending in expired:
+            error = TimeoutError(f"Transaction {pending.tx_hash} is not in the chain after {self.timeout} seconds")
+            # the last poll failure, if any, is often why the receipt was never seen
+            error.__cause__ = self._last_error
+            pending.future.set_exception(error)
+
+
+def _sort_by_id(responses: list) -> list:
+    if all(response.get("id") is not None for response in responses):
+        return sorted(responses, key=lambda response: response["id"])
+    return responses
+
+
+def _percentile(sorted_values: list, percentile: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percentile / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+_trackers: Dict[int, ReceiptTracker] = {}
+
+
+def get_tracker(w3: Web3) -> ReceiptTracker:
+    """Returns a shared tracker per Web3 instance."""
+    tracker = _trackers.get(id(w3))
+    if tracker is None or tracker.w3 is not w3:
+        tracker = ReceiptTracker(w3)
+        _trackers[id(w3)] = tracker
+    return tracker
+
+
+def wait_for_receipt(w3: Web3, tx_hash, timeout: Optional[float] = None) -> AttributeDict:
+    """Drop-in replacement for w3.eth.wait_for_transaction_receipt backed by the shared tracker."""
+    return get_tracker(w3).wait(tx_hash, timeout)
@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+
+CASSETTE_VERSION = 1
+
+
+def _open(path: str, mode: str):
+    """Cassettes ending in .gz are gzip compressed"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(method: str, params: Any) -> str:
+    """Canonical JSON of a request, the same for equal params whatever their Python types (HexBytes, checksum case...)"""
+    encoded = FriendlyJsonSerde().json_encode(params if params is not None else [], Web3JsonEncoder)
+    return method + json.dumps(json.loads(encoded.lower()), sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """
+    Recording of JSON-RPC requests and responses, for deterministic offline replays of
+    queries and commands.
+
+    The file has one JSON object per line: a header, then every request with its
+    response and latency in the order they were made. A batch is recorded as a single
+    request of method "batch". In replay, requests are matched on method and params:
+    equal requests get their responses in recording order and the last one is reused
+    once they run out, so polling loops (receipt waits, pagination retries) that make
+    a different number of requests still replay.
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency: float = 0.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode}, expected record or replay")
+        self.path = os.path.expanduser(path)
+        self.mode = mode
+        # replayed responses wait for their recorded latency times this factor
+        self.latency = latency
+        self.rpc_url: Optional[str] = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._responses: Dict[str, Deque[Tuple[bytes, float]]] = {}
+        self._last: Dict[str, Tuple[bytes, float]] = {}
+        self.recorded = 0
+        self.replayed = 0
+        if mode == "replay":
+            self._load()
+
+    def open(self, rpc_url: str):
+        """Starts recording the requests made to rpc_url"""
+        with self._lock:
+            if self._file is None:
+                self.rpc_url = rpc_url
+                self._file = _open(self.path, "w")
+                self._file.write(json.dumps({"version": CASSETTE_VERSION, "rpc_url": rpc_url, "recorded_at": time.time()}) + "\n")
+
+    def record(self, method: str, params: Any, response: Any, elapsed: float):
+        line = FriendlyJsonSerde().json_encode(
+            {"method": method, "params": params, "response": response, "elapsed": round(elapsed, 6)},
+            Web3JsonEncoder,
+        )
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+                self.recorded += 1
+
+    def _load(self):
+        with _open(self.path, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {header.get('version')} in {self.path}")
+            self.rpc_url = header.get("rpc_url")
+            for line in f:
+                entry = json.loads(line)
+                # responses are kept encoded, replays pay the same decoding cost as live requests
+                raw = json.dumps(entry["response"]).encode()
+                self._responses.setdefault(request_key(entry["method"], entry["params"]), deque()).append(
+                    (raw, entry["elapsed"])
+                )
+
+    def replay(self, method: str, params: Any) -> bytes:
+        """Encoded response recorded for a request, after its recorded latency scaled by the latency factor"""
+        key = request_key(method, params)
+        with self._lock:
+            queue = self._responses.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            recorded = self._last.get(key)
+            self.replayed += 1
+        if recorded is None:
+            raise LookupError(f"No {method} request with params {params} in cassette {self.path}")
+        raw, elapsed = recorded
+        if self.latency:
+            time.sleep(elapsed * self.latency)
+        return raw
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def batch_params(requests: List[Tuple[str, Any]]) -> list:
+    return [[method, params] for method, params in requests]
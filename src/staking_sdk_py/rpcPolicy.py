@@ -0,0 +1,131 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+# not retried: a transaction that may have reached the node is resent by the nonce manager's caller
+NON_IDEMPOTENT_METHODS = ("eth_sendRawTransaction", "eth_sendTransaction")
+
+# JSON-RPC error codes of overloaded or rate limiting nodes: limit exceeded, resource unavailable, too many requests
+RETRYABLE_ERROR_CODES = (-32005, -32002, 429)
+RETRYABLE_ERROR_MESSAGES = ("rate limit", "too many requests", "timeout", "timed out", "try again", "temporarily unavailable")
+RETRYABLE_HTTP_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised without a request while an endpoint's circuit breaker is open"""
+
+
+class RetryPolicy:
+    """
+    Timeouts and retries of JSON-RPC requests.
+
+    Idempotent requests failing with a connection error, a timeout, a 5xx/429 HTTP
+    status or a rate limiting JSON-RPC error are retried up to attempts times in all,
+    after a full-jitter exponential backoff: a random delay between 0 and
+    base_delay * 2**retry, capped at max_delay. Reverts and other JSON-RPC errors are
+    returned at once. timeout is the HTTP timeout of a single attempt, method_timeouts
+    overrides it per JSON-RPC method.
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        timeout: float = 10.0,
+        method_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.method_timeouts = dict(method_timeouts or {})
+
+    def timeout_for(self, method: str) -> float:
+        return self.method_timeouts.get(method, self.timeout)
+
+    def attempts_for(self, method: str, batch_methods=()) -> int:
+        if method in NON_IDEMPOTENT_METHODS or any(m in NON_IDEMPOTENT_METHODS for m in batch_methods):
+            return 1
+        return self.attempts
+
+    def delay(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+    @staticmethod
+    def is_retryable_error(error: BaseException) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, requests.HTTPError):
+            return error.response is not None and error.response.status_code in RETRYABLE_HTTP_STATUS
+        return isinstance(error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+    @staticmethod
+    def is_retryable_response(response) -> bool:
+        responses = response if isinstance(response, list) else [response]
+        for item in responses:
+            error = item.get("error") if isinstance(item, dict) else None
+            if not isinstance(error, dict):
+                continue
+            message = str(error.get("message", "")).lower()
+            if error.get("code") in RETRYABLE_ERROR_CODES or any(text in message for text in RETRYABLE_ERROR_MESSAGES):
+                return True
+        return False
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to an endpoint that keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and requests fail
+    at once with CircuitOpenError. After reset_timeout seconds one trial request is let
+    through (half open): its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now, taking the half open trial slot if it is free"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def failure(self) -> bool:
+        """Records a failure, returns True when it opened the circuit"""
+        with self._lock:
+            self.failures += 1
+            if self._trial or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                self._trial = False
+                return True
+            return False
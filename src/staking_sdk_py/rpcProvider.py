@@ -0,0 +1,606 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import requests
+from web3 import Web3
+from web3.providers import HTTPProvider
+
+from staking_sdk_py.metrics import METRICS, Metrics
+from staking_sdk_py.rpcCassette import Cassette, batch_params
+from staking_sdk_py.rpcPolicy import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+# methods sent to every endpoint of a MultiEndpointProvider
+WRITE_METHODS = ("eth_sendRawTransaction",)
+# latencies kept per endpoint for the hedging delay (p95)
+LATENCY_WINDOW = 100
+MIN_HEDGE_SAMPLES = 10
+DEFAULT_HEDGE_DELAY = 0.5
+EWMA_ALPHA = 0.3
+
+log = logging.getLogger(__name__)
+
+
+class _AttemptCountingSession(requests.Session):
+    """requests session reporting every HTTP attempt, so retries inside web3 are counted."""
+
+    def __init__(self, on_attempt):
+        super().__init__()
+        self._on_attempt = on_attempt
+
+    def post(self, *args, **kwargs):
+        self._on_attempt()
+        return super().post(*args, **kwargs)
+
+
+class InstrumentedHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider recording, per JSON-RPC method, request count, latency, request and
+    response bytes, errors and retries into a Metrics instance, and every request and
+    response into a cassette when one is given.
+
+    With a policy, requests get its per-method timeouts and retries instead of web3's
+    own retries; with a breaker, requests fail fast while the endpoint keeps failing.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: Optional[str] = None,
+        metrics: Optional[Metrics] = None,
+        cassette: Optional[Cassette] = None,
+        policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        **kwargs: Any,
+    ):
+        kwargs.setdefault("session", _AttemptCountingSession(self._on_attempt))
+        if policy is not None:
+            kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(endpoint_uri, **kwargs)
+        self.metrics = metrics or METRICS
+        self.cassette = cassette
+        self.policy = policy
+        self.breaker = breaker
+        if cassette is not None and cassette.mode == "record":
+            cassette.open(str(self.endpoint_uri))
+        self._local = threading.local()
+
+    def make_request(self, method, params):
+        return self._instrumented(
+            method, params, lambda: super(InstrumentedHTTPProvider, self).make_request(method, params)
+        )
+
+    def make_batch_request(self, batch_requests: List[Tuple[str, Any]]):
+        for method, _ in batch_requests:
+            self.metrics.inc("staking_rpc_batched_requests_total", {"method": method})
+        return self._instrumented(
+            "batch",
+            batch_params(batch_requests),
+            lambda: super(InstrumentedHTTPProvider, self).make_batch_request(batch_requests),
+        )
+
+    def encode_rpc_request(self, method, params) -> bytes:
+        encoded = super().encode_rpc_request(method, params)
+        self.metrics.inc("staking_rpc_request_bytes_total", {"method": method}, len(encoded))
+        return encoded
+
+    def encode_batch_rpc_request(self, requests) -> bytes:
+        encoded = super().encode_batch_rpc_request(requests)
+        self.metrics.inc("staking_rpc_request_bytes_total", {"method": "batch"}, len(encoded))
+        return encoded
+
+    def decode_rpc_response(self, raw_response: bytes):
+        method = getattr(self._local, "method", None)
+        if method is not None:
+            self.metrics.inc("staking_rpc_response_bytes_total", {"method": method}, len(raw_response))
+        return super().decode_rpc_response(raw_response)
+
+    def get_request_kwargs(self):
+        return self._request_kwargs_for(super().get_request_kwargs())
+
+    def _request_kwargs_for(self, request_kwargs: dict) -> dict:
+        """HTTP request kwargs with the policy timeout of the method being sent, unless request_kwargs set one"""
+        method = getattr(self._local, "method", None)
+        if self.policy is not None and method is not None:
+            request_kwargs.setdefault("timeout", self.policy.timeout_for(method))
+        return request_kwargs
+
+    def _on_attempt(self):
+        method = getattr(self._local, "method", None)
+        if method is None:
+            return
+        self._local.attempts += 1
+        if self._local.attempts > 1:
+            self.metrics.inc("staking_rpc_retries_total", {"method": method})
+
+    def _instrumented(self, method: str, params, request):
+        labels = {"method": method}
+        self._local.method = method
+        self._local.attempts = 0
+        self.metrics.inc("staking_rpc_requests_total", labels)
+        start = time.perf_counter()
+        try:
+            response = self._with_retries(method, params, lambda: self._guarded(request))
+        except Exception:
+            self.metrics.inc("staking_rpc_errors_total", labels)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.observe("staking_rpc_request_seconds", elapsed, labels)
+            self._local.method = None
+        if isinstance(response, dict) and response.get("error"):
+            self.metrics.inc("staking_rpc_errors_total", labels)
+        if self.cassette is not None and self.cassette.mode == "record":
+            self.cassette.record(method, params, response, elapsed)
+        return response
+
+    def _with_retries(self, method: str, params, send: Callable):
+        """Sends a request, again after a backoff while it fails transiently and the policy allows it"""
+        if self.policy is None:
+            return send()
+        attempts = self.policy.attempts_for(method, [m for m, _ in params] if method == "batch" else ())
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(self.policy.delay(attempt - 1))
+                self.metrics.inc("staking_rpc_retries_total", {"method": method})
+            # HTTP attempts are counted per try, web3's own retries being disabled
+            self._local.method = method
+            self._local.attempts = 0
+            try:
+                response = send()
+            except Exception as e:
+                if attempt == attempts - 1 or not self.policy.is_retryable_error(e):
+                    raise
+                continue
+            if attempt == attempts - 1 or not self.policy.is_retryable_response(response):
+                return response
+
+    def _guarded(self, request: Callable):
+        if self.breaker is None:
+            return request()
+        url = str(self.endpoint_uri)
+        self._admit(self.breaker, url)
+        try:
+            response = request()
+        except Exception as e:
+            self._settle(self.breaker, url, error=e)
+            raise
+        self._settle(self.breaker, url, response=response)
+        return response
+
+    def _admit(self, breaker: CircuitBreaker, url: str):
+        """Fails fast while the circuit breaker of url is open"""
+        if not breaker.allow():
+            self.metrics.inc("staking_rpc_circuit_rejected_total", {"endpoint": url})
+            raise CircuitOpenError(f"RPC endpoint {url} is skipped after {breaker.failures} consecutive failures")
+
+    def _settle(self, breaker: CircuitBreaker, url: str, response=None, error: Optional[BaseException] = None):
+        """Feeds the outcome of a request to the circuit breaker: transient failures count, any answer resets it"""
+        failed = RetryPolicy.is_retryable_error(error) if error is not None else RetryPolicy.is_retryable_response(response)
+        if not failed:
+            breaker.success()
+        elif breaker.failure():
+            self.metrics.inc("staking_rpc_circuit_opened_total", {"endpoint": url})
+
+
+class ReplayProvider(InstrumentedHTTPProvider):
+    """
+    Provider answering from a recorded cassette instead of the network, with the same
+    metrics and response decoding as live requests.
+    """
+
+    def __init__(self, cassette: Cassette, metrics: Optional[Metrics] = None, **kwargs: Any):
+        super().__init__(cassette.rpc_url, metrics, cassette, **kwargs)
+
+    def make_request(self, method, params):
+        def replay():
+            self.encode_rpc_request(method, params)
+            return self.decode_rpc_response(self.cassette.replay(method, params))
+
+        return self._instrumented(method, params, replay)
+
+    def make_batch_request(self, batch_requests: List[Tuple[str, Any]]):
+        for method, _ in batch_requests:
+            self.metrics.inc("staking_rpc_batched_requests_total", {"method": method})
+        params = batch_params(batch_requests)
+
+        def replay():
+            self.encode_batch_rpc_request(batch_requests)
+            return self.decode_rpc_response(self.cassette.replay("batch", params))
+
+        return self._instrumented("batch", params, replay)
+
+
+class _EndpointHTTPProvider(HTTPProvider):
+    """Transport to one endpoint, encoding and decoding through its MultiEndpointProvider so bytes are counted"""
+
+    def __init__(self, endpoint_uri: str, owner: "MultiEndpointProvider", **kwargs: Any):
+        kwargs.setdefault("session", _AttemptCountingSession(owner._on_attempt))
+        super().__init__(endpoint_uri, **kwargs)
+        self.owner = owner
+
+    def get_request_kwargs(self):
+        return self.owner._request_kwargs_for(super().get_request_kwargs())
+
+    def encode_rpc_request(self, method, params) -> bytes:
+        return self.owner.encode_rpc_request(method, params)
+
+    def encode_batch_rpc_request(self, requests) -> bytes:
+        return self.owner.encode_batch_rpc_request(requests)
+
+    def decode_rpc_response(self, raw_response: bytes):
+        return self.owner.decode_rpc_response(raw_response)
+
+
+class Endpoint:
+    """Health, chain and latency of one endpoint of a MultiEndpointProvider"""
+
+    def __init__(self, url: str, provider: HTTPProvider, breaker: CircuitBreaker):
+        self.url = url
+        self.provider = provider
+        self.breaker = breaker
+        self.ewma: Optional[float] = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.healthy = True
+        # set when the endpoint serves another chain, it is then never used again
+        self.excluded = False
+        self.chain_id: Optional[int] = None
+        self.block_number: Optional[int] = None
+        self.last_error: Optional[str] = None
+
+    def observe(self, seconds: float):
+        self.ewma = seconds if self.ewma is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.ewma
+        self.latencies.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[int(0.95 * (len(latencies) - 1))]
+
+    def status(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy and not self.excluded,
+            "excluded": self.excluded,
+            "circuit": self.breaker.state,
+            "ewma_ms": round(self.ewma * 1000, 3) if self.ewma is not None else None,
+            "p95_ms": round(self.p95() * 1000, 3) if self.p95() is not None else None,
+            "chain_id": self.chain_id,
+            "block_number": self.block_number,
+            "last_error": self.last_error,
+        }
+
+
+class MultiEndpointProvider(InstrumentedHTTPProvider):
+    """
+    Provider spreading requests over several RPC endpoints of the same chain.
+
+    Reads go to the healthy endpoint with the lowest latency (EWMA) and fail over to
+    the next ones. With hedge, a read that the first endpoint has not answered within
+    its p95 latency is also sent to the second one, and the first answer wins.
+    Transactions are sent to every endpoint at once for faster propagation, and the
+    transaction hashes they return are compared.
+
+    Endpoints are checked on first use and then every health_check_interval seconds:
+    one that fails, serves another chain id or lags more than max_block_lag blocks
+    behind the highest one is skipped until a later check finds it healthy. Between
+    checks, each endpoint has a circuit breaker opening after failure_threshold
+    consecutive failed requests, and the endpoint is skipped while it is open.
+    """
+
+    def __init__(
+        self,
+        endpoint_uris: Sequence[str],
+        metrics: Optional[Metrics] = None,
+        cassette: Optional[Cassette] = None,
+        chain_id: Optional[int] = None,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        health_check_interval: float = 10.0,
+        max_block_lag: int = 5,
+        policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        **kwargs: Any,
+    ):
+        if not endpoint_uris:
+            raise ValueError("At least one RPC endpoint is required")
+        if policy is not None:
+            kwargs.setdefault("exception_retry_configuration", None)
+        super().__init__(endpoint_uris[0], metrics, cassette, policy, **kwargs)
+        self.endpoints = [
+            Endpoint(url, _EndpointHTTPProvider(url, self, **kwargs), CircuitBreaker(failure_threshold, reset_timeout))
+            for url in endpoint_uris
+        ]
+        self.chain_id = chain_id
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.health_check_interval = health_check_interval
+        self.max_block_lag = max_block_lag
+        self._state_lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._checked = threading.Event()
+        self._stopped = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        # hedged reads and broadcasts, each endpoint can have a read and a write in flight per caller
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(self.endpoints), thread_name_prefix="rpc-endpoint")
+
+    # ===== requests =====
+
+    def make_request(self, method, params):
+        if not self._checked.is_set():
+            self.start()
+        if method in WRITE_METHODS:
+            return self._instrumented(
+                method, params, lambda: self._broadcast(method, lambda endpoint: endpoint.provider.make_request(method, params))
+            )
+        return self._instrumented(
+            method, params, lambda: self._read(method, lambda endpoint: endpoint.provider.make_request(method, params))
+        )
+
+    def make_batch_request(self, batch_requests: List[Tuple[str, Any]]):
+        if not self._checked.is_set():
+            self.start()
+        for method, _ in batch_requests:
+            self.metrics.inc("staking_rpc_batched_requests_total", {"method": method})
+
+        def send(endpoint: Endpoint):
+            return endpoint.provider.make_batch_request(batch_requests)
+
+        # a batch carrying any transaction is broadcast like a single one
+        if any(method in WRITE_METHODS for method, _ in batch_requests):
+            return self._instrumented("batch", batch_params(batch_requests), lambda: self._broadcast("batch", send))
+        return self._instrumented("batch", batch_params(batch_requests), lambda: self._read("batch", send))
+
+    def _call(self, endpoint: Endpoint, method: str, send: Callable):
+        """One request to one endpoint, feeding its latency and circuit breaker"""
+        self._admit(endpoint.breaker, endpoint.url)
+        self._local.method = method
+        if not hasattr(self._local, "attempts"):
+            self._local.attempts = 0
+        labels = {"endpoint": endpoint.url}
+        self.metrics.inc("staking_rpc_endpoint_requests_total", labels)
+        start = time.perf_counter()
+        try:
+            response = send(endpoint)
+        except Exception as e:
+            self.metrics.inc("staking_rpc_endpoint_errors_total", labels)
+            self._settle(endpoint.breaker, endpoint.url, error=e)
+            with self._state_lock:
+                endpoint.last_error = f"{type(e).__name__}: {e}"
+            raise
+        self._settle(endpoint.breaker, endpoint.url, response=response)
+        elapsed = time.perf_counter() - start
+        self.metrics.observe("staking_rpc_endpoint_seconds", elapsed, labels)
+        with self._state_lock:
+            endpoint.observe(elapsed)
+            if method == "eth_blockNumber" and isinstance(response, dict) and "result" in response:
+                endpoint.block_number = max(endpoint.block_number or 0, int(response["result"], 16))
+        return response
+
+    def _submit(self, endpoint: Endpoint, method: str, send: Callable) -> Future:
+        """_call on a pool thread, where HTTP attempts of earlier requests are not retries of this one"""
+        def call():
+            self._local.attempts = 0
+            return self._call(endpoint, method, send)
+
+        return self._executor.submit(call)
+
+    def ranked(self) -> List[Endpoint]:
+        """Usable endpoints, healthy ones first by latency, endpoints not measured yet before slow ones"""
+        with self._state_lock:
+            usable = [endpoint for endpoint in self.endpoints if not endpoint.excluded]
+            healthy = [endpoint for endpoint in usable if endpoint.healthy and endpoint.breaker.state != "open"]
+            # with no healthy endpoint left, the others are still tried rather than failing outright
+            return sorted(healthy or usable, key=lambda endpoint: endpoint.ewma or 0.0)
+
+    def _read(self, method: str, send: Callable):
+        endpoints = self.ranked()
+        if not endpoints:
+            raise ConnectionError("No RPC endpoint serves the configured chain")
+        if self.hedge and len(endpoints) > 1:
+            return self._hedged(method, send, endpoints)
+        return self._failover(method, send, endpoints)
+
+    def _failover(self, method: str, send: Callable, endpoints: List[Endpoint]):
+        error = None
+        response = None
+        for endpoint in endpoints:
+            try:
+                response = self._call(endpoint, method, send)
+            except Exception as e:
+                error = e
+                continue
+            # a rate limited endpoint hands the read over to the next one
+            if self.policy is None or not self.policy.is_retryable_response(response):
+                return response
+        if response is not None:
+            return response
+        raise error
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        with self._state_lock:
+            p95 = endpoint.p95()
+            ewma = endpoint.ewma
+        if p95 is not None:
+            return max(self.hedge_min_delay, p95)
+        if ewma is not None:
+            return max(self.hedge_min_delay, 2 * ewma)
+        return DEFAULT_HEDGE_DELAY
+
+    def _hedged(self, method: str, send: Callable, endpoints: List[Endpoint]):
+        primary = self._submit(endpoints[0], method, send)
+        done, _ = wait([primary], timeout=self.hedge_delay(endpoints[0]))
+        if done and primary.exception() is None:
+            return primary.result()
+        self.metrics.inc("staking_rpc_hedged_requests_total", {"method": method})
+        pending = {self._submit(endpoints[1], method, send)}
+        if not done:
+            pending.add(primary)
+        error = primary.exception() if done else None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        # both failed, the remaining endpoints are tried in turn
+        if len(endpoints) > 2:
+            return self._failover(method, send, endpoints[2:])
+        raise error
+
+    def _broadcast(self, method: str, send: Callable):
+        """
+        Sends a transaction, or a batch with transactions, to every usable endpoint.
+        Returns the first response accepting all of them.
+        """
+        with self._state_lock:
+            endpoints = [endpoint for endpoint in self.endpoints if not endpoint.excluded]
+        if not endpoints:
+            raise ConnectionError("No RPC endpoint serves the configured chain")
+        futures = [self._submit(endpoint, method, send) for endpoint in endpoints]
+        accepted: Optional[Future] = None
+        pending = set(futures)
+        while pending and accepted is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and _accepted(future.result()):
+                    accepted = future
+                    break
+        if accepted is None:
+            # nobody accepted it: the error of the preferred endpoint that answered
+            for future in futures:
+                if future.exception() is None:
+                    return future.result()
+            raise futures[0].exception()
+        tx_hashes = _results(accepted.result())
+        for endpoint, future in zip(endpoints, futures):
+            future.add_done_callback(lambda future, endpoint=endpoint: self._check_broadcast(endpoint, future, tx_hashes))
+        return accepted.result()
+
+    def _check_broadcast(self, endpoint: Endpoint, future: Future, tx_hashes: list):
+        """Endpoints accepting a transaction must agree on its hash"""
+        if future.exception() is not None:
+            return
+        for result, tx_hash in zip(_results(future.result()), tx_hashes):
+            if result is not None and tx_hash is not None and str(result).lower() != str(tx_hash).lower():
+                # the endpoints do not see the same signed payload
+                self.metrics.inc("staking_rpc_broadcast_mismatches_total")
+                log.warning(f"Endpoint {endpoint.url} returned transaction hash {result}, the first accepting endpoint returned {tx_hash}")
+
+    # ===== health =====
+
+    def start(self) -> List[dict]:
+        """Runs the first health check and starts the periodic ones, once; returns the endpoints status"""
+        if not self._checked.is_set():
+            with self._check_lock:
+                if not self._checked.is_set():
+                    self.check_health()
+                    self._checked.set()
+                    if self.health_check_interval:
+                        self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+                        self._health_thread.start()
+        return self.status()
+
+    def _health_loop(self):
+        while not self._stopped.wait(self.health_check_interval):
+            self.check_health()
+
+    def check_health(self) -> List[dict]:
+        """Checks chain id and head block of every endpoint in parallel, returns their status"""
+        def probe(endpoint: Endpoint):
+            self._local.method = "batch"
+            self._local.attempts = 0
+            start = time.perf_counter()
+            responses = endpoint.provider.make_batch_request([("eth_chainId", []), ("eth_blockNumber", [])])
+            if not isinstance(responses, list) or any("error" in response for response in responses):
+                raise ConnectionError(f"health check failed: {responses}")
+            return time.perf_counter() - start, int(responses[0]["result"], 16), int(responses[1]["result"], 16)
+
+        futures = {endpoint: self._executor.submit(probe, endpoint) for endpoint in self.endpoints}
+        results = {}
+        for endpoint, future in futures.items():
+            try:
+                results[endpoint] = future.result()
+            except Exception as e:
+                results[endpoint] = e
+        with self._state_lock:
+            chain_ids = [result[1] for result in results.values() if not isinstance(result, Exception)]
+            expected_chain_id = self.chain_id if self.chain_id is not None else (chain_ids[0] if chain_ids else None)
+            heads = [
+                result[2] for result in results.values()
+                if not isinstance(result, Exception) and result[1] == expected_chain_id
+            ]
+            highest = max(heads, default=None)
+            for endpoint, result in results.items():
+                if isinstance(result, Exception):
+                    endpoint.healthy = False
+                    endpoint.last_error = f"{type(result).__name__}: {result}"
+                    continue
+                latency, endpoint.chain_id, endpoint.block_number = result
+                endpoint.observe(latency)
+                if endpoint.chain_id != expected_chain_id:
+                    endpoint.excluded = True
+                    endpoint.last_error = f"chain id {endpoint.chain_id}, expected {expected_chain_id}"
+                elif highest - endpoint.block_number > self.max_block_lag:
+                    endpoint.healthy = False
+                    endpoint.last_error = f"{highest - endpoint.block_number} blocks behind"
+                else:
+                    endpoint.healthy = True
+                    endpoint.last_error = None
+                    # a healthy check closes the circuit before its reset timeout
+                    endpoint.breaker.success()
+            return [endpoint.status() for endpoint in self.endpoints]
+
+    def status(self) -> List[dict]:
+        with self._state_lock:
+            return [endpoint.status() for endpoint in self.endpoints]
+
+    def close(self):
+        self._stopped.set()
+        self._executor.shutdown(wait=False)
+
+
+def _accepted(response) -> bool:
+    """A response, or every response of a batch, carries no error"""
+    if isinstance(response, list):
+        return all("error" not in item for item in response)
+    return "error" not in response
+
+
+def _results(response) -> list:
+    """Results of a response, or of a batch response in request order"""
+    if isinstance(response, dict):
+        return [response.get("result")]
+    if all(item.get("id") is not None for item in response):
+        response = sorted(response, key=lambda item: item["id"])
+    return [item.get("result") for item in response]
+
+
+def connect(rpc_url: str, metrics: Optional[Metrics] = None, cassette: Optional[Cassette] = None, **kwargs: Any) -> Web3:
+    """
+    Web3 instance over an instrumented HTTP provider, recording into the cassette in
+    record mode, or answering from it without network access in replay mode.
+    """
+    if cassette is not None and cassette.mode == "replay":
+        return Web3(ReplayProvider(cassette, metrics, **kwargs))
+    return Web3(InstrumentedHTTPProvider(rpc_url, metrics, cassette, **kwargs))
+
+
+def connect_endpoints(
+    rpc_urls: Sequence[str], metrics: Optional[Metrics] = None, cassette: Optional[Cassette] = None, **options: Any
+) -> Web3:
+    """
+    Web3 instance over a MultiEndpointProvider when several endpoints are given (see
+    its options), or over a single instrumented HTTP provider with the same retry
+    policy and circuit breaker options.
+    """
+    if cassette is not None and cassette.mode == "replay":
+        return connect(rpc_urls[0], metrics, cassette)
+    if len(rpc_urls) == 1:
+        breaker = CircuitBreaker(options.get("failure_threshold", 5), options.get("reset_timeout", 30.0))
+        return connect(rpc_urls[0], metrics, cassette, policy=options.get("policy"), breaker=breaker)
+    return Web3(MultiEndpointProvider(rpc_urls, metrics, cassette, **options))
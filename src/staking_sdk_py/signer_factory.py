@@ -1,14 +1,25 @@
+import json
+import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import List, Optional
 
 from eth_account import Account
+# eth_account only exposes signing with a prepared key object privately; it is only
+# used with the coincurve backend, where it is what makes signing fast
+from eth_account._utils.signing import sign_transaction_dict
 from eth_account.datastructures import SignedTransaction
-from ledgerblue.comm import getDongle
-from ledgereth.accounts import get_account_by_path
-from ledgereth.objects import SignedTransaction as LedgerSignedTransaction
-from ledgereth.transactions import Type2Transaction, sign_transaction
-from rlp import encode
+from eth_keys import keys
+from eth_keys.backends import CoinCurveECCBackend
+from eth_utils import keccak
+from hexbytes import HexBytes
 from web3 import Web3
 
+from staking_sdk_py.metrics import METRICS
+
 
 class Signer(ABC):
     """
@@ -23,13 +34,26 @@ class Signer(ABC):
     def sign_transaction(self, tx: dict) -> SignedTransaction:
         pass
 
+    def sign_many(self, txs: List[dict]) -> List[SignedTransaction]:
+        """Signs several transactions, returned in the same order."""
+        return [self.sign_transaction(tx) for tx in txs]
+
 
 class LocalSigner(Signer):
     """
     Signer implementation using a local private key.
+
+    With coincurve installed (``pip install coincurve``) the key object is prepared
+    once for that backend and reused for every signature, which is much faster than
+    eth_account. Without it, transactions are signed with Account.sign_transaction;
+    both produce identical signatures.
+
+    Args:
+        private_key (str): hex private key, with or without 0x prefix
+        backend (str): "coincurve", "eth_account", or None to pick the fastest available
     """
 
-    def __init__(self, private_key: str):
+    def __init__(self, private_key: str, backend: Optional[str] = None):
         self.private_key_hex = (
             private_key[2:] if private_key.startswith("0x") else private_key
         )
@@ -37,12 +61,41 @@ class LocalSigner(Signer):
             raise ValueError("Private key must be 32 bytes (64 hex characters)")
         self.account = Account.from_key(self.private_key_hex)
         self.address = Web3.to_checksum_address(self.account.address)
+        self.backend = backend or ("coincurve" if is_coincurve_available() else "eth_account")
+        self._key = None
+        if self.backend == "coincurve":
+            if not is_coincurve_available():
+                raise ValueError("The coincurve signing backend requires: pip install coincurve")
+            self._key = keys.PrivateKey(bytes.fromhex(self.private_key_hex), backend=CoinCurveECCBackend())
+        elif self.backend != "eth_account":
+            raise ValueError(f"Unknown signing backend {self.backend}, must be 'coincurve' or 'eth_account'")
 
     def get_address(self) -> str:
         return self.address
 
     def sign_transaction(self, tx: dict) -> SignedTransaction:
-        return self.account.sign_transaction(tx)
+        if "from" in tx:
+            if str(tx["from"]).lower() != self.address.lower():
+                raise TypeError(f"from field must match key's {self.address}, but it was {tx['from']}")
+            tx = {key: value for key, value in tx.items() if key != "from"}
+        if self._key is None:
+            return self.account.sign_transaction(tx)
+        v, r, s, encoded = sign_transaction_dict(self._key, tx)
+        return SignedTransaction(
+            raw_transaction=HexBytes(encoded),
+            hash=HexBytes(keccak(encoded)),
+            r=r,
+            s=s,
+            v=v,
+        )
+
+
+def is_coincurve_available() -> bool:
+    try:
+        import coincurve  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
 def strip_0x(hex_str: str) -> str:
@@ -53,22 +106,113 @@ class LedgerSigner(Signer):
     """
     Signer implementation using a Ledger hardware wallet.
 
+    One dongle session is kept open for the lifetime of the signer. Signing requests go
+    through a queue served by a single worker thread, so many transactions can be
+    reviewed back-to-back on the device without reopening the USB transport.
+
     Args:
         derivation_path (str): BIP32 derivation path (e.g. default "44'/60'/0'/0/0")
+        address_cache_path (str): optional JSON file caching the address of each
+            derivation path. A cached address is used without opening the device and is
+            verified against the device before the first signature.
     """
 
-    def __init__(self, derivation_path: str = "44'/60'/0'/0/0"):
-        self.dongle = getDongle()
+    def __init__(self, derivation_path: str = "44'/60'/0'/0/0", address_cache_path: Optional[str] = None):
         if derivation_path.startswith("m/"):
             derivation_path = derivation_path[2:]
         self.derivation_path = derivation_path
-        self.ledger_account = get_account_by_path(self.derivation_path, self.dongle)
-        self.address = Web3.to_checksum_address(self.ledger_account.address)
+        self.address_cache_path = os.path.expanduser(address_cache_path) if address_cache_path else None
+        self.dongle = None
+        self.timings: List[dict] = []
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        cached_address = self._read_address_cache().get(self.derivation_path)
+        METRICS.cache("ledger_address", bool(cached_address))
+        if cached_address:
+            self.address = Web3.to_checksum_address(cached_address)
+            self._verified = False
+        else:
+            self.address = self._device_address()
+            self._verified = True
+            self._write_address_cache()
 
     def get_address(self) -> str:
         return self.address
 
     def sign_transaction(self, tx: dict) -> SignedTransaction:
+        return self.submit(tx).result()
+
+    def sign_many(self, txs: List[dict]) -> List[SignedTransaction]:
+        futures = [self.submit(tx) for tx in txs]
+        return [future.result() for future in futures]
+
+    def submit(self, tx: dict) -> Future:
+        """Queues a transaction for signing on the device, returns a future of the signature."""
+        future: Future = Future()
+        self._queue.put((tx, future, time.monotonic()))
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._serve, name="ledger-signer", daemon=True)
+                self._worker.start()
+        return future
+
+    def timing_summary(self) -> dict:
+        """Average seconds spent per step over all signatures of this session."""
+        if not self.timings:
+            return {}
+        steps = self.timings[0].keys()
+        summary = {step: sum(t[step] for t in self.timings) / len(self.timings) for step in steps}
+        summary["count"] = len(self.timings)
+        return summary
+
+    def close(self):
+        if self.dongle is not None:
+            self.dongle.close()
+            self.dongle = None
+
+    def _serve(self):
+        while True:
+            try:
+                tx, future, queued_at = self._queue.get(timeout=1)
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._sign(tx, queued_at))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _open(self):
+        if self.dongle is None:
+            from ledgerblue.comm import getDongle
+
+            self.dongle = getDongle()
+        return self.dongle
+
+    def _device_address(self) -> str:
+        from ledgereth.accounts import get_account_by_path
+
+        ledger_account = get_account_by_path(self.derivation_path, self._open())
+        return Web3.to_checksum_address(ledger_account.address)
+
+    def _sign(self, tx: dict, queued_at: float) -> SignedTransaction:
+        from ledgereth.objects import SignedTransaction as LedgerSignedTransaction
+        from ledgereth.transactions import Type2Transaction, sign_transaction
+        from rlp import encode
+
+        started = time.monotonic()
+        if not self._verified:
+            device_address = self._device_address()
+            if device_address != self.address:
+                raise ValueError(
+                    f"Ledger address {device_address} for path {self.derivation_path} does not match "
+                    f"the cached address {self.address}, remove {self.address_cache_path} and retry"
+                )
+            self._verified = True
+        verified = time.monotonic()
 
         # Convert tx dict to ledgereth Type2Transaction
         ledger_tx = Type2Transaction(
@@ -82,19 +226,46 @@ class LedgerSigner(Signer):
             max_fee_per_gas=tx["maxFeePerGas"],
             access_list=None,
         )
+        built = time.monotonic()
 
         signed: LedgerSignedTransaction = sign_transaction(
-            ledger_tx, self.derivation_path, self.dongle
+            ledger_tx, self.derivation_path, self._open()
         )
+        confirmed = time.monotonic()
 
         # Convert ledgereth SignedTransaction to raw bytes and RLP encode
         raw_tx = signed.transaction_type.to_byte() + encode(signed, type(signed))
 
         # Return eth_account SignedTransaction
-        return SignedTransaction(
+        result = SignedTransaction(
             raw_transaction=raw_tx,
             hash=Web3.keccak(raw_tx),
             r=signed.sender_r,
             s=signed.sender_s,
             v=signed.y_parity,
         )
+        self.timings.append({
+            "queued": started - queued_at,
+            "verify_address": verified - started,
+            "build": built - verified,
+            "device": confirmed - built,
+            "encode": time.monotonic() - confirmed,
+        })
+        return result
+
+    def _read_address_cache(self) -> dict:
+        if not self.address_cache_path:
+            return {}
+        try:
+            with open(self.address_cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_address_cache(self):
+        if not self.address_cache_path:
+            return
+        cache = self._read_address_cache()
+        cache[self.derivation_path] = self.address
+        with open(self.address_cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
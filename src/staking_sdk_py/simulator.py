@@ -0,0 +1,876 @@
+"""
+Local JSON-RPC stand-in for a node with the staking precompile, for load tests and
+benchmarks without a live network.
+
+    python -m staking_sdk_py.simulator --port 8545 --validators 10000 --delegators 1000000
+
+The staking contract is an in-memory model of validators, delegations, withdrawal
+requests and epochs. Getters are answered ABI-encoded like the precompile, signed
+EIP-1559 transactions to it are executed when their block is mined and emit the
+staking events, and epochs advance every --epoch-blocks blocks or on demand with the
+staking_advanceEpoch method. Signatures inside add_validator payloads are not
+verified, and transactions with a future nonce are rejected instead of queued.
+"""
+import argparse
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+import staking_sdk_py.constants as constants
+from staking_sdk_py.events import encode_log
+
+ZERO_ADDRESS = "0x" + "00" * 20
+CHAIN_ID = 10143
+
+# precompile parameters
+PAGE_SIZE = 100
+ACTIVE_VALSET_SIZE = 200
+MIN_VALIDATE_STAKE = 100_000 * 10**18
+MAX_COMMISSION = 10**18
+WITHDRAWAL_DELAY = 1
+# fixed point scale of the reward per token accumulators
+ACC_SCALE = 10**36
+
+BASE_FEE = 50 * 10**9
+PRIORITY_FEE = 2 * 10**9
+BLOCK_GAS_LIMIT = 150_000_000
+TRANSFER_GAS = 21_000
+REVERT_GAS = 30_000
+DEFAULT_BALANCE = 10**9 * 10**18
+DEFAULT_EPOCH_REWARD = 10 * 10**18
+
+
+class Revert(Exception):
+    pass
+
+
+def _address(value: str) -> str:
+    return value.lower()
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+class Validator:
+    __slots__ = (
+        "val_id", "auth_address", "flags", "stake", "acc", "commission", "unclaimed_rewards",
+        "consensus_stake", "consensus_commission", "snapshot_stake", "snapshot_commission",
+        "secp_pubkey", "bls_pubkey", "delegations", "delegators", "pending", "acc_at",
+    )
+
+    def __init__(self, val_id: int, auth_address: str, commission: int, secp_pubkey: bytes, bls_pubkey: bytes):
+        self.val_id = val_id
+        self.auth_address = auth_address
+        self.flags = 1
+        self.stake = 0
+        self.acc = 0
+        self.commission = commission
+        self.unclaimed_rewards = 0
+        self.consensus_stake = 0
+        self.consensus_commission = 0
+        self.snapshot_stake = 0
+        self.snapshot_commission = 0
+        self.secp_pubkey = secp_pubkey
+        self.bls_pubkey = bls_pubkey
+        # delegator address -> Delegation, and the addresses in insertion order for paging
+        self.delegations: Dict[str, "Delegation"] = {}
+        self.delegators: List[str] = []
+        # stake activating at the start of an epoch, and the accumulator at that point
+        self.pending: Dict[int, int] = {}
+        self.acc_at: Dict[int, int] = {}
+
+
+class Delegation:
+    __slots__ = ("position", "stake", "acc", "rewards", "delta_stake", "delta_epoch", "withdrawals")
+
+    def __init__(self, position: int, stake: int = 0, acc: int = 0):
+        self.position = position
+        self.stake = stake
+        self.acc = acc
+        self.rewards = 0
+        self.delta_stake = 0
+        self.delta_epoch = 0
+        # withdrawal id -> (amount, accumulator, epoch)
+        self.withdrawals: Optional[Dict[int, tuple]] = None
+
+
+class StakingState:
+    """
+    In-memory model of the staking precompile.
+
+    Rewards use per-validator reward-per-token accumulators, so distributing an epoch's
+    rewards costs one update per validator whatever the number of delegators, and a
+    delegation is settled only when it is read or written.
+    """
+
+    def __init__(self, epoch_reward: int = DEFAULT_EPOCH_REWARD):
+        self.epoch = 1
+        self.epoch_reward = epoch_reward
+        self.validators: Dict[int, Validator] = {}
+        self.secp_keys = set()
+        # delegator address -> sorted ids of the validators it delegates to
+        self.delegated_to: Dict[str, List[int]] = {}
+        self.consensus_valset: List[int] = []
+        self.snapshot_valset: List[int] = []
+        self.execution_valset: List[int] = []
+
+        self.getters = {
+            constants.GET_EPOCH_SELECTOR: ([], self.get_epoch),
+            constants.GET_VALIDATOR_SELECTOR: (["uint64"], self.get_validator),
+            constants.GET_DELEGATOR_SELECTOR: (["uint64", "address"], self.get_delegator),
+            constants.GET_WITHDRAWAL_REQUEST_SELECTOR: (["uint64", "address", "uint8"], self.get_withdrawal_request),
+            constants.GET_PROPOSER_VAL_ID: ([], self.get_proposer_val_id),
+            constants.GET_CONSENSUS_VALSET_SELECTOR: (["uint64"], lambda start: self._valset_page(self.consensus_valset, start)),
+            constants.GET_SNAPSHOT_VALSET_SELECTOR: (["uint64"], lambda start: self._valset_page(self.snapshot_valset, start)),
+            constants.GET_EXECUTION_VALSET_SELECTOR: (["uint64"], lambda start: self._valset_page(self.execution_valset, start)),
+            constants.GET_DELEGATIONS_SELECTOR: (["address", "uint64"], self.get_delegations),
+            constants.GET_DELEGATORS_SELECTOR: (["uint64", "address"], self.get_delegators),
+        }
+        self.getter_abis = {
+            constants.GET_EPOCH_SELECTOR: constants.GETTER_ABIS["get_epoch"],
+            constants.GET_VALIDATOR_SELECTOR: constants.GETTER_ABIS["get_validator"],
+            constants.GET_DELEGATOR_SELECTOR: constants.GETTER_ABIS["get_delegator"],
+            constants.GET_WITHDRAWAL_REQUEST_SELECTOR: constants.GETTER_ABIS["get_withdrawal_request"],
+            constants.GET_PROPOSER_VAL_ID: constants.GETTER_ABIS["get_proposer_val_id"],
+            constants.GET_CONSENSUS_VALSET_SELECTOR: constants.GETTER_ABIS["get_consensus_valset"],
+            constants.GET_SNAPSHOT_VALSET_SELECTOR: constants.GETTER_ABIS["get_snapshot_valset"],
+            constants.GET_EXECUTION_VALSET_SELECTOR: constants.GETTER_ABIS["get_execution_valset"],
+            constants.GET_DELEGATIONS_SELECTOR: constants.GETTER_ABIS["get_delegations"],
+            constants.GET_DELEGATORS_SELECTOR: constants.GETTER_ABIS["get_delegators"],
+        }
+        # selector: (argument types, handler, gas used)
+        self.writes = {
+            constants.ADD_VALIDATOR_SELECTOR: (["bytes", "bytes", "bytes"], self.add_validator, 250_000),
+            constants.DELEGATE_SELECTOR: (["uint64"], self.delegate, 60_000),
+            constants.UNDELEGATE_SELECTOR: (["uint64", "uint256", "uint8"], self.undelegate, 80_000),
+            constants.WITHDRAW_SELECTOR: (["uint64", "uint8"], self.withdraw, 50_000),
+            constants.COMPOUND_SELECTOR: (["uint64"], self.compound, 70_000),
+            constants.CLAIM_REWARDS_SELECTOR: (["uint64"], self.claim_rewards, 50_000),
+            constants.CHANGE_COMMISSION_SELECTOR: (["uint64", "uint256"], self.change_commission, 40_000),
+        }
+
+    # ===== population =====
+
+    def populate(self, validators: int, delegators: int, delegation: int = 1_000 * 10**18):
+        """
+        Genesis state for load tests: validators with the minimum self stake, and
+        delegators spread round robin over them, all stake active.
+        """
+        for val_id in range(len(self.validators) + 1, len(self.validators) + validators + 1):
+            auth_address = "0x" + f"{0xA << 156 | val_id:040x}"
+            validator = Validator(
+                val_id,
+                auth_address,
+                5 * 10**16,
+                b"\x02" + val_id.to_bytes(32, "big"),
+                b"\x80" + val_id.to_bytes(47, "big"),
+            )
+            self.validators[val_id] = validator
+            self.secp_keys.add(validator.secp_pubkey)
+            self._add_delegation(validator, auth_address, MIN_VALIDATE_STAKE)
+        ids = list(self.validators)
+        for index in range(delegators):
+            address = "0x" + f"{0xD << 156 | index:040x}"
+            self._add_delegation(self.validators[ids[index % len(ids)]], address, delegation)
+        for validator in self.validators.values():
+            validator.flags = 0 if validator.stake >= MIN_VALIDATE_STAKE else 1
+        self._update_valsets()
+
+    def _add_delegation(self, validator: Validator, address: str, stake: int):
+        validator.delegations[address] = Delegation(len(validator.delegators), stake, validator.acc)
+        validator.delegators.append(address)
+        validator.stake += stake
+        delegated_to = self.delegated_to.get(address)
+        if delegated_to is None:
+            self.delegated_to[address] = [validator.val_id]
+        else:
+            bisect.insort(delegated_to, validator.val_id)
+
+    # ===== epochs =====
+
+    def advance_epoch(self, count: int = 1, reward: Optional[int] = None):
+        """Pays the ending epoch's rewards to the consensus set, then activates pending stake"""
+        reward = self.epoch_reward if reward is None else reward
+        for _ in range(count):
+            for val_id in self.consensus_valset:
+                validator = self.validators[val_id]
+                if validator.stake == 0:
+                    continue
+                commission = reward * validator.commission // MAX_COMMISSION
+                validator.unclaimed_rewards += commission
+                validator.acc += (reward - commission) * ACC_SCALE // validator.stake
+            self.epoch += 1
+            for validator in self.validators.values():
+                activating = validator.pending.pop(self.epoch, 0)
+                if activating:
+                    validator.stake += activating
+                    validator.acc_at[self.epoch] = validator.acc
+                validator.flags = 0 if validator.stake >= MIN_VALIDATE_STAKE else 1
+            self._update_valsets()
+        return self.epoch
+
+    def _update_valsets(self):
+        for val_id in self.consensus_valset:
+            validator = self.validators[val_id]
+            validator.snapshot_stake = validator.consensus_stake
+            validator.snapshot_commission = validator.consensus_commission
+            validator.consensus_stake = validator.consensus_commission = 0
+        self.snapshot_valset = self.consensus_valset
+        eligible = [validator for validator in self.validators.values() if validator.flags == 0]
+        self.execution_valset = sorted(validator.val_id for validator in eligible)
+        top = sorted(eligible, key=lambda validator: validator.stake, reverse=True)[:ACTIVE_VALSET_SIZE]
+        for validator in top:
+            validator.consensus_stake = validator.stake
+            validator.consensus_commission = validator.commission
+        self.consensus_valset = sorted(validator.val_id for validator in top)
+
+    # ===== delegations =====
+
+    def _settle(self, validator: Validator, delegation: Delegation):
+        """Brings the rewards of a delegation up to date and activates its pending stake"""
+        if delegation.delta_stake and delegation.delta_epoch <= self.epoch:
+            acc = validator.acc_at.get(delegation.delta_epoch, validator.acc)
+            delegation.rewards += delegation.stake * (acc - delegation.acc) // ACC_SCALE
+            delegation.acc = acc
+            delegation.stake += delegation.delta_stake
+            delegation.delta_stake = delegation.delta_epoch = 0
+        delegation.rewards += delegation.stake * (validator.acc - delegation.acc) // ACC_SCALE
+        delegation.acc = validator.acc
+
+    def _delegation(self, val_id: int, address: str, create: bool = False) -> Tuple[Validator, Optional[Delegation]]:
+        validator = self.validators.get(val_id)
+        if validator is None:
+            raise Revert("unknown validator")
+        delegation = validator.delegations.get(address)
+        if delegation is None and create:
+            self._add_delegation(validator, address, 0)
+            delegation = validator.delegations[address]
+        if delegation is not None:
+            self._settle(validator, delegation)
+        return validator, delegation
+
+    def _stake(self, validator: Validator, delegation: Delegation, amount: int) -> int:
+        """Stake activating at the next epoch boundary, returns the activation epoch"""
+        activation = self.epoch + 1
+        delegation.delta_stake += amount
+        delegation.delta_epoch = activation
+        validator.pending[activation] = validator.pending.get(activation, 0) + amount
+        return activation
+
+    # ===== writes =====
+
+    def execute(self, sender: str, value: int, data: bytes, dry_run: bool = False) -> Tuple[list, int, int]:
+        """Runs a call to the precompile: returns (events, payout to the sender, gas used), raises Revert"""
+        selector = data[:4].hex()
+        if selector not in self.writes:
+            raise Revert("unknown selector")
+        types, handler, gas = self.writes[selector]
+        try:
+            args = decode(types, data[4:])
+        except Exception:
+            raise Revert("invalid calldata")
+        events, payout = handler(_address(sender), value, *args, dry_run=dry_run)
+        return events, payout, gas
+
+    def add_validator(self, sender, value, payload, secp_signature, bls_signature, dry_run=False):
+        if len(payload) != 33 + 48 + 20 + 32 + 32:
+            raise Revert("invalid payload")
+        secp_pubkey, bls_pubkey = payload[:33], payload[33:81]
+        auth_address = "0x" + payload[81:101].hex()
+        amount = int.from_bytes(payload[101:133], "big")
+        commission = int.from_bytes(payload[133:165], "big")
+        if value != amount:
+            raise Revert("msg.value does not match the payload amount")
+        if amount < MIN_VALIDATE_STAKE:
+            raise Revert("insufficient stake")
+        if commission > MAX_COMMISSION:
+            raise Revert("commission too high")
+        if secp_pubkey in self.secp_keys:
+            raise Revert("validator already exists")
+        if dry_run:
+            return [], 0
+        val_id = max(self.validators, default=0) + 1
+        validator = Validator(val_id, auth_address, commission, secp_pubkey, bls_pubkey)
+        self.validators[val_id] = validator
+        self.secp_keys.add(secp_pubkey)
+        _, delegation = self._delegation(val_id, auth_address, create=True)
+        activation = self._stake(validator, delegation, amount)
+        return [
+            ("ValidatorCreated", (val_id, auth_address, commission)),
+            ("Delegate", (val_id, auth_address, amount, activation)),
+        ], 0
+
+    def delegate(self, sender, value, val_id, dry_run=False):
+        if value == 0:
+            raise Revert("zero amount")
+        if val_id not in self.validators:
+            raise Revert("unknown validator")
+        if dry_run:
+            return [], 0
+        validator, delegation = self._delegation(val_id, sender, create=True)
+        activation = self._stake(validator, delegation, value)
+        return [("Delegate", (val_id, sender, value, activation))], 0
+
+    def undelegate(self, sender, value, val_id, amount, withdrawal_id, dry_run=False):
+        validator, delegation = self._delegation(val_id, sender)
+        if delegation is None or delegation.stake < amount or amount == 0:
+            raise Revert("insufficient stake")
+        if delegation.withdrawals and withdrawal_id in delegation.withdrawals:
+            raise Revert("withdrawal id already in use")
+        if dry_run:
+            return [], 0
+        delegation.stake -= amount
+        validator.stake -= amount
+        if delegation.withdrawals is None:
+            delegation.withdrawals = {}
+        delegation.withdrawals[withdrawal_id] = (amount, validator.acc, self.epoch + 1)
+        validator.flags = 0 if validator.stake >= MIN_VALIDATE_STAKE else 1
+        return [("Undelegate", (val_id, sender, withdrawal_id, amount, self.epoch + 1))], 0
+
+    def withdraw(self, sender, value, val_id, withdrawal_id, dry_run=False):
+        _, delegation = self._delegation(val_id, sender)
+        request = delegation.withdrawals.get(withdrawal_id) if delegation and delegation.withdrawals else None
+        if request is None:
+            raise Revert("unknown withdrawal id")
+        amount, _, withdrawal_epoch = request
+        if self.epoch < withdrawal_epoch + WITHDRAWAL_DELAY:
+            raise Revert("withdrawal not ready")
+        if dry_run:
+            return [], 0
+        del delegation.withdrawals[withdrawal_id]
+        return [("Withdraw", (val_id, sender, withdrawal_id, amount, self.epoch))], amount
+
+    def compound(self, sender, value, val_id, dry_run=False):
+        validator, delegation = self._delegation(val_id, sender)
+        if delegation is None or delegation.rewards == 0:
+            raise Revert("no rewards")
+        if dry_run:
+            return [], 0
+        rewards, delegation.rewards = delegation.rewards, 0
+        activation = self._stake(validator, delegation, rewards)
+        return [("Delegate", (val_id, sender, rewards, activation))], 0
+
+    def claim_rewards(self, sender, value, val_id, dry_run=False):
+        _, delegation = self._delegation(val_id, sender)
+        if delegation is None:
+            raise Revert("no delegation")
+        if dry_run:
+            return [], 0
+        rewards, delegation.rewards = delegation.rewards, 0
+        return [("ClaimRewards", (val_id, sender, rewards, self.epoch))], rewards
+
+    def change_commission(self, sender, value, val_id, commission, dry_run=False):
+        validator = self.validators.get(val_id)
+        if validator is None:
+            raise Revert("unknown validator")
+        if sender != validator.auth_address:
+            raise Revert("unauthorized")
+        if commission > MAX_COMMISSION:
+            raise Revert("commission too high")
+        if dry_run:
+            return [], 0
+        old, validator.commission = validator.commission, commission
+        return [("CommissionChanged", (val_id, old, commission))], 0
+
+    # ===== getters =====
+
+    def call(self, data: bytes) -> bytes:
+        selector = data[:4].hex()
+        if selector not in self.getters:
+            raise Revert("unknown selector")
+        types, handler = self.getters[selector]
+        try:
+            args = decode(types, data[4:]) if types else ()
+        except Exception:
+            raise Revert("invalid calldata")
+        return encode(self.getter_abis[selector], handler(*args))
+
+    def get_epoch(self):
+        return self.epoch, False
+
+    def get_validator(self, val_id):
+        validator = self.validators.get(val_id)
+        if validator is None:
+            return [ZERO_ADDRESS] + [0] * 9 + [b"\x00" * 33, b"\x00" * 48]
+        return (
+            validator.auth_address, validator.flags, validator.stake, validator.acc, validator.commission,
+            validator.unclaimed_rewards, validator.consensus_stake, validator.consensus_commission,
+            validator.snapshot_stake, validator.snapshot_commission, validator.secp_pubkey, validator.bls_pubkey,
+        )
+
+    def get_delegator(self, val_id, address):
+        validator = self.validators.get(val_id)
+        delegation = validator.delegations.get(_address(address)) if validator else None
+        if delegation is None:
+            return 0, 0, 0, 0, 0, 0, 0
+        self._settle(validator, delegation)
+        return (
+            delegation.stake, delegation.acc, delegation.rewards,
+            delegation.delta_stake, 0, delegation.delta_epoch, 0,
+        )
+
+    def get_withdrawal_request(self, val_id, address, withdrawal_id):
+        validator = self.validators.get(val_id)
+        delegation = validator.delegations.get(_address(address)) if validator else None
+        if delegation is None or not delegation.withdrawals:
+            return 0, 0, 0
+        return delegation.withdrawals.get(withdrawal_id, (0, 0, 0))
+
+    def get_proposer_val_id(self, block_number: int = 0):
+        if not self.consensus_valset:
+            return (0,)
+        return (self.consensus_valset[block_number % len(self.consensus_valset)],)
+
+    def _valset_page(self, valset: list, start: int):
+        end = min(start + PAGE_SIZE, len(valset))
+        return end >= len(valset), end, valset[start:end]
+
+    def get_delegations(self, address, start_val_id):
+        val_ids = self.delegated_to.get(_address(address), [])
+        start = bisect.bisect_left(val_ids, start_val_id)
+        end = min(start + PAGE_SIZE, len(val_ids))
+        done = end >= len(val_ids)
+        return done, 0 if done else val_ids[end], val_ids[start:end]
+
+    def get_delegators(self, val_id, start_address):
+        validator = self.validators.get(val_id)
+        if validator is None:
+            return True, ZERO_ADDRESS, []
+        start_address = _address(start_address)
+        if start_address == ZERO_ADDRESS:
+            start = 0
+        elif start_address in validator.delegations:
+            start = validator.delegations[start_address].position
+        else:
+            raise Revert("unknown delegator")
+        end = min(start + PAGE_SIZE, len(validator.delegators))
+        done = end >= len(validator.delegators)
+        return done, ZERO_ADDRESS if done else validator.delegators[end], validator.delegators[start:end]
+
+
+class Simulator:
+    """
+    Chain around a StakingState: balances, nonces, a transaction pool, blocks with
+    receipts and logs, and the JSON-RPC methods the SDK and the CLI use.
+
+    With block_time 0 every transaction is mined into its own block as soon as it is
+    received, otherwise a background thread mines a block every block_time seconds.
+    """
+
+    def __init__(
+        self,
+        state: Optional[StakingState] = None,
+        chain_id: int = CHAIN_ID,
+        block_time: float = 0,
+        epoch_blocks: int = 0,
+        default_balance: int = DEFAULT_BALANCE,
+        contract_address: str = constants.CONTRACTADDRESS,
+    ):
+        self.state = state or StakingState()
+        self.chain_id = chain_id
+        self.block_time = block_time
+        self.epoch_blocks = epoch_blocks
+        self.default_balance = default_balance
+        self.contract_address = _address(contract_address)
+        self.lock = threading.RLock()
+        self.balances: Dict[str, int] = {}
+        self.nonces: Dict[str, int] = {}
+        self.pool: List[dict] = []
+        self.transactions: Dict[str, dict] = {}
+        self.receipts: Dict[str, dict] = {}
+        self.blocks: List[dict] = []
+        self.requests = 0
+        self._stopped = threading.Event()
+        self._append_block([])
+        self.methods = {
+            "web3_clientVersion": lambda: "staking-simulator",
+            "net_version": lambda: str(self.chain_id),
+            "eth_chainId": lambda: _hex(self.chain_id),
+            "eth_blockNumber": lambda: _hex(self.head),
+            "eth_gasPrice": lambda: _hex(BASE_FEE + PRIORITY_FEE),
+            "eth_maxPriorityFeePerGas": lambda: _hex(PRIORITY_FEE),
+            "eth_feeHistory": self.fee_history,
+            "eth_getBalance": lambda address, block="latest": _hex(self.balance(address)),
+            "eth_getTransactionCount": lambda address, block="latest": _hex(self.nonces.get(_address(address), 0)),
+            "eth_getBlockByNumber": self.get_block_by_number,
+            "eth_call": self.eth_call,
+            "eth_estimateGas": self.estimate_gas,
+            "eth_sendRawTransaction": self.send_raw_transaction,
+            "eth_getTransactionByHash": lambda tx_hash: self.transactions.get(tx_hash.lower()),
+            "eth_getTransactionReceipt": lambda tx_hash: self.receipts.get(tx_hash.lower()),
+            "eth_getBlockReceipts": self.get_block_receipts,
+            "eth_getLogs": self.get_logs,
+            # control methods of the simulator
+            "staking_advanceEpoch": lambda count=1, reward=None: self.state.advance_epoch(count, reward),
+            "staking_mine": self.mine_blocks,
+            "staking_fund": lambda address, amount: self.fund(address, amount),
+            "staking_stats": self.stats,
+        }
+
+    @property
+    def head(self) -> int:
+        return self.blocks[-1]["number"]
+
+    # ===== JSON-RPC =====
+
+    def handle(self, request: dict) -> dict:
+        response = {"jsonrpc": "2.0", "id": request.get("id")}
+        method = self.methods.get(request.get("method"))
+        if method is None:
+            response["error"] = {"code": -32601, "message": f"the method {request.get('method')} does not exist"}
+            return response
+        try:
+            with self.lock:
+                self.requests += 1
+                response["result"] = method(*request.get("params", []))
+        except Revert as e:
+            response["error"] = {"code": 3, "message": f"execution reverted: {e}"}
+        except ValueError as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        except Exception as e:
+            response["error"] = {"code": -32603, "message": f"{type(e).__name__}: {e}"}
+        return response
+
+    def balance(self, address: str) -> int:
+        return self.balances.get(_address(address), self.default_balance)
+
+    def fund(self, address: str, amount) -> str:
+        address = _address(address)
+        self.balances[address] = self.balance(address) + (int(amount, 16) if isinstance(amount, str) else amount)
+        return _hex(self.balances[address])
+
+    def stats(self) -> dict:
+        return {
+            "head": self.head,
+            "epoch": self.state.epoch,
+            "validators": len(self.state.validators),
+            "delegators": len(self.state.delegated_to),
+            "transactions": len(self.transactions),
+            "pool": len(self.pool),
+            "requests": self.requests,
+        }
+
+    def eth_call(self, tx: dict, block="latest") -> str:
+        data = HexBytes(tx.get("data") or tx.get("input") or "0x")
+        if _address(tx.get("to") or "") != self.contract_address:
+            return "0x"
+        if data[:4].hex() in self.state.writes:
+            self.state.execute(tx.get("from") or ZERO_ADDRESS, int(tx.get("value") or "0x0", 16), bytes(data), dry_run=True)
+            return "0x"
+        if data[:4].hex() == constants.GET_PROPOSER_VAL_ID:
+            return "0x" + encode(["uint64"], self.state.get_proposer_val_id(self.head)).hex()
+        return "0x" + self.state.call(bytes(data)).hex()
+
+    def estimate_gas(self, tx: dict, block="latest") -> str:
+        if _address(tx.get("to") or "") != self.contract_address:
+            return _hex(TRANSFER_GAS)
+        data = bytes(HexBytes(tx.get("data") or tx.get("input") or "0x"))
+        _, _, gas = self.state.execute(tx.get("from") or ZERO_ADDRESS, int(tx.get("value") or "0x0", 16), data, dry_run=True)
+        return _hex(gas)
+
+    def fee_history(self, block_count, newest_block="latest", percentiles=None) -> dict:
+        count = min(int(block_count, 16) if isinstance(block_count, str) else block_count, self.head + 1)
+        return {
+            "oldestBlock": _hex(self.head - count + 1),
+            "baseFeePerGas": [_hex(BASE_FEE)] * (count + 1),
+            "gasUsedRatio": [0.5] * count,
+            "reward": [[_hex(PRIORITY_FEE)] * len(percentiles or []) for _ in range(count)],
+        }
+
+    def _block(self, number) -> Optional[dict]:
+        if number in ("latest", "pending", "safe", "finalized"):
+            return self.blocks[-1]
+        if number == "earliest":
+            return self.blocks[0]
+        number = int(number, 16) if isinstance(number, str) else number
+        return self.blocks[number] if 0 <= number < len(self.blocks) else None
+
+    def get_block_by_number(self, number, full_transactions=False) -> Optional[dict]:
+        block = self._block(number)
+        if block is None:
+            return None
+        transactions = [self.transactions[tx_hash] if full_transactions else tx_hash for tx_hash in block["transactions"]]
+        return {
+            "number": _hex(block["number"]),
+            "hash": block["hash"],
+            "parentHash": block["parentHash"],
+            "timestamp": _hex(block["timestamp"]),
+            "baseFeePerGas": _hex(BASE_FEE),
+            "gasLimit": _hex(BLOCK_GAS_LIMIT),
+            "gasUsed": _hex(sum(int(self.receipts[tx_hash]["gasUsed"], 16) for tx_hash in block["transactions"])),
+            "miner": ZERO_ADDRESS,
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "extraData": "0x",
+            "size": "0x0",
+            "nonce": "0x0000000000000000",
+            "sha3Uncles": "0x" + "00" * 32,
+            "logsBloom": "0x" + "00" * 256,
+            "transactionsRoot": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "mixHash": "0x" + "00" * 32,
+            "uncles": [],
+            "transactions": transactions,
+        }
+
+    def get_block_receipts(self, number) -> Optional[list]:
+        block = self._block(number)
+        if block is None:
+            return None
+        return [self.receipts[tx_hash] for tx_hash in block["transactions"]]
+
+    def get_logs(self, log_filter: dict) -> list:
+        start = self._block(log_filter.get("fromBlock", "latest"))["number"]
+        end = self._block(log_filter.get("toBlock", "latest"))["number"]
+        addresses = log_filter.get("address")
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        addresses = {_address(address) for address in addresses} if addresses else None
+        topics = log_filter.get("topics") or []
+        logs = []
+        for block in self.blocks[start:end + 1]:
+            for tx_hash in block["transactions"]:
+                for log in self.receipts[tx_hash]["logs"]:
+                    if addresses and log["address"] not in addresses:
+                        continue
+                    if all(
+                        wanted is None
+                        or (index < len(log["topics"]) and log["topics"][index] in ([wanted] if isinstance(wanted, str) else wanted))
+                        for index, wanted in enumerate(topics)
+                    ):
+                        logs.append(log)
+        return logs
+
+    # ===== transactions and blocks =====
+
+    def send_raw_transaction(self, raw: str) -> str:
+        raw = HexBytes(raw)
+        tx_hash = "0x" + keccak(raw).hex()
+        if tx_hash in self.transactions or any(tx["hash"] == tx_hash for tx in self.pool):
+            raise ValueError("already known")
+        if not raw or raw[0] != 2:
+            raise ValueError("only EIP-1559 transactions are supported")
+        from eth_account.typed_transactions import TypedTransaction
+
+        fields = TypedTransaction.from_bytes(raw).as_dict()
+        sender = _address(Account.recover_transaction(raw))
+        if fields["chainId"] != self.chain_id:
+            raise ValueError(f"invalid chain id {fields['chainId']}, expected {self.chain_id}")
+        expected_nonce = self.nonces.get(sender, 0)
+        if fields["nonce"] < expected_nonce:
+            raise ValueError(f"nonce too low: next nonce {expected_nonce}, tx nonce {fields['nonce']}")
+        if fields["nonce"] > expected_nonce:
+            raise ValueError(f"nonce too high: next nonce {expected_nonce}, tx nonce {fields['nonce']}")
+        if fields["gas"] < TRANSFER_GAS:
+            raise ValueError(f"intrinsic gas too low: gas {fields['gas']}, minimum needed {TRANSFER_GAS}")
+        if fields["maxFeePerGas"] < BASE_FEE:
+            raise ValueError(f"max fee per gas less than block base fee: {fields['maxFeePerGas']} < {BASE_FEE}")
+        if self.balance(sender) < fields["value"] + fields["gas"] * fields["maxFeePerGas"]:
+            raise ValueError("insufficient funds for gas * price + value")
+        self.nonces[sender] = expected_nonce + 1
+        self.pool.append({
+            "hash": tx_hash,
+            "from": sender,
+            "to": _address("0x" + bytes(fields["to"]).hex()) if fields["to"] else None,
+            "value": fields["value"],
+            "input": "0x" + bytes(fields["data"]).hex(),
+            "nonce": fields["nonce"],
+            "gas": fields["gas"],
+            "maxFeePerGas": fields["maxFeePerGas"],
+            "maxPriorityFeePerGas": fields["maxPriorityFeePerGas"],
+            "v": fields["v"],
+            "r": fields["r"],
+            "s": fields["s"],
+        })
+        if self.block_time == 0:
+            self.mine()
+        return tx_hash
+
+    def mine_blocks(self, count=1) -> str:
+        for _ in range(int(count, 16) if isinstance(count, str) else count):
+            self.mine()
+        return _hex(self.head)
+
+    def mine(self):
+        """Executes the pooled transactions in a new block"""
+        pending, self.pool = self.pool, []
+        number = self.head + 1
+        block_hash = "0x" + keccak(number.to_bytes(32, "big") + str(self.chain_id).encode()).hex()
+        cumulative_gas = 0
+        for index, tx in enumerate(pending):
+            price = min(tx["maxFeePerGas"], BASE_FEE + tx["maxPriorityFeePerGas"])
+            events, payout, gas_used, status = [], 0, TRANSFER_GAS, 1
+            if tx["to"] == self.contract_address:
+                try:
+                    events, payout, gas_used = self.state.execute(
+                        tx["from"], tx["value"], bytes(HexBytes(tx["input"]))
+                    )
+                except Revert:
+                    gas_used, status = REVERT_GAS, 0
+            if gas_used > tx["gas"]:
+                events, payout, gas_used, status = [], 0, tx["gas"], 0
+            if status == 1:
+                self.balances[tx["from"]] = self.balance(tx["from"]) - tx["value"] + payout
+                if tx["to"] and tx["to"] != self.contract_address:
+                    self.balances[tx["to"]] = self.balance(tx["to"]) + tx["value"]
+            self.balances[tx["from"]] = self.balance(tx["from"]) - gas_used * price
+            cumulative_gas += gas_used
+            location = {
+                "blockHash": block_hash,
+                "blockNumber": _hex(number),
+                "transactionHash": tx["hash"],
+                "transactionIndex": _hex(index),
+            }
+            logs = [dict(self._encode_log(name, args), logIndex=_hex(log_index), removed=False, **location) for log_index, (name, args) in enumerate(events)]
+            self.receipts[tx["hash"]] = dict(
+                location,
+                **{
+                    "from": tx["from"],
+                    "to": tx["to"],
+                    "contractAddress": None,
+                    "cumulativeGasUsed": _hex(cumulative_gas),
+                    "gasUsed": _hex(gas_used),
+                    "effectiveGasPrice": _hex(price),
+                    "logs": logs,
+                    "logsBloom": "0x" + "00" * 256,
+                    "status": _hex(status),
+                    "type": "0x2",
+                },
+            )
+            self.transactions[tx["hash"]] = dict(
+                location,
+                **{
+                    "hash": tx["hash"],
+                    "from": tx["from"],
+                    "to": tx["to"],
+                    "value": _hex(tx["value"]),
+                    "input": tx["input"],
+                    "nonce": _hex(tx["nonce"]),
+                    "gas": _hex(tx["gas"]),
+                    "gasPrice": _hex(price),
+                    "maxFeePerGas": _hex(tx["maxFeePerGas"]),
+                    "maxPriorityFeePerGas": _hex(tx["maxPriorityFeePerGas"]),
+                    "chainId": _hex(self.chain_id),
+                    "type": "0x2",
+                    "accessList": [],
+                    "v": _hex(tx["v"]),
+                    "r": _hex(tx["r"]),
+                    "s": _hex(tx["s"]),
+                },
+            )
+        self._append_block([tx["hash"] for tx in pending], block_hash)
+        if self.epoch_blocks and number % self.epoch_blocks == 0:
+            self.state.advance_epoch()
+
+    def _append_block(self, transactions: list, block_hash: Optional[str] = None):
+        number = len(self.blocks)
+        self.blocks.append({
+            "number": number,
+            "hash": block_hash or "0x" + keccak(number.to_bytes(32, "big") + str(self.chain_id).encode()).hex(),
+            "parentHash": self.blocks[-1]["hash"] if self.blocks else "0x" + "00" * 32,
+            "timestamp": int(time.time()),
+            "transactions": transactions,
+        })
+
+    def _encode_log(self, name: str, args: tuple) -> dict:
+        return encode_log(name, args, self.contract_address)
+
+    def run_blocks(self):
+        """Mines a block every block_time seconds until stop()"""
+        while not self._stopped.wait(self.block_time):
+            with self.lock:
+                self.mine()
+
+    def stop(self):
+        self._stopped.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    simulator: Simulator
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, Nagle would hold the body back on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        except ValueError:
+            body = None
+        if isinstance(body, list):
+            response = [self.simulator.handle(request) for request in body]
+        elif isinstance(body, dict):
+            response = self.simulator.handle(body)
+        else:
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "parse error"}}
+        data = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(simulator: Simulator, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Serves the simulator over HTTP from background threads and returns the server;
+    server.server_address has the port when 0 was given. Stop with server.shutdown().
+    """
+    handler = type("SimulatorHandler", (_Handler,), {"simulator": simulator})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    if simulator.block_time > 0:
+        threading.Thread(target=simulator.run_blocks, daemon=True).start()
+    shutdown = server.shutdown
+
+    def stop():
+        simulator.stop()
+        shutdown()
+        server.server_close()
+
+    server.shutdown = stop
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--chain-id", type=int, default=CHAIN_ID)
+    parser.add_argument("--validators", type=int, default=100, help="validators created at genesis")
+    parser.add_argument("--delegators", type=int, default=1000, help="delegators created at genesis")
+    parser.add_argument("--block-time", type=float, default=0, help="seconds between blocks, 0 mines every transaction at once")
+    parser.add_argument("--epoch-blocks", type=int, default=0, help="blocks per epoch, 0 only advances with staking_advanceEpoch")
+    parser.add_argument("--epoch-reward", type=float, default=DEFAULT_EPOCH_REWARD / 10**18, help="MON paid per consensus validator and epoch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    state = StakingState(epoch_reward=int(args.epoch_reward * 10**18))
+    state.populate(args.validators, args.delegators)
+    simulator = Simulator(state, args.chain_id, args.block_time, args.epoch_blocks)
+    server = serve(simulator, args.host, args.port)
+    print(
+        f"Staking simulator on http://{args.host}:{server.server_address[1]} (chain {args.chain_id}), "
+        f"{args.validators} validators and {args.delegators} delegators created in {time.perf_counter() - start:.1f}s"
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+from staking_sdk_py.metrics import METRICS
+
+FORMATS = ("jsonl", "otlp")
+
+
+class Span:
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.attributes = dict(attributes)
+        self.status = "ok"
+        self.error = None
+        self.operation = False
+        # current phase of an operation span, see phase()
+        self.phase: Optional["Span"] = None
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._rpc_start = tracer.metrics.total("staking_rpc_requests_total")
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self) -> dict:
+        duration = time.perf_counter() - self._start
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(duration * 1000, 3),
+            # requests of all threads while the span was open, like the receipt tracker's
+            "rpc_requests": int(self.tracer.metrics.total("staking_rpc_requests_total") - self._rpc_start),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """
+    Spans around the phases of staking operations, with their duration and the number
+    of JSON-RPC requests sent while they were open.
+
+    Disabled until configure() is called, spans then cost a single attribute check.
+    Spans are written as one JSON object per line when they end, or collected and
+    written as an OTLP/JSON export request on close().
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics or METRICS
+        self.enabled = False
+        self.path: Optional[str] = None
+        self.format = "jsonl"
+        self.service_name = "staking-cli"
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        self._records: List[dict] = []
+
+    def configure(self, path: str, format: str = "jsonl", service_name: str = "staking-cli"):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown trace format {format}, expected one of {', '.join(FORMATS)}")
+        self.close()
+        self.path = os.path.expanduser(path)
+        self.format = format
+        self.service_name = service_name
+        if format == "jsonl":
+            self._file = open(self.path, "a")
+        self.enabled = True
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack() if self.enabled else None
+        return stack[-1] if stack else None
+
+    def start(self, name: str, **attributes) -> Span:
+        span = Span(self, name, self.current(), attributes)
+        self._stack().append(span)
+        return span
+
+    def finish(self, span: Span):
+        if span.phase is not None:
+            self.finish(span.phase)
+            span.phase = None
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+        self._emit(span.end())
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            yield None
+            return
+        span = self.start(name, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(e)
+            if span.phase is not None:
+                span.phase.fail(e)
+            raise
+        finally:
+            self.finish(span)
+
+    def operation(self, name: str, **attributes):
+        """Decorator running a command function inside a span its phases attach to"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.span(name, **attributes) as span:
+                    span.operation = True
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def phase(self, name: str, **attributes) -> Optional[Span]:
+        """
+        Ends the current phase of the innermost operation of this thread and starts the
+        next one, so linear command code is split into phases without nesting blocks.
+        """
+        if not self.enabled:
+            return None
+        operation = next(
+            (span for span in reversed(self._stack()) if span.operation), None
+        )
+        if operation is None:
+            return None
+        if operation.phase is not None:
+            self.finish(operation.phase)
+        operation.phase = self.start(name, **attributes)
+        return operation.phase
+
+    def _emit(self, record: dict):
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+                self._file.flush()
+            else:
+                self._records.append(record)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            elif self.enabled and self.format == "otlp":
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(to_otlp(self._records, self.service_name), f)
+                os.replace(tmp_path, self.path)
+            self._records = []
+            self.enabled = False
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def to_otlp(records: list, service_name: str = "staking-cli") -> dict:
+    """OTLP/JSON ExportTraceServiceRequest of span records, as accepted by OTLP/HTTP collectors"""
+    spans = []
+    for record in records:
+        start = int(record["start"] * 1e9)
+        span = {
+            "traceId": record["trace_id"],
+            "spanId": record["span_id"],
+            "name": record["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start),
+            "endTimeUnixNano": str(start + int(record["duration_ms"] * 1e6)),
+            "attributes": _otlp_attributes(dict(record["attributes"], rpc_requests=record["rpc_requests"])),
+            # STATUS_CODE_OK / STATUS_CODE_ERROR
+            "status": {"code": 2, "message": record["error"]} if record["status"] == "error" else {"code": 1},
+        }
+        if record["parent_id"]:
+            span["parentSpanId"] = record["parent_id"]
+        spans.append(span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+            "scopeSpans": [{"scope": {"name": "staking_sdk_py.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+TRACER = Tracer()
+span = TRACER.span
+phase = TRACER.phase
+operation = TRACER.operation
@@ -2,26 +2,14 @@ import os
 import sys
 import toml
 import argparse
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.align import Align
 from src.logger import init_logging
-from src.add_validator import register_validator, register_validator_cli
-from src.delegate import delegate_to_validator, delegate_to_validator_cli
-from src.undelegate import undelegate_from_validator, undelegate_from_validator_cli
-from src.withdraw import withdraw_delegation, withdraw_delegation_cli
-from src.claim import claim_pending_rewards, claim_pending_rewards_cli
-from src.compound import compound_rewards, compound_rewards_cli
-from src.change_commission import change_validator_commission, change_validator_commission_cli
-from src.query_menu import query, query_cli
 from src.parser import init_parser
-from src.helpers import number_prompt, confirmation_prompt
-from src.signer import create_signer
+
+# Command modules are imported in the branch that runs them, so a command only pays
+# for the dependencies it uses (web3, py_ecc, blake3, Ledger libraries...).
 
 class StakingCLI:
     def __init__(self):
-        self.console = Console()
         # argument parsing
         parser = init_parser()
         try:
@@ -36,20 +24,60 @@ class StakingCLI:
         elif self.args.command == "query" and self.args.query == None:
            print("No sub-command provided for the query command. Try --help to understand various sub-commands.")
            sys.exit()
+        elif self.args.command == "keys" and self.args.keys == None:
+           print("No sub-command provided for the keys command. Try --help to understand various sub-commands.")
+           sys.exit()
         # config and logging
         self.read_config(self.args.config_path)
         self.log = init_logging(self.config["log_level"].upper())
+        self.init_tracing()
+        self.init_cassette()
         self.init_signer()
         self.colors = self.config["colors"]
 
 
+    def init_tracing(self):
+        '''Enables tracing spans when --trace is given'''
+        if not self.args.trace:
+            return
+        from staking_sdk_py.tracing import TRACER
+        try:
+            TRACER.configure(self.args.trace, self.args.trace_format)
+        except OSError as e:
+            self.log.error(f"Error while opening trace file {self.args.trace}: {e}")
+            sys.exit()
+
+
+    def init_cassette(self):
+        '''Records or replays the JSON-RPC traffic of this run with --record-rpc / --replay-rpc'''
+        path = self.args.record_rpc or self.args.replay_rpc
+        if not path:
+            return
+        from staking_sdk_py.rpcCassette import Cassette
+        from src.rpc import use_cassette
+        try:
+            if self.args.record_rpc:
+                use_cassette(Cassette(path, "record"))
+            else:
+                latency = 1.0 if self.args.replay_latency == "original" else 0.0
+                use_cassette(Cassette(path, "replay", latency))
+        except (OSError, ValueError) as e:
+            self.log.error(f"Error while opening RPC cassette {path}: {e}")
+            sys.exit()
+
+
     def init_signer(self):
         '''Initializes the signer based on config'''
         try:
-            if self.args.command != "query":
+            if self.args.command == "add-validators" and not self.args.sign:
+                self.log.debug(f"Skipping signer creation for {self.args.command} without --sign.")
+            elif self.args.command == "serve" and self.args.read_only:
+                self.log.debug("Skipping signer creation for a read-only daemon.")
+            elif self.args.command not in ("query", "broadcast", "keys"):
+                from src.signer import create_signer
                 self.signer = create_signer(self.config)
             else:
-                self.log.debug("Skipping signer creation for queries.")
+                self.log.debug(f"Skipping signer creation for {self.args.command}.")
         except Exception as e:
             if (
                 self.config["staking"]["type"].lower() == "ledger"
@@ -70,7 +98,7 @@ class StakingCLI:
         if os.path.isfile(config_path):
             pass
         else:
-            self.console.print(f"The provided config path: {config_path} is not a file.")
+            print(f"The provided config path: {config_path} is not a file.")
             sys.exit()
 
         # Read config file
@@ -82,6 +110,20 @@ class StakingCLI:
             exit()
 
     def tui(self):
+        from rich.align import Align
+        from rich.console import Console
+        from rich.panel import Panel
+        from src.add_validator import register_validator
+        from src.delegate import delegate_to_validator
+        from src.undelegate import undelegate_from_validator
+        from src.withdraw import withdraw_delegation
+        from src.claim import claim_pending_rewards
+        from src.compound import compound_rewards
+        from src.change_commission import change_validator_commission
+        from src.query_menu import query
+        from src.helpers import number_prompt, confirmation_prompt
+
+        console = Console()
         menu_text = f'''
         [{self.colors["primary_text"]}]1. Add Validator[/]\n
         [{self.colors["primary_text"]}]2. Delegate[/]\n
@@ -102,7 +144,7 @@ class StakingCLI:
         )
         while True:
             choices = [str(x) for x in range(1,10)]
-            self.console.print(main_panel)
+            console.print(main_panel)
             choice = number_prompt("Enter a number as a choice", choices, default="9")
 
             if choice == "1":
@@ -142,37 +184,139 @@ class StakingCLI:
         if self.args.command == "tui":
             self.tui()
         elif self.args.command == "add-validator":
+            from src.add_validator import register_validator_cli
             secp_privkey = self.args.secp_privkey
             bls_privkey = self.args.bls_privkey
             auth_address = self.args.auth_address
             amount = self.args.amount
             register_validator_cli(self.config, self.signer, secp_privkey, bls_privkey, auth_address, amount)
+        elif self.args.command == "add-validators":
+            from src.add_validator import prepare_validators_cli
+            prepare_validators_cli(
+                self.config,
+                getattr(self, "signer", None),
+                self.args.keys_file,
+                self.args.output,
+                self.args.workers,
+                self.args.sign,
+                self.args.nonce,
+                self.args.max_fee_gwei,
+                self.args.priority_fee_gwei,
+                self.args.gas_limit,
+            )
         elif self.args.command == "delegate":
+            from src.delegate import delegate_to_validator_cli
             validator_id = self.args.validator_id
             amount = self.args.amount
             delegate_to_validator_cli(self.config, self.signer, validator_id, amount)
         elif self.args.command == "undelegate":
+            from src.undelegate import undelegate_from_validator_cli
             validator_id = self.args.validator_id
             withdrawal_id = self.args.withdrawal_id
             amount = self.args.amount
             undelegate_from_validator_cli(self.config, self.signer, validator_id, amount, withdrawal_id)
         elif self.args.command == "withdraw":
+            from src.withdraw import withdraw_delegation_cli
             validator_id = self.args.validator_id
             withdrawal_id = self.args.withdrawal_id
             withdraw_delegation_cli(self.config, self.signer, validator_id, withdrawal_id)
         elif self.args.command == "claim-rewards":
+            from src.claim import claim_pending_rewards_cli
             validator_id = self.args.validator_id
             claim_pending_rewards_cli(self.config, self.signer, validator_id)
         elif self.args.command == "compound-rewards":
+            from src.compound import compound_rewards_cli
             validator_id = self.args.validator_id
             compound_rewards_cli(self.config, self.signer, validator_id)
+        elif self.args.command == "auto-compound":
+            from src.auto_compound import auto_compound_cli
+            auto_compound_cli(
+                self.config,
+                self.signer,
+                self.args.min_reward_ratio,
+                self.args.interval,
+                self.args.once,
+                self.args.dry_run,
+            )
         elif self.args.command == "change-commission":
+            from src.change_commission import change_validator_commission_cli
             validator_id = self.args.validator_id
             commission_percentage = self.args.commission
             change_validator_commission_cli(self.config, self.signer, validator_id, commission_percentage)
+        elif self.args.command == "batch":
+            from src.batch import run_batch_cli
+            run_batch_cli(self.config, self.signer, self.args.manifest, self.args.journal, self.args.report, self.args.yes)
+        elif self.args.command == "sign-batch":
+            from src.offline import sign_batch_cli
+            sign_batch_cli(
+                self.config,
+                self.signer,
+                self.args.manifest,
+                self.args.output,
+                self.args.nonce,
+                self.args.max_fee_gwei,
+                self.args.priority_fee_gwei,
+                self.args.gas_limit,
+            )
+        elif self.args.command == "broadcast":
+            from src.offline import broadcast_cli
+            broadcast_cli(self.config, self.args.input, self.args.report, self.args.yes)
+        elif self.args.command == "keys":
+            from src.keys import generate_keys_cli, verify_keys_cli
+            if self.args.keys == "generate":
+                generate_keys_cli(self.config, self.args.count, self.args.output, self.args.keystore, self.args.workers)
+            elif self.args.keys == "verify":
+                verify_keys_cli(self.config, self.args.input, self.args.workers)
+        elif self.args.command == "serve":
+            from src.serve import serve_cli
+            serve_cli(self.config, getattr(self, "signer", None), self.args.socket)
         elif self.args.command == "query":
+            if self.forward_query():
+                return
+            from src.query_menu import query_cli
             query_cli(self.config, self.args)
 
+    def forward_query(self) -> bool:
+        '''Hands the query to a running serve daemon, unless this run records metrics, traces or RPC traffic'''
+        if self.args.no_daemon or self.args.metrics_file or self.args.trace or self.args.record_rpc or self.args.replay_rpc:
+            return False
+        from src.serve_client import forward_query
+        return forward_query(self.config, self.args)
+
+
+    def write_metrics(self):
+        '''Dumps the metrics of this run for the node-exporter textfile collector'''
+        if not self.args.metrics_file:
+            return
+        from staking_sdk_py.metrics import METRICS
+        try:
+            METRICS.write_textfile(self.args.metrics_file)
+        except OSError as e:
+            self.log.error(f"Error while writing metrics to {self.args.metrics_file}: {e}")
+
+    def close_cassette(self):
+        '''Finishes the --record-rpc cassette'''
+        if not self.args.record_rpc:
+            return
+        from src.rpc import close_cassette
+        close_cassette()
+
+    def close_trace(self):
+        '''Flushes the spans of this run to the --trace file'''
+        if not self.args.trace:
+            return
+        from staking_sdk_py.tracing import TRACER
+        try:
+            TRACER.close()
+        except OSError as e:
+            self.log.error(f"Error while writing trace to {self.args.trace}: {e}")
+
 
 if __name__ == "__main__":
-    StakingCLI().main()
+    cli = StakingCLI()
+    try:
+        cli.main()
+    finally:
+        cli.write_metrics()
+        cli.close_trace()
+        cli.close_cassette()
@@ -0,0 +1,67 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Build profile of the distributed binary:
+#   pyinstaller --noconfirm --clean monad-staking-cli.spec
+#
+# One-dir bundle: a one-file bundle unpacks everything into a temp dir on every
+# invocation, which dominates the startup of short commands like `query`.
+
+# Modules the CLI never imports: test fixtures, compiled test contracts, other
+# curves of py_ecc, and packages only pulled in by optional test tooling.
+EXCLUDES = [
+    "web3._utils.contract_sources",
+    "web3._utils.module_testing",
+    "web3._utils.hypothesis",
+    "web3.auto",
+    "web3.beacon",
+    "web3.gas_strategies",
+    "web3.scripts",
+    "web3.tools",
+    "py_ecc.bls12_381",
+    "py_ecc.bn128",
+    "py_ecc.optimized_bn128",
+    "py_ecc.secp256k1",
+    "eth_tester",
+    "hypothesis",
+    "pytest",
+    "IPython",
+    "tkinter",
+]
+
+a = Analysis(
+    ["main.py"],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=["./hooks"],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    noarchive=False,
+    # Bytecode is compiled at build time into the archive. Level 0 keeps asserts,
+    # which some dependencies use for input checks.
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name="monad-staking-cli",
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    # UPX compressed libraries are decompressed on every start
+    upx=False,
+    console=True,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name="monad-staking-cli",
+)
@@ -1,8 +1,10 @@
-import warnings
+import csv
+import json
 from web3 import Web3
-from staking_sdk_py.generateCalldata import add_validator
+from staking_sdk_py.generateCalldata import add_validator, add_validators
 from staking_sdk_py.keyGenerator import KeyGenerator
 from staking_sdk_py.signer_factory import Signer
+from staking_sdk_py.receiptTracker import wait_for_receipt
 from rich.console import Console
 from rich.prompt import Confirm
 from rich.prompt import Prompt
@@ -10,25 +12,36 @@ from rich.panel import Panel
 from rich.json import JSON
 from rich.table import Table
 from src.logger import init_logging
+from src.offline import sign_calls
+from src.rpc import get_w3
+from staking_sdk_py import tracing
 from src.helpers import (
     count_zeros,
     amount_prompt,
     key_prompt,
     address_prompt,
     wei,
+    commission_units,
     is_valid_secp256k1_private_key,
     is_valid_bls_private_key,
     is_valid_address,
     is_valid_amount,
     send_transaction,
+    observe_gas,
+    format_gas,
+    print_signer_notice,
+    log_signer_timings,
+    receipt_events,
 )
 
 console = Console()
 
 
+@tracing.operation("add-validator")
 def register_validator(config: dict, signer: Signer):
     log = init_logging(config["log_level"].upper())
     # Get privkeys of Validators
+    tracing.phase("input")
     secp_privkey_hex = key_prompt(config, key_type="secp")
     bls_privkey_hex = key_prompt(config, key_type="bls")
 
@@ -50,7 +63,7 @@ def register_validator(config: dict, signer: Signer):
     rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     funded_address = signer.get_address()
     amount = wei(
         amount_prompt(
@@ -113,6 +126,7 @@ def register_validator(config: dict, signer: Signer):
     console.print(derived_panel)
 
     # Verify inputs and derivations
+    tracing.phase("confirm")
     is_confirmed = Confirm.ask(
         "[bold yellow]Do the derived public keys match? (make sure that the private keys were recovered using monad-keystore) [/]",
         default=False,  # Make the safe option the default
@@ -125,12 +139,14 @@ def register_validator(config: dict, signer: Signer):
         return
 
     # Calldata for tx
+    tracing.phase("calldata")
     add_validator_call_data = add_validator(keygen, amount, auth_address)
     if config["log_level"] == "debug":
         console.print(add_validator_call_data)
 
     # send tx
     try:
+        tracing.phase("transaction")
         tx_hash = send_transaction(
             w3,
             signer,
@@ -138,12 +154,14 @@ def register_validator(config: dict, signer: Signer):
             add_validator_call_data,
             chain_id,
             amount,
-            gas_limit=2_000_000,
+            config=config,
         )
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
     except Exception as e:
         console.print(f"Error! while trying to send tx: {e}")
         return
+    gas_limit = observe_gas(config, receipt)
 
     # Create formatted transaction summary
     tx_table = Table(title="Transaction Results", show_header=False, expand=True)
@@ -152,20 +170,24 @@ def register_validator(config: dict, signer: Signer):
     tx_table.add_row("Status", "✅ Success" if receipt.status == 1 else "❌ Failed")
     tx_table.add_row("Transaction Hash", "0x" + receipt.transactionHash.hex())
     tx_table.add_row("Block Number", str(receipt.blockNumber))
+    tx_table.add_row("Gas Limit (Estimated)", format_gas(gas_limit))
     tx_table.add_row("Gas Used", f"{receipt.gasUsed:,}")
     tx_table.add_row("From", receipt["from"])
     tx_table.add_row("To (Contract)", receipt.to)
     console.print(tx_table)
 
+    tracing.phase("post_check")
     get_validator_registration_event(config, receipt)
 
 
+@tracing.operation("add-validator")
 def register_validator_cli(
     config: dict, signer: Signer, secp_privkey: str, bls_privkey: str, auth_address: str, amount: int
 ):
     log = init_logging(config["log_level"].upper())
 
     # Input validation
+    tracing.phase("input")
     try:
         if not is_valid_bls_private_key(bls_privkey):
             log.error("Key validation failed! Verify bls key")
@@ -201,14 +223,15 @@ def register_validator_cli(
 
     # from config
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     amount_wei = wei(amount)
+    tracing.phase("calldata")
     add_validator_call_data = add_validator(keygen, amount_wei, auth_address)
     log.debug(add_validator_call_data)
 
+    tracing.phase("confirm")
     is_confirmed = Confirm.ask(
         "[bold yellow]Do the derived public keys match? (make sure that the private keys were recovered using monad-keystore) [/]",
         default=False,  # Make the safe option the default
@@ -222,6 +245,7 @@ def register_validator_cli(
 
     # send tx
     try:
+        tracing.phase("transaction")
         tx_hash = send_transaction(
             w3,
             signer,
@@ -229,54 +253,188 @@ def register_validator_cli(
             add_validator_call_data,
             chain_id,
             amount_wei,
-            gas_limit=2_000_000,
+            config=config,
         )
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
     except Exception as e:
         log.error(f"Error while sending tx: {e}")
         return
+    gas_limit = observe_gas(config, receipt)
     log.info(f"Tx status: {receipt.status}")
     log.info(f"Tx hash: 0x{receipt.transactionHash.hex()}")
+    log.info(f"Gas limit: {format_gas(gas_limit)}, used: {receipt.gasUsed:,}")
+    tracing.phase("post_check")
     get_validator_registration_event(config, receipt)
 
 
-def get_validator_registration_event(config, receipt):
-    log = init_logging(config["log_level"].upper())
-    abi = [
-        {
-            "name": "ValidatorCreated",
-            "type": "event",
-            "anonymous": False,
-            "inputs": [
-                {"indexed": True, "name": "valId", "type": "uint64"},
-                {"indexed": True, "name": "auth_delegator", "type": "address"},
-                {"indexed": False, "name": "commission", "type": "uint256"},
-            ],
+def load_validator_keys(path: str) -> list:
+    """
+    Reads a CSV or JSON keys file with secp_privkey, bls_privkey, auth_address, amount (MON)
+    and optional commission (%) per validator. Invalid entries carry an error instead.
+    """
+    if path.endswith(".json"):
+        with open(path, "r") as f:
+            entries = json.load(f)
+        if isinstance(entries, dict):
+            entries = entries.get("validators", [])
+    else:
+        with open(path, "r", newline="") as f:
+            entries = [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in csv.DictReader(f)
+            ]
+
+    rows = []
+    for index, entry in enumerate(entries):
+        row = {"row": index, "operation": "add-validator", "validator_id": ""}
+        try:
+            row["secp_privkey"] = str(entry["secp_privkey"])
+            row["bls_privkey"] = str(entry["bls_privkey"])
+            row["auth_address"] = str(entry["auth_address"])
+            row["amount"] = int(entry["amount"])
+            row["commission"] = float(entry.get("commission", 0))
+            commission_units(row["commission"])
+            if not is_valid_secp256k1_private_key(row["secp_privkey"]):
+                row["error"] = "invalid secp private key"
+            elif not is_valid_bls_private_key(row["bls_privkey"]):
+                row["error"] = "invalid bls private key"
+            elif not is_valid_address(row["auth_address"]):
+                row["error"] = "invalid auth address"
+            elif not is_valid_amount(row["amount"], register=True):
+                row["error"] = "amount must be at least 100,000 MON"
+            elif not 0 <= row["commission"] <= 100:
+                row["error"] = "commission must be between 0 and 100"
+        except KeyError as e:
+            row["error"] = f"missing field {e}"
+        except (TypeError, ValueError) as e:
+            row["error"] = f"invalid value: {e}"
+        rows.append(row)
+    return rows
+
+
+def prepare_validators(rows: list, processes: int = None) -> list:
+    """Builds the registration calldata of every valid row across a process pool, in row order"""
+    valid = [row for row in rows if "error" not in row]
+    results = add_validators(
+        [
+            {
+                "secp_private_key": row["secp_privkey"],
+                "bls_private_key": row["bls_privkey"],
+                "amount": wei(row["amount"]),
+                "auth_address": row["auth_address"],
+                "commission": commission_units(row["commission"]),
+            }
+            for row in valid
+        ],
+        processes,
+    )
+    prepared = {}
+    for row, result in zip(valid, results):
+        prepared[row["row"]] = result
+    output = []
+    for row in rows:
+        entry = {
+            key: row[key]
+            for key in ("row", "operation", "validator_id", "auth_address", "amount", "commission", "error")
+            if key in row
         }
-    ]
+        result = prepared.get(row["row"], {})
+        if "error" in result:
+            entry["error"] = result["error"]
+        for key in ("secp_public_key", "bls_public_key", "calldata"):
+            if key in result:
+                entry[key] = result[key]
+        output.append(entry)
+    return output
 
-    rpc_url = config["rpc_url"]
-    contract_address = config["contract_address"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+
+@tracing.operation("add-validators")
+def prepare_validators_cli(
+    config: dict,
+    signer: Signer,
+    keys_path: str,
+    output_path: str,
+    processes: int = None,
+    sign: bool = False,
+    nonce: int = None,
+    max_fee_gwei: float = None,
+    priority_fee_gwei: float = None,
+    gas_limit: int = None,
+):
+    log = init_logging(config["log_level"].upper())
+    if sign and (nonce is None or max_fee_gwei is None or priority_fee_gwei is None):
+        log.error("--sign requires --nonce, --max-fee-gwei and --priority-fee-gwei")
+        return
+    tracing.phase("input")
+    try:
+        rows = load_validator_keys(keys_path)
+    except (OSError, ValueError) as e:
+        log.error(f"Error while reading keys file: {e}")
+        return
+
+    tracing.phase("calldata", validators=len(rows))
+    validators = prepare_validators(rows, processes)
+    failed = [validator for validator in validators if "error" in validator]
+    for validator in failed:
+        log.error(f"Row {validator['row']}: {validator['error']}")
+    output = {
+        "chain_id": config["chain_id"],
+        "contract_address": config["contract_address"],
+        "validators": validators,
+    }
+
+    if sign:
+        calls = [
+            (
+                {key: validator[key] for key in ("row", "operation", "validator_id", "bls_public_key")},
+                validator["calldata"],
+                wei(validator["amount"]),
+            )
+            for validator in validators
+            if "error" not in validator
+        ]
+        tracing.phase("sign", transactions=len(calls))
+        print_signer_notice(signer)
+        try:
+            signed = sign_calls(
+                config,
+                signer,
+                calls,
+                nonce,
+                Web3.to_wei(max_fee_gwei, "gwei"),
+                Web3.to_wei(priority_fee_gwei, "gwei"),
+                gas_limit,
+            )
+        except Exception as e:
+            log.error(f"Error while signing: {e}")
+            return
+        log_signer_timings(log, signer)
+        output.update(signed)
+
+    tracing.phase("write")
+    with open(output_path, "w") as f:
+        json.dump(output, f, indent=2)
+    log.info(
+        f"Prepared {len(validators) - len(failed)} of {len(validators)} validators"
+        + (f", signed with nonces from {nonce}" if sign else "")
+        + f", written to {output_path}"
+    )
+
+
+def get_validator_registration_event(config, receipt):
+    log = init_logging(config["log_level"].upper())
     if not receipt:
+        w3 = get_w3(config)
         receipt = w3.eth.wait_for_transaction_receipt(
             "768f8911c7db93e5910c0f92d7cd71807a9b58d24de5e95deda8f219ca541e21"
         )
-    with warnings.catch_warnings():
-        # This tells the context to ignore UserWarnings where the message
-        # starts with "The log with transaction hash".
-        warnings.filterwarnings(
-            "ignore",
-            message="The log with transaction hash",
-            category=UserWarning,
-        )
-        staking_contract = w3.eth.contract(address=contract_address, abi=abi)
-        events = staking_contract.events.ValidatorCreated().process_receipt(receipt)
+    events = receipt_events(config, receipt, "ValidatorCreated")
     if not events:
         log.error("No 'ValidatorCreated' event found in the transaction.")
         return
     for event in events:
         print()
         log.info(
-            f"Validator Created! ID: {event['args']['valId']}, Delegator: {event['args']['auth_delegator']}, Commission: {event['args']['commission']}"
+            f"Validator Created! ID: {event['valId']}, Delegator: {event['auth_delegator']}, Commission: {event['commission']}"
         )
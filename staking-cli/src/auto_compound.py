@@ -0,0 +1,276 @@
+import json
+import os
+import time
+from typing import Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from staking_sdk_py.callGetters import decode_getter, getter_calldata
+from staking_sdk_py.generateCalldata import compound
+from staking_sdk_py.generateTransaction import build_transaction, resolve_fees
+from staking_sdk_py.metrics import METRICS
+from staking_sdk_py.preflight import read_at_block
+from staking_sdk_py.receiptTracker import normalize_tx_hash
+from staking_sdk_py.signer_factory import Signer
+from src.helpers import print_signer_notice, transaction_options
+from src.state import state_path
+from src.logger import init_logging
+from src.offline import broadcast
+from src.query import get_validators_list
+from src.rpc import get_w3
+from staking_sdk_py import tracing
+
+try:
+    import fcntl
+except ImportError:  # no cov
+    fcntl = None
+
+# compound when the rewards are worth this many times the fee of the transaction
+DEFAULT_MIN_REWARD_RATIO = 10
+DEFAULT_INTERVAL = 3600
+
+# get_delegator calls sent per JSON-RPC batch while scanning
+SCAN_BATCH_SIZE = 100
+
+# journal states after which a compound is never sent again
+FINAL_STATES = ("confirmed", "reverted", "dropped")
+
+
+class CompoundJournal:
+    """
+    Append-only JSON lines record of the compounds signed by the scheduler, written
+    before they are broadcast, so a restarted scheduler sends the same signed
+    transactions again instead of new ones. Held with an exclusive lock: a second
+    scheduler on the same state dir refuses to start.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        self._lock_file = open(path + ".lock", "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._lock_file.close()
+                raise RuntimeError(f"Another auto-compound scheduler is using {path}")
+        if os.path.isfile(path):
+            with open(path, "r") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["tx_hash"], {}).update(entry)
+
+    def record(self, tx_hash: str, **fields):
+        entry = {"tx_hash": tx_hash, **fields}
+        self.entries.setdefault(tx_hash, {}).update(entry)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pending(self) -> list:
+        """Compounds signed but not yet known to be mined or dropped"""
+        return [entry for entry in self.entries.values() if entry.get("status") not in FINAL_STATES]
+
+    def close(self):
+        self._lock_file.close()
+
+
+def scan_rewards(w3: Web3, contract_address: str, delegator_address: str, validator_ids: list) -> tuple:
+    """
+    Unclaimed rewards of a delegator on each validator, read with batched get_delegator
+    calls all pinned to one block. Returns the block number and {validator id: rewards}.
+    """
+    to = Web3.to_checksum_address(contract_address)
+    block_number = None
+    rewards = {}
+    for start in range(0, len(validator_ids), SCAN_BATCH_SIZE):
+        chunk = validator_ids[start:start + SCAN_BATCH_SIZE]
+        requests = [
+            ("eth_call", [{"to": to, "data": getter_calldata("get_delegator", val_id, delegator_address)}])
+            for val_id in chunk
+        ]
+        block_number, results = read_at_block(w3, requests, block_number)
+        for val_id, result in zip(chunk, results):
+            # rewards field of get_delegator
+            rewards[val_id] = decode_getter("get_delegator", HexBytes(result))[2]
+    return block_number, rewards
+
+
+class CompoundScheduler:
+    """
+    Compounds the rewards of every delegation of the signer once they are worth
+    min_reward_ratio times the fee of the compound transaction.
+
+    Each cycle resumes the compounds of the journal that are not mined yet, scans the
+    rewards, then signs the compounds above the threshold with nonces from the nonce
+    manager, records them in the journal and broadcasts them together. A validator with
+    a compound still pending is not compounded again until that one is mined or its
+    nonce is used by another transaction, and no compound is signed in a cycle that
+    sends earlier ones again.
+    """
+
+    def __init__(self, config: dict, signer: Signer, journal: CompoundJournal, min_reward_ratio: float, dry_run: bool = False):
+        self.config = config
+        self.signer = signer
+        self.journal = journal
+        self.min_reward_ratio = min_reward_ratio
+        self.dry_run = dry_run
+        self.log = init_logging(config["log_level"].upper())
+        self.contract_address = config["contract_address"]
+        self.address = signer.get_address()
+
+    def resume(self, w3: Web3) -> list:
+        """Settles the pending compounds of the journal, returns those to broadcast again"""
+        pending = self.journal.pending()
+        if not pending:
+            return []
+        mined_nonce = w3.eth.get_transaction_count(self.address, "latest")
+        resend = []
+        for entry in pending:
+            try:
+                receipt = w3.eth.get_transaction_receipt(entry["tx_hash"])
+            except TransactionNotFound:
+                receipt = None
+            if receipt is not None:
+                self._settle(entry, "confirmed" if receipt.status == 1 else "reverted", receipt.blockNumber)
+            elif entry["nonce"] < mined_nonce:
+                # another transaction took the nonce, the compound can never be mined
+                self._settle(entry, "dropped")
+            else:
+                resend.append(dict(entry, row=entry["nonce"]))
+        if resend:
+            self.log.info(f"Sending again {len(resend)} compounds not mined yet")
+        return resend
+
+    def _settle(self, entry: dict, status: str, block_number: Optional[int] = None, error: Optional[str] = None):
+        self.journal.record(entry["tx_hash"], status=status, block_number=block_number, error=error)
+        METRICS.inc("staking_auto_compound_transactions_total", {"status": status})
+        if status == "confirmed":
+            self.log.info(f"Compounded {entry['rewards']} wei on validator {entry['validator_id']} in block {block_number}")
+        else:
+            self.log.warning(f"Compound on validator {entry['validator_id']} {status}{f': {error}' if error else ''}")
+
+    @tracing.operation("auto-compound")
+    def run_cycle(self):
+        w3 = get_w3(self.config)
+        tx_options = transaction_options(self.config, w3, self.signer)
+
+        tracing.phase("resume")
+        resend = self.resume(w3)
+        busy = {entry["validator_id"] for entry in self.journal.pending()}
+
+        tracing.phase("scan")
+        validator_ids = get_validators_list(self.config, self.address)
+        block_number, rewards = scan_rewards(w3, self.contract_address, self.address, validator_ids)
+        rewarded = sorted((val_id for val_id in rewards if rewards[val_id] > 0), key=lambda val_id: -rewards[val_id])
+
+        transactions = []
+        if rewarded:
+            # every compound has the same selector and gas, sized from the largest one
+            gas_limit = tx_options["gas_profile"].gas_limit(
+                w3, {"from": self.address, "to": self.contract_address, "value": 0, "data": compound(rewarded[0])}
+            )
+            max_fee, priority_fee = resolve_fees(
+                tx_options.get("max_fee_per_gas"), tx_options.get("max_priority_fee_per_gas"), tx_options["fee_oracle"]
+            )
+            threshold = int(self.min_reward_ratio * gas_limit * max_fee)
+            due = [val_id for val_id in rewarded if rewards[val_id] >= threshold and val_id not in busy]
+            self.log.info(
+                f"Block {block_number}: {len(validator_ids)} delegations, {len(rewarded)} with rewards, "
+                f"{len(due)} above {threshold} wei ({self.min_reward_ratio}x a fee of {gas_limit * max_fee} wei)"
+            )
+            if self.dry_run:
+                for val_id in due:
+                    self.log.info(f"Would compound {rewards[val_id]} wei on validator {val_id}")
+                return
+            if due and resend:
+                # new nonces could collide with those of the compounds sent again
+                self.log.info(f"Waiting for {len(resend)} earlier compounds to be mined before signing new ones")
+            elif due:
+                tracing.phase("sign", transactions=len(due))
+                transactions = self.sign(due, rewards, gas_limit, max_fee, priority_fee, tx_options["nonce_manager"])
+        else:
+            self.log.info(f"Block {block_number}: {len(validator_ids)} delegations, none with rewards")
+
+        if self.dry_run or not (resend or transactions):
+            return
+        results = broadcast(w3, resend + transactions)
+        for tx in results:
+            if tx.get("status") in FINAL_STATES:
+                self._settle(tx, tx["status"], tx.get("block_number"))
+            else:
+                # kept pending: sent again next cycle, or dropped once its nonce is taken
+                self.journal.record(tx["tx_hash"], status="error", error=tx.get("error"))
+                self.log.warning(f"Compound on validator {tx['validator_id']} not mined yet: {tx.get('error')}")
+        if any(tx.get("status") not in FINAL_STATES for tx in results):
+            # restart from the node's pending nonce so a rejected compound leaves no gap
+            tx_options["nonce_manager"].resync()
+
+    def sign(self, validator_ids: list, rewards: dict, gas_limit: int, max_fee: int, priority_fee: int, nonce_manager) -> list:
+        """Signs a compound per validator with pipelined nonces and journals them before any is sent"""
+        nonces = [nonce_manager.allocate() for _ in validator_ids]
+        unsigned = [
+            build_transaction(self.contract_address, compound(val_id), self.config["chain_id"], nonce, gas_limit, max_fee, priority_fee)
+            for val_id, nonce in zip(validator_ids, nonces)
+        ]
+        try:
+            signed = self.signer.sign_many(unsigned)
+        except Exception:
+            for nonce in reversed(nonces):
+                nonce_manager.release(nonce)
+            raise
+        transactions = []
+        for val_id, tx, signed_tx in zip(validator_ids, unsigned, signed):
+            entry = {
+                "validator_id": val_id,
+                "rewards": rewards[val_id],
+                "nonce": tx["nonce"],
+                "raw_transaction": "0x" + bytes(signed_tx.raw_transaction).hex(),
+                "status": "signed",
+                "signed_at": int(time.time()),
+            }
+            tx_hash = normalize_tx_hash(signed_tx.hash)
+            self.journal.record(tx_hash, **entry)
+            transactions.append(dict(entry, tx_hash=tx_hash, row=tx["nonce"]))
+        return transactions
+
+
+def auto_compound_cli(
+    config: dict,
+    signer: Signer,
+    min_reward_ratio: Optional[float] = None,
+    interval: Optional[float] = None,
+    once: bool = False,
+    dry_run: bool = False,
+):
+    log = init_logging(config["log_level"].upper())
+    options = config.get("auto_compound", {})
+    min_reward_ratio = min_reward_ratio if min_reward_ratio is not None else options.get("min_reward_ratio", DEFAULT_MIN_REWARD_RATIO)
+    interval = interval if interval is not None else options.get("interval", DEFAULT_INTERVAL)
+    try:
+        journal = CompoundJournal(state_path(config, "auto_compound.jsonl"))
+    except (OSError, RuntimeError) as e:
+        log.error(f"Error while opening the auto-compound journal: {e}")
+        return
+
+    if not dry_run:
+        print_signer_notice(signer)
+    scheduler = CompoundScheduler(config, signer, journal, min_reward_ratio, dry_run)
+    log.info(f"Compounding the delegations of {scheduler.address} when rewards reach {min_reward_ratio}x the fee")
+    try:
+        while True:
+            try:
+                scheduler.run_cycle()
+            except Exception as e:
+                log.error(f"Error during the auto-compound cycle: {e}")
+            if once:
+                break
+            log.info(f"Next scan in {interval}s")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        log.info("Auto-compound stopped, pending compounds are resumed on the next start")
+    finally:
+        journal.close()
@@ -0,0 +1,386 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+from rich.console import Console
+from rich.table import Table
+from staking_sdk_py.generateCalldata import (
+    delegate,
+    undelegate,
+    withdraw,
+    claim_rewards,
+    compound,
+    change_commission,
+)
+from staking_sdk_py.generateTransaction import send_transaction
+from staking_sdk_py.preflight import preflight_many
+from staking_sdk_py.receiptTracker import ReceiptTracker, normalize_tx_hash
+from staking_sdk_py.signer_factory import Signer
+from src.helpers import commission_units, observe_gas, wei, confirmation_prompt, print_signer_notice, log_signer_timings, transaction_options
+from src.logger import init_logging
+from src.rpc import get_w3
+from staking_sdk_py import tracing
+
+console = Console()
+
+OPERATIONS = (
+    "delegate",
+    "undelegate",
+    "withdraw",
+    "claim-rewards",
+    "compound-rewards",
+    "change-commission",
+)
+
+# journal states after which a row is never submitted again
+FINAL_STATES = ("confirmed", "reverted")
+
+
+class ManifestError(ValueError):
+    pass
+
+
+def load_manifest(path: str) -> list:
+    """Reads a CSV or YAML manifest into a list of normalized operation rows"""
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ManifestError("PyYAML is required for YAML manifests: pip install pyyaml")
+        with open(path, "r") as f:
+            try:
+                entries = yaml.safe_load(f) or []
+            except yaml.YAMLError as e:
+                raise ManifestError(f"Invalid YAML manifest: {e}")
+        if isinstance(entries, dict):
+            entries = entries.get("operations") or []
+        if not isinstance(entries, list):
+            raise ManifestError("A YAML manifest must be a list of operations, or a mapping with an operations list")
+    else:
+        with open(path, "r", newline="") as f:
+            entries = [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in csv.DictReader(f)
+            ]
+
+    rows = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ManifestError(f"Row {index}: expected a mapping of fields, got {entry!r}")
+        rows.append(normalize_row(index, entry))
+    return rows
+
+
+def normalize_row(index: int, entry: dict) -> dict:
+    operation = str(entry.get("operation", "")).strip().lower()
+    if operation not in OPERATIONS:
+        raise ManifestError(f"Row {index}: unknown operation '{operation}', choose from {', '.join(OPERATIONS)}")
+    try:
+        row = {"row": index, "operation": operation, "validator_id": int(entry["validator_id"])}
+        if operation in ("delegate", "undelegate"):
+            row["amount"] = int(entry["amount"])
+            if row["amount"] <= 0:
+                raise ManifestError(f"Row {index}: amount must be greater than 0")
+        if operation in ("undelegate", "withdraw"):
+            row["withdrawal_id"] = int(entry["withdrawal_id"])
+        if operation == "change-commission":
+            row["commission"] = float(entry["commission"])
+            commission_units(row["commission"])
+            if not 0 <= row["commission"] <= 100:
+                raise ManifestError(f"Row {index}: commission must be between 0 and 100")
+    except ManifestError:
+        raise
+    except KeyError as e:
+        raise ManifestError(f"Row {index}: missing field {e} for {operation}")
+    except (TypeError, ValueError) as e:
+        raise ManifestError(f"Row {index}: invalid value: {e}")
+    return row
+
+
+def build_calldata(row: dict) -> tuple:
+    """Returns calldata and value in wei for a manifest row"""
+    operation = row["operation"]
+    val_id = row["validator_id"]
+    if operation == "delegate":
+        return delegate(val_id), wei(row["amount"])
+    elif operation == "undelegate":
+        return undelegate(val_id, wei(row["amount"]), row["withdrawal_id"]), 0
+    elif operation == "withdraw":
+        return withdraw(val_id, row["withdrawal_id"]), 0
+    elif operation == "claim-rewards":
+        return claim_rewards(val_id), 0
+    elif operation == "compound-rewards":
+        return compound(val_id), 0
+    elif operation == "change-commission":
+        return change_commission(val_id, commission_units(row["commission"])), 0
+    raise ManifestError(f"Unknown operation {operation}")
+
+
+def preflight(w3: Web3, contract_address: str, delegator_address: str, rows: list) -> dict:
+    """
+    Runs the SDK preflight of every row, reading each distinct on-chain value once and
+    at a single block, then checks undelegate rows against the stake and withdrawal ids
+    claimed by earlier rows. Returns {row index: error message} for rows that must not
+    be sent.
+    """
+    operations = [
+        {
+            "operation": row["operation"],
+            "validator_id": row["validator_id"],
+            "amount": wei(row["amount"]) if "amount" in row else 0,
+            "withdrawal_id": row.get("withdrawal_id"),
+        }
+        for row in rows
+    ]
+    reports = preflight_many(w3, contract_address, delegator_address, operations)
+
+    errors = {}
+    # stake and withdrawal ids already claimed by earlier undelegate rows
+    undelegated = {}
+    for row, report in zip(rows, reports):
+        if not report.ok:
+            errors[row["row"]] = "; ".join(report.errors)
+        elif row["operation"] == "undelegate":
+            withdrawal_key = ("withdrawal_id", row["validator_id"], row["withdrawal_id"])
+            requested = undelegated.get(row["validator_id"], 0) + report.amount
+            if withdrawal_key in undelegated:
+                errors[row["row"]] = "Withdrawal request already exists for this ID"
+            elif report.active_stake < requested:
+                errors[row["row"]] = f"Insufficient stake: {report.active_stake} wei, requested {requested} wei"
+            else:
+                undelegated[withdrawal_key] = True
+                undelegated[row["validator_id"]] = requested
+    return errors
+
+
+class Journal:
+    """Append-only JSON lines record of a batch run, used to resume it"""
+
+    def __init__(self, path: str, manifest_path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        with open(manifest_path, "rb") as f:
+            self.fingerprint = hashlib.sha256(f.read()).hexdigest()
+        self.entries = {}
+        if os.path.isfile(path):
+            self._load()
+        else:
+            self._append({"manifest": os.path.abspath(manifest_path), "sha256": self.fingerprint})
+
+    def _load(self):
+        with open(self.path, "r") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("sha256") != self.fingerprint:
+            raise ManifestError(
+                f"Journal {self.path} belongs to a different manifest, remove it or pass another --journal path"
+            )
+        for entry in lines[1:]:
+            self.entries.setdefault(entry["row"], {}).update(entry)
+
+    def _append(self, entry: dict):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, row: int, **fields):
+        with self.lock:
+            entry = {"row": row, **fields}
+            self.entries.setdefault(row, {}).update(entry)
+            self._append(entry)
+
+    def get(self, row: int) -> dict:
+        return self.entries.get(row, {})
+
+
+def resume_rows(w3: Web3, log, journal: Journal, rows: list, sender: str, tracker: ReceiptTracker) -> tuple:
+    """
+    Picks up the rows an interrupted run signed but did not see mined. The signed
+    transaction of each is broadcast again, never signed anew, unless its nonce was
+    taken by another transaction: it can then never be mined and the row is signed
+    again. Returns {row index: receipt future} and the rows to sign.
+    """
+    futures = {}
+    todo = []
+    mined_nonce = None
+    for row in rows:
+        entry = journal.get(row["row"])
+        if entry.get("status") in FINAL_STATES:
+            continue
+        if not entry.get("tx_hash"):
+            todo.append(row)
+            continue
+        if "raw_transaction" not in entry:
+            # journal written before raw transactions were recorded, only its receipt is missing
+            futures[row["row"]] = tracker.track(entry["tx_hash"])
+            continue
+        if mined_nonce is None:
+            mined_nonce = w3.eth.get_transaction_count(sender, "latest")
+        if entry["nonce"] < mined_nonce:
+            try:
+                w3.eth.get_transaction_receipt(entry["tx_hash"])
+            except TransactionNotFound:
+                journal.record(row["row"], status="dropped", error=f"nonce {entry['nonce']} used by another transaction")
+                todo.append(row)
+                continue
+        else:
+            try:
+                w3.eth.send_raw_transaction(entry["raw_transaction"])
+            except Exception as e:
+                # a node that already has the tx is as good as one accepting it
+                if "already known" not in str(e).lower():
+                    log.error(f"Row {row['row']}: error while sending tx again: {e}")
+                    journal.record(row["row"], status="error", error=str(e))
+                    continue
+        futures[row["row"]] = tracker.track(entry["tx_hash"])
+    return futures, todo
+
+
+def run_batch(config: dict, signer: Signer, rows: list, journal: Journal) -> list:
+    """
+    Preflights, submits and tracks all rows not yet finished in the journal. Each
+    transaction is recorded in the journal once signed, before it is sent, so a
+    resumed run sends the same transaction again instead of a duplicate.
+    """
+    log = init_logging(config["log_level"].upper())
+    contract_address = config["contract_address"]
+    chain_id = config["chain_id"]
+    w3 = get_w3(config)
+    delegator_address = signer.get_address()
+    tx_options = transaction_options(config, w3, signer)
+
+    tracker = ReceiptTracker(w3)
+    tracing.phase("resume")
+    futures, todo = resume_rows(w3, log, journal, rows, delegator_address, tracker)
+
+    tracing.phase("preflight", rows=len(todo))
+    errors = preflight(w3, contract_address, delegator_address, todo) if todo else {}
+    tracing.phase("transaction", rows=len(todo) - len(errors))
+    if todo:
+        print_signer_notice(signer)
+    for row in todo:
+        if row["row"] in errors:
+            journal.record(row["row"], status="skipped", error=errors[row["row"]])
+            continue
+        calldata, value = build_calldata(row)
+
+        def record_signed(tx, signed_tx, row_index=row["row"]):
+            journal.record(
+                row_index,
+                status="signed",
+                error=None,
+                nonce=tx["nonce"],
+                tx_hash=normalize_tx_hash(signed_tx.hash),
+                raw_transaction="0x" + bytes(signed_tx.raw_transaction).hex(),
+            )
+
+        try:
+            with tracing.span("row", row=row["row"], operation=row["operation"]):
+                tx_hash = send_transaction(
+                    w3,
+                    signer,
+                    contract_address,
+                    calldata,
+                    chain_id,
+                    value,
+                    on_signed=record_signed,
+                    **tx_options,
+                )
+        except Exception as e:
+            log.error(f"Row {row['row']}: error while sending tx: {e}")
+            # a signed transaction stays in the journal and is sent again on resume
+            journal.record(row["row"], status="error", error=str(e))
+            continue
+        journal.record(row["row"], status="sent")
+        futures[row["row"]] = tracker.track(tx_hash)
+
+    tracing.phase("wait_receipt", transactions=len(futures))
+    for row_index, future in futures.items():
+        try:
+            receipt = future.result(timeout=tracker.timeout)
+        except Exception as e:
+            journal.record(row_index, status="error", error=str(e))
+            continue
+        journal.record(
+            row_index,
+            status="confirmed" if receipt.status == 1 else "reverted",
+            error=None,
+            block_number=receipt.blockNumber,
+            gas_limit=observe_gas(config, receipt),
+            gas_used=receipt.gasUsed,
+        )
+    tracker.stop()
+    log.debug(f"Receipt tracking: {tracker.metrics()}")
+    return [dict(row, **journal.get(row["row"])) for row in rows]
+
+
+def print_report(results: list):
+    table = Table(title="Batch Results", expand=True)
+    table.add_column("Row", style="cyan")
+    table.add_column("Operation", style="cyan")
+    table.add_column("Validator", style="cyan")
+    table.add_column("Status")
+    table.add_column("Tx Hash / Error", style="green")
+    for result in results:
+        status = result.get("status", "pending")
+        style = "green" if status == "confirmed" else "red"
+        table.add_row(
+            str(result["row"]),
+            result["operation"],
+            str(result["validator_id"]),
+            f"[{style}]{status}[/]",
+            result.get("error") or result.get("tx_hash", ""),
+        )
+    console.print(table)
+
+
+def write_report(results: list, path: str):
+    fields = [
+        "row", "operation", "validator_id", "amount", "withdrawal_id", "commission",
+        "status", "nonce", "tx_hash", "block_number", "gas_limit", "gas_used", "error",
+    ]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+
+
+@tracing.operation("batch")
+def run_batch_cli(config: dict, signer: Signer, manifest_path: str, journal_path: str = None, report_path: str = None, yes: bool = False):
+    log = init_logging(config["log_level"].upper())
+    tracing.phase("input")
+    try:
+        rows = load_manifest(manifest_path)
+        journal = Journal(journal_path or manifest_path + ".journal.jsonl", manifest_path)
+    except (OSError, ManifestError) as e:
+        log.error(f"Error while reading manifest: {e}")
+        return
+
+    remaining = [row for row in rows if journal.get(row["row"]).get("status") not in FINAL_STATES]
+    log.info(f"Manifest: {len(rows)} operations, {len(remaining)} left to process")
+    if not remaining:
+        print_report([dict(row, **journal.get(row["row"])) for row in rows])
+        return
+    if not yes and not confirmation_prompt(
+        f"Submit {len(remaining)} operations from {signer.get_address()}?", default=False
+    ):
+        return
+
+    try:
+        results = run_batch(config, signer, rows, journal)
+    except KeyboardInterrupt:
+        log.error(f"Interrupted, run the same command again to resume from {journal.path}")
+        return
+    except Exception as e:
+        log.error(f"Error while running batch: {e}. Run the same command again to resume from {journal.path}")
+        return
+
+    log_signer_timings(log, signer)
+    print_report(results)
+    if report_path:
+        write_report(results, report_path)
+        log.info(f"Report written to {report_path}")
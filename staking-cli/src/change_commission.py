@@ -1,29 +1,33 @@
-from web3 import Web3
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from staking_sdk_py.generateCalldata import change_commission
 from staking_sdk_py.signer_factory import Signer
-from src.helpers import val_id_prompt, confirmation_prompt, send_transaction
+from staking_sdk_py.receiptTracker import wait_for_receipt
+from src.helpers import val_id_prompt, confirmation_prompt, send_transaction, observe_gas, format_gas
 from src.query import validator_exists, get_validator_info
 from src.logger import init_logging
+from src.rpc import get_w3
+from staking_sdk_py import tracing
 
 console = Console()
 
 
+@tracing.operation("change-commission")
 def change_validator_commission(config: dict, signer: Signer):
     colors = config["colors"]
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     auth_address = signer.get_address()
 
     # ===== COMMISSION PARAMETERS  =====
+    tracing.phase("input")
     validator_id = val_id_prompt(config)
 
     # Get current commission
+    tracing.phase("preflight")
     try:
         validator_info = get_validator_info(config, validator_id)
         # Commission is at index 4 in the validator info tuple
@@ -48,6 +52,7 @@ def change_validator_commission(config: dict, signer: Signer):
         console.print(f"[red]Warning: Could not retrieve current commission: {e}[/]")
 
     # Set new commission
+    tracing.phase("input")
     while True:
         try:
             commission_input = console.input(
@@ -89,6 +94,7 @@ def change_validator_commission(config: dict, signer: Signer):
     if confirmation:
         calldata_change_commission = change_commission(validator_id, commission)
         try:
+            tracing.phase("transaction")
             tx_hash = send_transaction(
                 w3,
                 signer,
@@ -96,11 +102,14 @@ def change_validator_commission(config: dict, signer: Signer):
                 calldata_change_commission,
                 chain_id,
                 0,
+                config=config,
             )
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            tracing.phase("wait_receipt")
+            receipt = wait_for_receipt(w3, tx_hash)
         except Exception as e:
             console.print(f"Error! while trying to send tx: {e}")
             return
+        gas_limit = observe_gas(config, receipt)
 
         print("")
 
@@ -110,6 +119,7 @@ def change_validator_commission(config: dict, signer: Signer):
         tx_table.add_row("Status", "✅ Success" if receipt.status == 1 else "❌ Failed")
         tx_table.add_row("Transaction Hash", "0x" + receipt.transactionHash.hex())
         tx_table.add_row("Block Number", str(receipt.blockNumber))
+        tx_table.add_row("Gas Limit (Estimated)", format_gas(gas_limit))
         tx_table.add_row("Gas Used", f"{receipt.gasUsed:,}")
         tx_table.add_row("From", receipt["from"])
         tx_table.add_row("To (Contract)", receipt.to)
@@ -131,18 +141,19 @@ def change_validator_commission(config: dict, signer: Signer):
             )
 
 
+@tracing.operation("change-commission")
 def change_validator_commission_cli(
     config: dict, signer: Signer, val_id: int, commission_percentage: float
 ):
     log = init_logging(config["log_level"])
 
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
 
     # Validate input and get current commission
+    tracing.phase("preflight")
     try:
         val_info = get_validator_info(config, val_id)
         if not validator_exists(val_info):
@@ -173,6 +184,7 @@ def change_validator_commission_cli(
 
     # Set tx to set new commission
     try:
+        tracing.phase("transaction")
         tx_hash = send_transaction(
             w3,
             signer,
@@ -180,14 +192,18 @@ def change_validator_commission_cli(
             calldata_change_commission,
             chain_id,
             0,
+            config=config,
         )
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
     except Exception as e:
         log.error(f"Error while trying to send tx: {e}")
         return
+    gas_limit = observe_gas(config, receipt)
 
     log.info(f"Tx status: {receipt.status}")
     log.info(f"Tx hash: 0x{receipt.transactionHash.hex()}")
+    log.info(f"Gas limit: {format_gas(gas_limit)}, used: {receipt.gasUsed:,}")
 
     if receipt.status == 1:
         log.info(
@@ -1,29 +1,32 @@
 import web3
-from web3 import Web3
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from staking_sdk_py.callGetters import call_getter
 from staking_sdk_py.generateCalldata import delegate
 from staking_sdk_py.signer_factory import Signer
-from src.helpers import wei, amount_prompt, val_id_prompt, confirmation_prompt, count_zeros, is_valid_amount, send_transaction
+from staking_sdk_py.receiptTracker import wait_for_receipt
+from src.helpers import wei, amount_prompt, val_id_prompt, confirmation_prompt, count_zeros, is_valid_amount, send_transaction, observe_gas, format_gas, receipt_events, print_event, format_event
 from src.query_menu import print_delegator_info
 from src.query import validator_exists, get_validator_info
 from src.logger import init_logging
+from src.rpc import get_w3
+from staking_sdk_py import tracing
 
 console = Console()
 
+@tracing.operation("delegate")
 def delegate_to_validator(config: dict, signer: Signer):
     # read config
     colors = config["colors"]
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     delegator_address = signer.get_address()
 
     # ===== DELEGATION PARAMETERS  =====
+    tracing.phase("input")
     delegation_amount = amount_prompt(config, description="to delegate to validator")
     amount = wei(delegation_amount)
     validator_id = val_id_prompt(config)
@@ -40,11 +43,14 @@ def delegate_to_validator(config: dict, signer: Signer):
     if confirmation:
         calldata_delegate = delegate(validator_id)
         try:
-            tx_hash = send_transaction(w3, signer, contract_address, calldata_delegate, chain_id, amount)
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            tracing.phase("transaction")
+            tx_hash = send_transaction(w3, signer, contract_address, calldata_delegate, chain_id, amount, config=config)
+            tracing.phase("wait_receipt")
+            receipt = wait_for_receipt(w3, tx_hash)
         except Exception as e:
             console.print(f"Error! while trying to send tx: {e}")
             return
+        gas_limit = observe_gas(config, receipt)
 
         # Create formatted transaction summary
         tx_table = Table(title="Transaction Results", show_header=False, expand=True)
@@ -53,43 +59,32 @@ def delegate_to_validator(config: dict, signer: Signer):
         tx_table.add_row("Status", "✅ Success" if receipt.status == 1 else "❌ Failed")
         tx_table.add_row("Transaction Hash", "0x"+receipt.transactionHash.hex())
         tx_table.add_row("Block Number", str(receipt.blockNumber))
+        tx_table.add_row("Gas Limit (Estimated)", format_gas(gas_limit))
         tx_table.add_row("Gas Used", f"{receipt.gasUsed:,}")
         tx_table.add_row("From", receipt['from'])
         tx_table.add_row("To (Contract)", receipt.to)
         console.print(tx_table)
 
-        if receipt.logs:
+        tracing.phase("post_check")
+        events = receipt_events(config, receipt, "Delegate")
+        if events:
             console.print(Panel("[bold yellow]Event Analysis[/]", border_style="yellow"))
-            for log in receipt.logs:
-                if len(log.topics) >= 3:
-                    # This is likely a Delegate event
-                    validator_id_from_log = int(log.topics[1].hex(), 16)
-                    delegator_from_log = "0x" + log.topics[2].hex()[26:]  # Remove padding
-                    # Parse data (amount and activation epoch)
-                    data_hex = log.data.hex()
-                    amount_from_log = int(data_hex[0:64], 16)
-                    activation_epoch = int(data_hex[64:128], 16)
-                    event_table = Table(title="Delegate Event", show_header=False, expand=True)
-                    event_table.add_column("Field", style="cyan")
-                    event_table.add_column("Value", style="green")
-                    event_table.add_row("Event Type", "Delegate")
-                    event_table.add_row("Validator ID", str(validator_id_from_log))
-                    event_table.add_row("Delegator", delegator_from_log)
-                    event_table.add_row("Amount", f"{amount_from_log} wei")
-                    event_table.add_row("Activation Epoch", str(activation_epoch))
-                    console.print(event_table)
-
-                    # Get delegator info
-                    console.print(Panel("[bold yellow]Delegator Information[/]", border_style="yellow"))
-                    delegator_info = call_getter(w3,'get_delegator', contract_address, validator_id, delegator_address)
-
-                    if delegator_info:
-                        print_delegator_info(delegator_info)
-                        console.print(Panel("[bold green]✅ Delegation Complete![/]", border_style="green"))
+            for event in events:
+                print_event(event)
+            console.print(Panel("[bold green]✅ Delegation Complete![/]", border_style="green"))
+        elif receipt.status == 1:
+            # no Delegate log in the receipt, read the delegation instead
+            console.print(Panel("[bold yellow]Delegator Information[/]", border_style="yellow"))
+            delegator_info = call_getter(w3,'get_delegator', contract_address, validator_id, delegator_address)
+            if delegator_info:
+                print_delegator_info(delegator_info)
+                console.print(Panel("[bold green]✅ Delegation Complete![/]", border_style="green"))
 
+@tracing.operation("delegate")
 def delegate_to_validator_cli(config: dict, signer: Signer, val_id: int, amount: int):
     log = init_logging(config["log_level"])
     # Input validation
+    tracing.phase("preflight")
     try:
         val_info = get_validator_info(config, val_id)
         if not validator_exists(val_info):
@@ -104,9 +99,8 @@ def delegate_to_validator_cli(config: dict, signer: Signer, val_id: int, amount:
 
     # read config
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
 
     amount = wei(amount)
     calldata_delegate = delegate(val_id)
@@ -114,10 +108,16 @@ def delegate_to_validator_cli(config: dict, signer: Signer, val_id: int, amount:
 
     # send tx
     try:
-        tx_hash = send_transaction(w3, signer, contract_address, calldata_delegate, chain_id, amount)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tracing.phase("transaction")
+        tx_hash = send_transaction(w3, signer, contract_address, calldata_delegate, chain_id, amount, config=config)
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
     except Exception as e:
         log.error(f"Error! while trying to send tx: {e}")
         return
+    gas_limit = observe_gas(config, receipt)
     log.info(f"Tx status: {receipt.status}")
     log.info(f"Tx hash: 0x{receipt.transactionHash.hex()}")
+    log.info(f"Gas limit: {format_gas(gas_limit)}, used: {receipt.gasUsed:,}")
+    for event in receipt_events(config, receipt, "Delegate"):
+        log.info(format_event(event))
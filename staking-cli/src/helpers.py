@@ -1,29 +1,175 @@
+from decimal import Decimal
 from typing import Union
 from web3 import Web3
 from src.logger import init_logging
+from src.state import state_path
 from src.query import get_validator_info, validator_exists
-from py_ecc.optimized_bls12_381 import curve_order
 from rich.prompt import Prompt, Confirm
 from rich.console import Console
+from rich.table import Table
 
 from staking_sdk_py import generateTransaction
+from staking_sdk_py.feeOracle import FeeOracle
+from staking_sdk_py.gasProfile import GasProfile, DEFAULT_SAFETY_MARGIN
+from staking_sdk_py.nonceManager import get_nonce_manager
+from staking_sdk_py.blsBackend import CURVE_ORDER
+from staking_sdk_py.events import decode_events
 from staking_sdk_py.signer_factory import LedgerSigner
 
-def send_transaction(*args, **kwargs):
-    signer = args[1]
+
+def print_signer_notice(signer):
     console = Console()
     if isinstance(signer, LedgerSigner):
         console.print("\n[yellow]Please review and sign transaction on hardware wallet...")
     else:
         console.print("\n[yellow]Signing with a local private key (non-production)...")
         console.print("[red]For mainnet, use a hardware wallet and verify on-device.")
+
+
+def log_signer_timings(log, signer):
+    """Logs the average time spent per signing step of a Ledger session"""
+    if not isinstance(signer, LedgerSigner):
+        return
+    summary = signer.timing_summary()
+    if not summary:
+        return
+    count = summary.pop("count")
+    steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in summary.items())
+    log.info(f"Ledger signed {count} transactions, average per step: {steps}")
+
+
+def send_transaction(*args, config: dict = None, **kwargs):
+    """Sends a tx, using the nonce manager and fee settings of the config when it is given"""
+    w3 = args[0]
+    signer = args[1]
+    print_signer_notice(signer)
+    if config is not None:
+        for key, value in transaction_options(config, w3, signer).items():
+            kwargs.setdefault(key, value)
     return generateTransaction.send_transaction(*args, **kwargs)
 
+
+_fee_oracles = {}
+
+
+def get_fee_oracle(config: dict, w3: Web3) -> FeeOracle:
+    """Fee oracle for the configured strategy, shared by all transactions of this process"""
+    fees = config.get("fees", {})
+    strategy = fees.get("strategy", "normal").lower()
+    key = (config["rpc_url"], strategy)
+    oracle = _fee_oracles.get(key)
+    if oracle is None:
+        oracle = FeeOracle(
+            w3,
+            strategy=strategy,
+            max_fee_cap=Web3.to_wei(fees.get("max_fee_cap_gwei", 500), "gwei"),
+        )
+        _fee_oracles[key] = oracle
+    oracle.w3 = w3
+    return oracle
+
+
+_gas_profiles = {}
+
+
+def get_gas_profile(config: dict) -> GasProfile:
+    """Gas limits learned per staking operation, persisted in the state dir"""
+    path = state_path(config, "gas_profile.json")
+    profile = _gas_profiles.get(path)
+    if profile is None:
+        margin = config.get("gas", {}).get("safety_margin", DEFAULT_SAFETY_MARGIN)
+        profile = GasProfile(path, margin=margin)
+        _gas_profiles[path] = profile
+    return profile
+
+
+def observe_gas(config: dict, receipt):
+    """
+    Learns the gas used by a receipt, returns the gas limit the tx was sent with. The
+    transaction is mined either way, so failing to save the profile is only a warning.
+    """
+    try:
+        return get_gas_profile(config).observe(receipt)
+    except Exception as e:
+        init_logging(config["log_level"].upper()).warning(f"Could not update the gas profile: {e}")
+        return None
+
+
+def format_gas(gas) -> str:
+    return f"{gas:,}" if gas is not None else "n/a"
+
+
+# labels of staking event fields
+EVENT_FIELDS = {
+    "valId": "Validator ID",
+    "delegator": "Delegator",
+    "auth_delegator": "Auth Address",
+    "withdrawal_id": "Withdrawal ID",
+    "amount": "Amount",
+    "activationEpoch": "Activation Epoch",
+    "epoch": "Epoch",
+    "commission": "Commission",
+    "oldCommission": "Old Commission",
+    "newCommission": "New Commission",
+    "flags": "Flags",
+}
+
+
+def receipt_events(config: dict, receipt, name: str) -> list:
+    """Staking events named name in the logs of a receipt, so results need no getter round trip"""
+    return decode_events(receipt, config["contract_address"], name)
+
+
+def _event_value(field: str, value) -> str:
+    return f"{value} wei" if field == "amount" else str(value)
+
+
+def print_event(event: dict):
+    table = Table(title=f"{event['event']} Event", show_header=False, expand=True)
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("Event Type", event["event"])
+    for field, value in event.items():
+        if field != "event":
+            table.add_row(EVENT_FIELDS.get(field, field), _event_value(field, value))
+    Console().print(table)
+
+
+def format_event(event: dict) -> str:
+    fields = ", ".join(
+        f"{EVENT_FIELDS.get(field, field)}: {_event_value(field, value)}" for field, value in event.items() if field != "event"
+    )
+    return f"{event['event']} event - {fields}"
+
+
+def transaction_options(config: dict, w3: Web3, signer) -> dict:
+    """Keyword arguments for generateTransaction.send_transaction derived from the config"""
+    fees = config.get("fees", {})
+    options = {
+        # nonces are shared with other staking-cli processes using the same key
+        "nonce_manager": get_nonce_manager(w3, signer.get_address(), state_path(config, "nonces")),
+        "fee_oracle": get_fee_oracle(config, w3),
+        "gas_profile": get_gas_profile(config),
+    }
+    if "max_fee_per_gas_gwei" in fees:
+        options["max_fee_per_gas"] = Web3.to_wei(fees["max_fee_per_gas_gwei"], "gwei")
+    if "max_priority_fee_per_gas_gwei" in fees:
+        options["max_priority_fee_per_gas"] = Web3.to_wei(fees["max_priority_fee_per_gas_gwei"], "gwei")
+    return options
+
 def wei(amount: int) -> int:
     """Convert MON to wei"""
     return amount * 1_000_000_000_000_000_000
 
 
+def commission_units(percentage: Union[float, str]) -> int:
+    """Convert a commission in % to the contract's 1e18 scale, exactly (1% is 1e16)"""
+    units = Decimal(str(percentage)) * 10**16
+    if not units.is_finite() or units != units.to_integral_value():
+        raise ValueError(f"commission {percentage} must be a number with at most 16 decimals")
+    return int(units)
+
+
 def count_zeros(amount: int) -> int:
     """Count zeros so you can estimate amount"""
     count = 0
@@ -57,11 +203,8 @@ def is_valid_bls_private_key(private_key: Union[int, str]) -> bool:
     else:
         return False  # Invalid type
 
-    # Apply modulo reduction if key is larger than curve order
-    if key_int >= curve_order:
-        key_int = key_int % curve_order
-
-    return 0 < key_int < curve_order
+    # keys at or above the curve order are rejected, not reduced: the reduced key is another key
+    return 0 < key_int < CURVE_ORDER
 
 
 def is_valid_secp256k1_private_key(hex_private_key: str) -> bool:
@@ -0,0 +1,110 @@
+import csv
+import json
+import os
+from rich.console import Console
+from rich.prompt import Prompt
+from rich.table import Table
+from staking_sdk_py.keyGenerator import generate_keys, verify_keys
+from staking_sdk_py import tracing
+from src.logger import init_logging
+
+console = Console()
+
+PASSWORD_ENV = "STAKING_KEYSTORE_PASSWORD"
+
+
+def keystore_password(confirm: bool = False) -> str:
+    """Keystore password from the STAKING_KEYSTORE_PASSWORD env var, or prompted for"""
+    password = os.environ.get(PASSWORD_ENV)
+    if password:
+        return password
+    while True:
+        password = Prompt.ask("[cyan]Keystore password[/]", password=True)
+        if not confirm or password == Prompt.ask("[cyan]Repeat password[/]", password=True):
+            return password
+        console.print("[red]Passwords do not match[/]")
+
+
+def load_keys(path: str) -> list:
+    """Reads the validators of a JSON manifest/keystore or a CSV keys file"""
+    if path.endswith(".csv"):
+        with open(path, "r", newline="") as f:
+            return [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in csv.DictReader(f)
+            ]
+    with open(path, "r") as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get("validators", [])
+    return entries
+
+
+@tracing.operation("keys-generate")
+def generate_keys_cli(config: dict, count: int, output_path: str, keystore: bool = False, processes: int = None):
+    log = init_logging(config["log_level"].upper())
+    if count <= 0:
+        log.error("Count must be greater than 0")
+        return
+    try:
+        # created readable by the owner only before any key is written, and never over an existing file
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        log.error(f"{output_path} already exists, refusing to overwrite keys")
+        return
+    except OSError as e:
+        log.error(f"Error while creating {output_path}: {e}")
+        return
+
+    with os.fdopen(fd, "w") as f:
+        try:
+            password = keystore_password(confirm=True) if keystore else None
+            log.info(f"Generating keys for {count} validators...")
+            validators = generate_keys(count, processes, password)
+            json.dump({"encrypted": keystore, "validators": validators}, f, indent=2)
+        except BaseException:
+            os.unlink(output_path)
+            raise
+
+    table = Table(title="Generated Validator Keys", expand=True)
+    table.add_column("#", style="cyan")
+    table.add_column("Address", style="green")
+    table.add_column("SECP Pubkey", style="green")
+    table.add_column("BLS Pubkey", style="green")
+    for validator in validators:
+        table.add_row(
+            str(validator["index"]),
+            validator["eth_address"],
+            validator["secp_pubkey"],
+            validator["bls_pubkey"],
+        )
+    console.print(table)
+    if keystore:
+        log.info(f"Encrypted keys written to {output_path}")
+    else:
+        log.warning(f"Private keys written UNENCRYPTED to {output_path}, use --keystore to encrypt them")
+
+
+@tracing.operation("keys-verify")
+def verify_keys_cli(config: dict, input_path: str, processes: int = None):
+    log = init_logging(config["log_level"].upper())
+    try:
+        entries = load_keys(input_path)
+    except (OSError, ValueError) as e:
+        log.error(f"Error while reading keys: {e}")
+        return
+    encrypted = any("secp_keystore" in entry or "bls_keystore" in entry for entry in entries)
+    password = keystore_password() if encrypted else None
+
+    results = verify_keys(entries, processes, password)
+    failed = [result for result in results if not result["ok"]]
+    if failed:
+        table = Table(title="Key Verification Failures", expand=True)
+        table.add_column("#", style="cyan")
+        table.add_column("Error", style="red")
+        for result in failed:
+            table.add_row(str(result["index"]), result["error"])
+        console.print(table)
+        log.error(f"{len(failed)} of {len(results)} validators failed verification")
+    else:
+        log.info(f"All {len(results)} validators derive the expected public keys")
@@ -0,0 +1,260 @@
+import json
+import time
+from web3 import Web3
+from rich.console import Console
+from staking_sdk_py.generateTransaction import build_transaction
+from staking_sdk_py.receiptTracker import ReceiptTracker, normalize_tx_hash
+from staking_sdk_py.signer_factory import Signer
+from src.batch import ManifestError, load_manifest, build_calldata, print_report, write_report
+from src.helpers import confirmation_prompt, get_gas_profile, print_signer_notice, log_signer_timings
+from src.logger import init_logging
+from src.rpc import get_w3
+from staking_sdk_py import tracing
+
+console = Console()
+
+# eth_sendRawTransaction requests sent per JSON-RPC batch while broadcasting
+BROADCAST_CHUNK_SIZE = 50
+
+
+def sign_batch(
+    config: dict,
+    signer: Signer,
+    rows: list,
+    nonce: int,
+    max_fee_per_gas: int,
+    max_priority_fee_per_gas: int,
+    gas_limit: int = None,
+) -> dict:
+    """Signs every manifest row with consecutive nonces, without any network access"""
+    calls = []
+    for row in rows:
+        calldata, value = build_calldata(row)
+        calls.append((row, calldata, value))
+    return sign_calls(config, signer, calls, nonce, max_fee_per_gas, max_priority_fee_per_gas, gas_limit)
+
+
+def sign_calls(
+    config: dict,
+    signer: Signer,
+    calls: list,
+    nonce: int,
+    max_fee_per_gas: int,
+    max_priority_fee_per_gas: int,
+    gas_limit: int = None,
+) -> dict:
+    """Signs (row, calldata, value) calls to the staking contract with consecutive nonces"""
+    contract_address = config["contract_address"]
+    chain_id = config["chain_id"]
+    gas_profile = get_gas_profile(config)
+
+    unsigned = []
+    for row, calldata, value in calls:
+        row_gas_limit = gas_limit or gas_profile.learned_limit(calldata)
+        if row_gas_limit is None:
+            raise ManifestError(
+                f"Row {row['row']}: no gas limit learned for {row['operation']} yet, pass --gas-limit"
+            )
+        unsigned.append(build_transaction(
+            contract_address,
+            calldata,
+            chain_id,
+            nonce + len(unsigned),
+            row_gas_limit,
+            max_fee_per_gas,
+            max_priority_fee_per_gas,
+            value,
+        ))
+
+    transactions = []
+    for (row, _, _), tx, signed_tx in zip(calls, unsigned, signer.sign_many(unsigned)):
+        transactions.append(dict(
+            row,
+            nonce=tx["nonce"],
+            gas_limit=tx["gas"],
+            tx_hash=normalize_tx_hash(signed_tx.hash),
+            raw_transaction="0x" + bytes(signed_tx.raw_transaction).hex(),
+        ))
+    return {
+        "from": signer.get_address(),
+        "chain_id": chain_id,
+        "contract_address": contract_address,
+        "max_fee_per_gas": max_fee_per_gas,
+        "max_priority_fee_per_gas": max_priority_fee_per_gas,
+        "signed_at": int(time.time()),
+        "transactions": transactions,
+    }
+
+
+def broadcast(w3: Web3, transactions: list, chunk_size: int = BROADCAST_CHUNK_SIZE) -> list:
+    """
+    Pushes signed transactions in nonce order, a JSON-RPC batch at a time, then tracks
+    all accepted ones concurrently. Returns the transactions with their status.
+    """
+    tracing.phase("send", transactions=len(transactions))
+    transactions = sorted(transactions, key=lambda tx: tx["nonce"])
+    tracker = ReceiptTracker(w3)
+    futures = {}
+    for start in range(0, len(transactions), chunk_size):
+        chunk = transactions[start:start + chunk_size]
+        responses = w3.provider.make_batch_request(
+            [("eth_sendRawTransaction", [tx["raw_transaction"]]) for tx in chunk]
+        )
+        if isinstance(responses, dict):
+            responses = [responses] * len(chunk)
+        elif all(response.get("id") is not None for response in responses):
+            responses = sorted(responses, key=lambda response: response["id"])
+        for tx, response in zip(chunk, responses):
+            error = response.get("error")
+            message = str(error.get("message", error)) if isinstance(error, dict) else str(error)
+            if error and "already known" not in message.lower():
+                tx["status"] = "error"
+                tx["error"] = message
+                continue
+            # a node that already has the tx is as good as one accepting it
+            futures[tx["tx_hash"]] = (tx, tracker.track(tx["tx_hash"]))
+
+    tracing.phase("wait_receipt", transactions=len(futures))
+    for tx, future in futures.values():
+        try:
+            receipt = future.result(timeout=tracker.timeout)
+        except Exception as e:
+            tx["status"] = "error"
+            tx["error"] = str(e)
+            continue
+        tx["status"] = "confirmed" if receipt.status == 1 else "reverted"
+        tx["block_number"] = receipt.blockNumber
+        tx["gas_used"] = receipt.gasUsed
+    tracker.stop()
+    return transactions
+
+
+@tracing.operation("sign-batch")
+def sign_batch_cli(
+    config: dict,
+    signer: Signer,
+    manifest_path: str,
+    output_path: str,
+    nonce: int,
+    max_fee_gwei: float,
+    priority_fee_gwei: float,
+    gas_limit: int = None,
+):
+    log = init_logging(config["log_level"].upper())
+    tracing.phase("input")
+    try:
+        rows = load_manifest(manifest_path)
+    except (OSError, ManifestError) as e:
+        log.error(f"Error while reading manifest: {e}")
+        return
+    if max_fee_gwei < priority_fee_gwei:
+        log.error("Max fee must be greater than or equal to the priority fee")
+        return
+
+    tracing.phase("sign", transactions=len(rows))
+    print_signer_notice(signer)
+    try:
+        signed = sign_batch(
+            config,
+            signer,
+            rows,
+            nonce,
+            Web3.to_wei(max_fee_gwei, "gwei"),
+            Web3.to_wei(priority_fee_gwei, "gwei"),
+            gas_limit,
+        )
+    except ManifestError as e:
+        log.error(str(e))
+        return
+    except Exception as e:
+        log.error(f"Error while signing: {e}")
+        return
+
+    log_signer_timings(log, signer)
+    tracing.phase("write")
+    try:
+        with open(output_path, "w") as f:
+            json.dump(signed, f, indent=2)
+    except OSError as e:
+        log.error(f"Error while writing signed transactions to {output_path}: {e}")
+        return
+    log.info(
+        f"Signed {len(signed['transactions'])} transactions with nonces {nonce} to "
+        f"{nonce + len(signed['transactions']) - 1}, written to {output_path}"
+    )
+
+
+def check_signed(signed):
+    """Raises ValueError unless signed has the structure written by sign-batch"""
+    if not isinstance(signed, dict):
+        raise ValueError("expected a JSON object as written by sign-batch")
+    for key, kind in (("from", str), ("chain_id", int), ("contract_address", str), ("transactions", list)):
+        if not isinstance(signed.get(key), kind):
+            raise ValueError(f"missing or invalid field '{key}'")
+    for index, tx in enumerate(signed["transactions"]):
+        if not isinstance(tx, dict):
+            raise ValueError(f"transaction {index} is not a JSON object")
+        for key, kind in (("row", int), ("operation", str), ("nonce", int), ("tx_hash", str), ("raw_transaction", str)):
+            if not isinstance(tx.get(key), kind):
+                raise ValueError(f"transaction {index}: missing or invalid field '{key}'")
+
+
+@tracing.operation("broadcast")
+def broadcast_cli(config: dict, input_path: str, report_path: str = None, yes: bool = False):
+    log = init_logging(config["log_level"].upper())
+    tracing.phase("input")
+    try:
+        with open(input_path, "r") as f:
+            signed = json.load(f)
+        check_signed(signed)
+    except (OSError, ValueError) as e:
+        log.error(f"Error while reading signed transactions: {e}")
+        return
+    if signed["contract_address"].lower() != config["contract_address"].lower():
+        log.error(
+            f"Transactions were signed for contract {signed['contract_address']}, "
+            f"but the config uses {config['contract_address']}"
+        )
+        return
+
+    tracing.phase("preflight")
+    w3 = get_w3(config)
+    try:
+        chain_id = w3.eth.chain_id
+        next_nonce = w3.eth.get_transaction_count(signed["from"], "pending")
+    except Exception as e:
+        log.error(f"Error while connecting to RPC: {e}")
+        return
+    if chain_id != signed["chain_id"]:
+        log.error(f"Transactions were signed for chain {signed['chain_id']}, but the RPC is on chain {chain_id}")
+        return
+
+    transactions = signed["transactions"]
+    if not transactions:
+        log.error(f"{input_path} contains no signed transactions")
+        return
+    first_nonce = min(tx["nonce"] for tx in transactions)
+    if first_nonce > next_nonce:
+        log.error(f"Nonce gap: the next nonce of {signed['from']} is {next_nonce}, the first signed nonce is {first_nonce}")
+        return
+    if first_nonce < next_nonce:
+        log.warning(f"Nonces below {next_nonce} are already used, those transactions will fail or are already included")
+
+    log.info(f"Broadcasting {len(transactions)} transactions from {signed['from']}")
+    tracing.phase("confirm")
+    if not yes and not confirmation_prompt("Do you want to continue?", default=False):
+        return
+
+    try:
+        results = broadcast(w3, transactions)
+    except Exception as e:
+        log.error(f"Error while broadcasting: {e}")
+        return
+    print_report(results)
+    if report_path:
+        try:
+            write_report(results, report_path)
+        except OSError as e:
+            log.error(f"Error while writing the report to {report_path}: {e}")
+            return
+        log.info(f"Report written to {report_path}")
@@ -4,6 +4,50 @@ import argparse
 def init_parser() -> argparse.ArgumentParser:
     """Inits arg parser and makes sure config argument is passed"""
     parser = argparse.ArgumentParser(description="Staking CLI for Validators on Monad")
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        required=False,
+        help="Write RPC, getter, transaction and cache metrics in the Prometheus text format to this file on exit",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        required=False,
+        help="Write tracing spans of the phases of each operation (input, preflight, sign, send, receipt...) to this file",
+    )
+    parser.add_argument(
+        "--trace-format",
+        type=str,
+        choices=["jsonl", "otlp"],
+        default="jsonl",
+        help="Format of the --trace file: JSON lines appended as spans end, or an OTLP/JSON export written on exit",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record-rpc",
+        type=str,
+        required=False,
+        help="Record every JSON-RPC request and response of this run to a cassette file (gzip compressed when ending in .gz)",
+    )
+    cassette.add_argument(
+        "--replay-rpc",
+        type=str,
+        required=False,
+        help="Answer JSON-RPC requests from a recorded cassette file instead of the rpc_url, for offline and reproducible runs",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=str,
+        choices=["zero", "original"],
+        default="zero",
+        help="Latency of replayed responses: none, or the latency measured when recording",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run queries in this process even when a staking-cli serve daemon is running",
+    )
 
     # mandatory config path
     subparsers = parser.add_subparsers(dest="command")
@@ -12,6 +56,9 @@ def init_parser() -> argparse.ArgumentParser:
     add_validator_parser = subparsers.add_parser(
         "add-validator", help="Add a new validator to network"
     )
+    add_validators_parser = subparsers.add_parser(
+        "add-validators", help="Prepare registration calldata for many validators from a keys file"
+    )
     delegate_parser = subparsers.add_parser(
         "delegate", help="Delegate to a validator in the network"
     )
@@ -25,11 +72,29 @@ def init_parser() -> argparse.ArgumentParser:
     compound_parser = subparsers.add_parser(
         "compound-rewards", help="Compound rewards to validator"
     )
+    auto_compound_parser = subparsers.add_parser(
+        "auto-compound", help="Compound the rewards of all delegations periodically once they outweigh the fee"
+    )
     change_commission_parser = subparsers.add_parser(
         "change-commission", help="Change validator commission"
     )
+    batch_parser = subparsers.add_parser(
+        "batch", help="Run the operations listed in a CSV/YAML manifest"
+    )
+    sign_batch_parser = subparsers.add_parser(
+        "sign-batch", help="Sign the operations of a manifest offline for a later broadcast"
+    )
+    broadcast_parser = subparsers.add_parser(
+        "broadcast", help="Broadcast transactions signed with sign-batch"
+    )
+    keys_parser = subparsers.add_parser(
+        "keys", help="Generate or verify validator keys"
+    )
     query_parser = subparsers.add_parser("query", help="Query network information")
     tui_parser = subparsers.add_parser("tui", help="Use a menu-driven TUI")
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve queries and operations from a long-running daemon on a unix socket"
+    )
 
     # tui_parser
     tui_parser.add_argument(
@@ -71,6 +136,61 @@ def init_parser() -> argparse.ArgumentParser:
         help="Add a path to a config.toml file",
     )
 
+    # add_validators_parser
+    add_validators_parser.add_argument(
+        "--keys-file",
+        type=str,
+        required=True,
+        help="CSV or JSON file with columns: secp_privkey, bls_privkey, auth_address, amount, commission",
+    )
+    add_validators_parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="File to write the calldata (and signed transactions) to",
+    )
+    add_validators_parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        help="Number of processes building payloads (default: number of CPUs)",
+    )
+    add_validators_parser.add_argument(
+        "--sign",
+        action="store_true",
+        help="Also sign the transactions for a later broadcast",
+    )
+    add_validators_parser.add_argument(
+        "--nonce",
+        type=int,
+        required=False,
+        help="Nonce of the first transaction when signing, the following use consecutive nonces",
+    )
+    add_validators_parser.add_argument(
+        "--max-fee-gwei",
+        type=float,
+        required=False,
+        help="Max fee per gas (in gwei) for every transaction when signing",
+    )
+    add_validators_parser.add_argument(
+        "--priority-fee-gwei",
+        type=float,
+        required=False,
+        help="Max priority fee per gas (in gwei) for every transaction when signing",
+    )
+    add_validators_parser.add_argument(
+        "--gas-limit",
+        type=int,
+        required=False,
+        help="Gas limit for every transaction when signing (default: gas limit learned from earlier receipts)",
+    )
+    add_validators_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
     # delegate_parser
     delegate_parser.add_argument(
         "--validator-id",
@@ -185,6 +305,211 @@ def init_parser() -> argparse.ArgumentParser:
         help="Add a path to a config.toml file",
     )
 
+    # batch_parser
+    batch_parser.add_argument(
+        "--manifest",
+        type=str,
+        required=True,
+        help="CSV or YAML file with columns: operation, validator_id, amount, withdrawal_id, commission",
+    )
+    batch_parser.add_argument(
+        "--journal",
+        type=str,
+        required=False,
+        help="Journal file used to resume an interrupted run (default: <manifest>.journal.jsonl)",
+    )
+    batch_parser.add_argument(
+        "--report",
+        type=str,
+        required=False,
+        help="Write a CSV report with the status of every row",
+    )
+    batch_parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Do not ask for confirmation before submitting",
+    )
+    batch_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
+    # sign_batch_parser
+    sign_batch_parser.add_argument(
+        "--manifest",
+        type=str,
+        required=True,
+        help="CSV or YAML file with columns: operation, validator_id, amount, withdrawal_id, commission",
+    )
+    sign_batch_parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="File to write the signed transactions to",
+    )
+    sign_batch_parser.add_argument(
+        "--nonce",
+        type=int,
+        required=True,
+        help="Nonce of the first transaction, the following rows use consecutive nonces",
+    )
+    sign_batch_parser.add_argument(
+        "--max-fee-gwei",
+        type=float,
+        required=True,
+        help="Max fee per gas (in gwei) for every transaction",
+    )
+    sign_batch_parser.add_argument(
+        "--priority-fee-gwei",
+        type=float,
+        required=True,
+        help="Max priority fee per gas (in gwei) for every transaction",
+    )
+    sign_batch_parser.add_argument(
+        "--gas-limit",
+        type=int,
+        required=False,
+        help="Gas limit for every transaction (default: gas limits learned from earlier receipts)",
+    )
+    sign_batch_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
+    # broadcast_parser
+    broadcast_parser.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help="File with transactions signed by sign-batch",
+    )
+    broadcast_parser.add_argument(
+        "--report",
+        type=str,
+        required=False,
+        help="Write a CSV report with the status of every transaction",
+    )
+    broadcast_parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Do not ask for confirmation before broadcasting",
+    )
+    broadcast_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
+    # keys_parser
+    keys_subparser = keys_parser.add_subparsers(dest="keys")
+    keys_generate_parser = keys_subparser.add_parser(
+        "generate", help="Generate secp256k1 and BLS12-381 keys for new validators"
+    )
+    keys_generate_parser.add_argument(
+        "--count",
+        type=int,
+        required=True,
+        help="Number of validators to generate keys for",
+    )
+    keys_generate_parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="JSON file to write the keys to, never overwritten",
+    )
+    keys_generate_parser.add_argument(
+        "--keystore",
+        action="store_true",
+        help="Encrypt the private keys with a password (STAKING_KEYSTORE_PASSWORD env var or prompt)",
+    )
+    keys_generate_parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        help="Number of processes deriving keys (default: number of CPUs)",
+    )
+    keys_generate_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+    keys_verify_parser = keys_subparser.add_parser(
+        "verify", help="Verify that private keys derive the expected public keys"
+    )
+    keys_verify_parser.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help="JSON file written by keys generate, or a CSV/JSON keys file with secp_privkey, bls_privkey and the expected secp_pubkey, bls_pubkey, eth_address",
+    )
+    keys_verify_parser.add_argument(
+        "--workers",
+        type=int,
+        required=False,
+        help="Number of processes deriving keys (default: number of CPUs)",
+    )
+    keys_verify_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
+    # auto_compound_parser
+    auto_compound_parser.add_argument(
+        "--min-reward-ratio",
+        type=float,
+        required=False,
+        help="Compound a delegation when its rewards reach this many times the max fee of the transaction (default: [auto_compound] min_reward_ratio, or 10)",
+    )
+    auto_compound_parser.add_argument(
+        "--interval",
+        type=float,
+        required=False,
+        help="Seconds between scans (default: [auto_compound] interval, or 3600)",
+    )
+    auto_compound_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Scan and compound once, then exit",
+    )
+    auto_compound_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Log the compounds that would be sent without sending them",
+    )
+    auto_compound_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
+    # serve_parser
+    serve_parser.add_argument(
+        "--socket",
+        type=str,
+        required=False,
+        help="Unix socket to listen on (default: [serve] socket of the config, or serve.sock in the state dir)",
+    )
+    serve_parser.add_argument(
+        "--read-only",
+        action="store_true",
+        help="Serve queries only, without loading the signer",
+    )
+    serve_parser.add_argument(
+        "--config-path",
+        type=str,
+        default="./config.toml",
+        help="Add a path to a config.toml file",
+    )
+
     # query_parser
     query_subparser = query_parser.add_subparsers(dest="query")
     val_info_parser = query_subparser.add_parser(
@@ -1,13 +1,17 @@
-from web3 import Web3
 from staking_sdk_py.callGetters import call_getter
+from staking_sdk_py.rpcPolicy import RetryPolicy
 from src.logger import init_logging
+from src.rpc import get_w3
 from time import sleep
+from web3.exceptions import ContractLogicError
 
 MAXIMUM_TRIES = 1000
+# backoff before fetching a failed page again, on top of the retries of each request
+PAGE_RETRY = RetryPolicy(attempts=5, base_delay=0.5, max_delay=5.0)
 
 def get_validator_info(config, val_id):
     # query validator information
-    w3 = Web3(Web3.HTTPProvider(config['rpc_url']))
+    w3 = get_w3(config)
     val_info = call_getter(w3, 'get_validator', config['contract_address'], val_id)
     return val_info
 
@@ -19,99 +23,87 @@ def validator_exists(val_info: tuple) -> bool:
 def get_validator_set(config: dict, type: str = "consensus") -> tuple:
     log = init_logging(config["log_level"].upper())
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    is_done = False
-    start_index = 0
-    validator_set = []
-    tries = 0
-    while not is_done:
-        get_validator_set_response = call_getter(w3,f'get_{type}_valset', contract_address, start_index)
-        is_done = get_validator_set_response[0]
-        start_index = get_validator_set_response[1]
-        for val_id in get_validator_set_response[2]:
-            validator_set.append(val_id)
-        sleep(0.1)
-        tries = tries + 1
-        if tries >= MAXIMUM_TRIES:
-           break 
+    w3 = get_w3(config)
+    validator_set = _paginate(
+        log, f"{type} validator set", lambda start_index: call_getter(w3, f'get_{type}_valset', contract_address, start_index), 0
+    )
     log.debug(f"Validator Set: {validator_set}")
     return validator_set
 
 def get_delegator_info(config: dict, val_id: int, delegator_address: str):
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     delegator_info = call_getter(w3,'get_delegator', contract_address, val_id, delegator_address)
     return delegator_info
 
 def get_withdrawal_info(config: dict, validator_id: str, delegator_address: str, withdrawal_id: int):
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     withdrawal_request = call_getter(w3, 'get_withdrawal_request', contract_address, validator_id, delegator_address, withdrawal_id)
     return withdrawal_request
 
 def get_delegators_list(config: dict, validator_id: int):
     log = init_logging(config["log_level"].upper())
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    start_address = "0x0000000000000000000000000000000000000000"
-    is_done = False
-    delegators = []
-    tries = 0
-    while not is_done:
-        get_delegators_response = call_getter(w3, 'get_delegators', contract_address, validator_id, start_address)
-        is_done = get_delegators_response[0]
-        start_address = get_delegators_response[1]
-        log.debug(f"Fetched {len(get_delegators_response[2])} delegators, fetching more addresses = {is_done}")
-        for address in get_delegators_response[2]:
-            delegators.append(address)
-        sleep(0.1)
-        if tries >= MAXIMUM_TRIES:
-           break 
-    return delegators
+    w3 = get_w3(config)
+    return _paginate(
+        log,
+        "delegators",
+        lambda start_address: call_getter(w3, 'get_delegators', contract_address, validator_id, start_address),
+        "0x0000000000000000000000000000000000000000",
+    )
 
 def get_validators_list(config: dict, delegator_address: str):
     log = init_logging(config["log_level"].upper())
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
-    is_done = False
-    start_index = 0
-    validators = []
-    tries = 0
-    while not is_done:
-        get_delegations_response = call_getter(w3, 'get_delegations', contract_address, delegator_address, start_index)
-        is_done = get_delegations_response[0]
-        start_index = get_delegations_response[1]
-        log.debug(f"Fetched {len(get_delegations_response[2])} validators, fetching more validators = {is_done}")
-        for validator in get_delegations_response[2]:
-            validators.append(validator)
-        sleep(0.1)
-        if tries >= MAXIMUM_TRIES:
-           break 
-    return validators
+    w3 = get_w3(config)
+    return _paginate(
+        log, "validators", lambda start_index: call_getter(w3, 'get_delegations', contract_address, delegator_address, start_index), 0
+    )
+
+def _paginate(log, name: str, fetch_page, cursor) -> list:
+    """
+    Items of a paginated getter, fetched page after page from cursor. A page still
+    failing after the RPC retries is fetched again from its own cursor after a backoff,
+    so a long scan keeps the pages it already has instead of starting over.
+    """
+    items = []
+    failures = 0
+    for _ in range(MAXIMUM_TRIES):
+        try:
+            is_done, next_cursor, page = fetch_page(cursor)
+        except ContractLogicError:
+            raise
+        except Exception as e:
+            failures += 1
+            if failures >= PAGE_RETRY.attempts:
+                raise
+            log.warning(f"Fetching {name} from {cursor} failed ({e}), retrying the page")
+            sleep(PAGE_RETRY.delay(failures))
+            continue
+        failures = 0
+        items.extend(page)
+        log.debug(f"Fetched {len(page)} {name}, {len(items)} so far, done = {is_done}")
+        if is_done:
+            break
+        cursor = next_cursor
+    return items
 
 def get_epoch_info(config: dict):
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     epoch_info = call_getter(w3,'get_epoch', contract_address)
     return epoch_info
 
 def get_proposer_val_id(config: dict):
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     val_id = call_getter(w3,'get_proposer_val_id', contract_address)
     return val_id
     
 def get_tx_by_hash(config: dict, tx_hash: str):
-    rpc_url = config["rpc_url"]
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
+        w3 = get_w3(config)
         tx = w3.eth.get_transaction(tx_hash)
         return tx
     except Exception as e:
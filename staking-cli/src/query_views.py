@@ -0,0 +1,165 @@
+from rich.console import Console
+from rich.table import Table
+
+# printers of the query command, kept free of web3 imports so that a query forwarded
+# to the serve daemon starts quickly
+
+console = Console()
+
+QUERY_PARAMS = ("validator_id", "delegator_address", "withdrawal_id", "type")
+
+
+def query_params(args) -> dict:
+    """Arguments of a query sub-command"""
+    return {name: getattr(args, name) for name in QUERY_PARAMS if hasattr(args, name)}
+
+
+def print_validator(val_info, val_id, verbose):
+    # print in validator info in table
+    val_fields = [
+        ("AuthAddress", ""),
+        ("flags", ""),
+        ("Execution View: Stake", "wei"),
+        ("Accumulated rewards per token", "wei"),
+        ("Execution View: Commission", "%"),
+        ("Unclaimed Rewards", "wei"),
+        ("Consensus View: Stake", "wei"),
+        ("Consensus View: Commission", "%"),
+        ("Snapshot View: Stake", "wei"),
+        ("Snapshot View: Commission", "%"),
+        ("secp Pubkey", ""),
+        ("bls Pubkey", ""),
+    ]
+
+    table = Table(title=f"Validator Info of: [red]val-id {val_id}[/]")
+    table.add_column("Field", style="yellow")
+    table.add_column("Value", style="cyan")
+    console = Console()
+    if verbose:
+        for i in range(0, len(val_info)):
+            # print(val_info[i]) # for debugging
+            if type(val_info[i]) != bytes:
+                if val_fields[i][0] == "flags":
+                    pass
+                elif val_fields[i][0] == "Accumulated rewards per token":
+                    table.add_row(
+                        val_fields[i][0],
+                        str(val_info[i] / 10**36) + f" {val_fields[i][1]}",
+                    )
+                elif "Commission" in val_fields[i][0] and val_fields[i][1] == "%":
+                    commission_percentage = val_info[i] / (10**16)
+                    table.add_row(
+                        val_fields[i][0],
+                        f"{commission_percentage:.2f} {val_fields[i][1]}",
+                    )
+                else:
+                    table.add_row(
+                        val_fields[i][0], str(val_info[i]) + f" {val_fields[i][1]}"
+                    )
+            else:
+                table.add_row(
+                    val_fields[i][0], str(val_info[i].hex()) + f" {val_fields[i][1]}"
+                )
+        console.print(table)
+    else:
+        console.print(
+            f"[cyan bold]{val_id}:[/cyan bold] [red]{val_info[10].hex()}[/red]"
+        )
+
+
+def print_delegator_info(delegator_info):
+    table = Table(title="Delegator Status", show_header=False, expand=True)
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="green")
+    delegator_fields = [
+        ("Stake", "wei"),
+        ("Accumulated rewards per token", "wei"),
+        ("Total Rewards", "wei"),
+        ("Delta Stake", "wei"),
+        ("Next Delta Stake", "wei"),
+        ("Delta Epoch", ""),
+        ("Next Delta Epoch", ""),
+    ]
+
+    for i in range(0, len(delegator_info)):
+        # print(delegator_info[i]) # for debugging
+        if type(delegator_info[i]) != bytes:
+            if delegator_fields[i][0] == "Accumulated rewards per token":
+                table.add_row(
+                    delegator_fields[i][0],
+                    str(delegator_info[i] / 10**36) + f" {delegator_fields[i][1]}",
+                )
+            else:
+                table.add_row(
+                    delegator_fields[i][0],
+                    str(delegator_info[i]) + f" {delegator_fields[i][1]}",
+                )
+        else:
+            table.add_row(
+                delegator_fields[i][0],
+                str(delegator_info[i].hex()) + f" {delegator_fields[i][1]}",
+            )
+
+    console.print(table)
+
+
+def print_withdrawal_info(withdrawal_info):
+    if not withdrawal_info or withdrawal_info[0] == 0:
+        console.print("[bold red]❌ No withdrawal request found for this ID![/]")
+        console.print(
+            "[yellow]💡 You need to call undelegate first to create a withdrawal request or wait for 2 epochs after undelegation.[/]"
+        )
+        return
+
+    withdrawal_amount = withdrawal_info[0]
+    withdrawal_epoch = withdrawal_info[2]
+    console.print(
+        f"[bold green]✅ Withdrawal request found - Amount: {withdrawal_amount}, Epoch: {withdrawal_epoch}[/]"
+    )
+
+
+def print_delegators(delegators, val_id):
+    console = Console()
+    table = Table()
+    table.add_column(f"[red]{len(delegators)}[/] Delegators for [red bold]val-id: {val_id}[/]")
+    for delegator in delegators:
+        table.add_row(delegator, style="cyan")
+    console.print(table)
+
+
+def print_epoch(epoch_info):
+    console = Console()
+    table = Table()
+    table.add_column("Field")
+    table.add_column("Value")
+    table.add_row("Epoch", str(epoch_info[0]))
+    table.add_row("In Epoch Delay Period", str(epoch_info[1]))
+    console.print(table)
+
+    
+def print_proposer(proposer_info):
+    console = Console()
+    table = Table()
+    table.add_column("Field")
+    table.add_column("Value")
+    table.add_row("Validator ID", str(proposer_info[0]))
+    console.print(table)
+
+
+def print_query_result(query: str, result: dict):
+    """Prints the data of a query command, fetched locally or by the serve daemon"""
+    if query == "validator":
+        print_validator(result["validator"], result["validator_id"], True)
+    elif query == "delegator":
+        print_delegator_info(result["delegator"])
+    elif query == "withdrawal-request":
+        print_withdrawal_info(result["withdrawal_request"])
+    elif query in ("validator-set", "delegations"):
+        for val_id, val_info in result["validators"]:
+            print_validator(val_info, val_id, False)
+    elif query == "delegators":
+        print_delegators(result["delegators"], result["validator_id"])
+    elif query == "epoch":
+        print_epoch(result["epoch"])
+    elif query == "proposer-val-id":
+        print_proposer(result["proposer"])
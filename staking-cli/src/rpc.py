@@ -0,0 +1,73 @@
+from typing import Optional
+
+from web3 import Web3
+from staking_sdk_py.rpcCassette import Cassette
+from staking_sdk_py.rpcPolicy import RetryPolicy
+from staking_sdk_py.rpcProvider import MultiEndpointProvider, connect_endpoints
+from src.logger import init_logging
+
+# one connection per RPC url and process, shared by all commands and queries
+_connections = {}
+# cassette of --record-rpc or --replay-rpc, used by every connection
+_cassette: Optional[Cassette] = None
+
+
+def use_cassette(cassette: Optional[Cassette]):
+    global _cassette
+    _cassette = cassette
+    _connections.clear()
+
+
+def close_cassette():
+    if _cassette is not None:
+        _cassette.close()
+
+
+def rpc_urls(config: dict) -> list:
+    """rpc_url followed by the extra endpoints of [rpc] urls"""
+    urls = [config["rpc_url"]]
+    for url in config.get("rpc", {}).get("urls", []):
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+
+def retry_policy(options: dict) -> RetryPolicy:
+    """Timeouts and retries of the [rpc] section"""
+    return RetryPolicy(
+        attempts=options.get("retries", 3),
+        base_delay=options.get("retry_base_delay_ms", 100) / 1000,
+        max_delay=options.get("retry_max_delay_ms", 2000) / 1000,
+        timeout=options.get("timeout", 10),
+        method_timeouts=options.get("method_timeouts", {}),
+    )
+
+
+def get_w3(config: dict) -> Web3:
+    """
+    Web3 instance for the rpc_url of the config, instrumented for --metrics-file, with
+    the [rpc] timeouts, retries and circuit breaker, and spread over the [rpc] urls
+    endpoints when there are some
+    """
+    rpc_url = config["rpc_url"]
+    if rpc_url not in _connections:
+        options = config.get("rpc", {})
+        w3 = connect_endpoints(
+            rpc_urls(config),
+            cassette=_cassette,
+            chain_id=config.get("chain_id"),
+            hedge=options.get("hedge", False),
+            hedge_min_delay=options.get("hedge_min_delay_ms", 50) / 1000,
+            health_check_interval=options.get("health_check_interval", 10),
+            max_block_lag=options.get("max_block_lag", 5),
+            policy=retry_policy(options),
+            failure_threshold=options.get("circuit_failure_threshold", 5),
+            reset_timeout=options.get("circuit_reset_timeout", 30),
+        )
+        if isinstance(w3.provider, MultiEndpointProvider):
+            log = init_logging(config["log_level"].upper())
+            for status in w3.provider.start():
+                if not status["healthy"]:
+                    log.warning(f"RPC endpoint {status['url']} is not used: {status['last_error']}")
+        _connections[rpc_url] = w3
+    return _connections[rpc_url]
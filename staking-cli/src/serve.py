@@ -0,0 +1,232 @@
+import json
+import os
+import signal
+import socketserver
+import stat
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Optional
+
+from staking_sdk_py.events import decode_events
+from staking_sdk_py.generateTransaction import send_transaction
+from staking_sdk_py.metrics import METRICS
+from staking_sdk_py.receiptTracker import normalize_tx_hash, wait_for_receipt
+from staking_sdk_py.signer_factory import Signer
+from src.batch import ManifestError, build_calldata, normalize_row, preflight
+from src.helpers import observe_gas, print_signer_notice, transaction_options
+from src.logger import init_logging
+from src.query_menu import fetch_query
+from src.rpc import get_w3
+from src.serve_client import DaemonUnavailable, encode_value, network, request, socket_path
+from staking_sdk_py import tracing
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # connecting to a unix socket with a full backlog fails at once instead of waiting
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    daemon: "StakingDaemon"
+
+    def address_string(self):
+        # unix socket peers have no address
+        return "local"
+
+    def log_message(self, format, *args):
+        self.daemon.log.debug(format % args)
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.daemon.health())
+        elif self.path == "/metrics":
+            data = METRICS.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        if not isinstance(body, dict):
+            self._send(400, {"error": "The body must be a JSON object"})
+            return
+        handlers = {"/query": self.daemon.query, "/operation": self.daemon.operation}
+        if self.path not in handlers:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        self._send(*handlers[self.path](body))
+
+
+class StakingDaemon:
+    """
+    Serves the query and operation surface of the CLI on a unix socket, as a JSON API
+    over HTTP. The RPC connections, fee oracle, gas profile and signer are created once
+    and shared by every request, each handled in its own thread.
+
+    POST /query {"query": "epoch", "params": {...}} answers {"result": ...}, the data a
+    query sub-command prints. POST /operation {"operation": "delegate", "validator_id":
+    1, "amount": 10} (fields of a batch manifest row) sends a transaction and answers
+    with its receipt and events. GET /health and GET /metrics describe the daemon.
+    Requests carrying a "network" that is not the daemon's are answered with 409.
+    """
+
+    def __init__(self, config: dict, signer: Optional[Signer] = None):
+        self.config = config
+        self.signer = signer
+        self.log = init_logging(config["log_level"].upper())
+        self.network = network(config)
+        self.started = time.time()
+        # operations are preflighted and sent one at a time, receipts are awaited concurrently
+        self.send_lock = threading.Lock()
+        self.server: Optional[_UnixHTTPServer] = None
+
+    def warm_up(self):
+        """Opens the RPC connections and loads the signer address, fee oracle and gas profile"""
+        w3 = get_w3(self.config)
+        w3.eth.block_number
+        if self.signer is not None:
+            transaction_options(self.config, w3, self.signer)
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "network": self.network,
+            "address": self.signer.get_address() if self.signer is not None else None,
+            "uptime": round(time.time() - self.started, 1),
+        }
+
+    def _other_network(self, body: dict) -> Optional[str]:
+        requested = body.get("network")
+        if requested is not None and requested != self.network:
+            return f"The daemon serves {self.network}, not {requested}"
+        return None
+
+    def query(self, body: dict) -> tuple:
+        error = self._other_network(body)
+        if error:
+            return 409, {"error": error}
+        try:
+            result = fetch_query(self.config, body.get("query"), body.get("params") or {})
+        except (LookupError, ValueError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self.log.error(f"Query {body.get('query')} failed: {e!r}")
+            return 500, {"error": str(e)}
+        return 200, {"result": encode_value(result)}
+
+    def operation(self, body: dict) -> tuple:
+        error = self._other_network(body)
+        if error:
+            return 409, {"error": error}
+        if self.signer is None:
+            return 403, {"error": "The daemon was started with --read-only"}
+        try:
+            row = normalize_row(0, body)
+        except ManifestError as e:
+            # drop the "Row 0: " of manifest errors
+            return 400, {"error": str(e).split(": ", 1)[-1]}
+        try:
+            result = self.run_operation(row)
+        except Exception as e:
+            self.log.error(f"{row['operation']} failed: {e!r}")
+            return 500, {"error": str(e)}
+        del result["row"]
+        return 200, {"result": encode_value(result)}
+
+    @tracing.operation("serve-operation")
+    def run_operation(self, row: dict) -> dict:
+        contract_address = self.config["contract_address"]
+        w3 = get_w3(self.config)
+        delegator_address = self.signer.get_address()
+        tx_options = transaction_options(self.config, w3, self.signer)
+
+        # checked and sent under one lock: two operations spending the same stake or
+        # withdrawal id cannot both pass preflight before either is sent
+        with self.send_lock:
+            tracing.phase("preflight")
+            errors = preflight(w3, contract_address, delegator_address, [row])
+            if errors:
+                return dict(row, status="skipped", error=errors[row["row"]])
+            calldata, value = build_calldata(row)
+            tracing.phase("transaction")
+            tx_hash = send_transaction(w3, self.signer, contract_address, calldata, self.config["chain_id"], value, **tx_options)
+        self.log.info(f"{row['operation']} on validator {row['validator_id']} sent: {normalize_tx_hash(tx_hash)}")
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
+        return dict(
+            row,
+            status="confirmed" if receipt.status == 1 else "reverted",
+            tx_hash=normalize_tx_hash(tx_hash),
+            block_number=receipt.blockNumber,
+            gas_limit=observe_gas(self.config, receipt),
+            gas_used=receipt.gasUsed,
+            events=decode_events(receipt, contract_address),
+        )
+
+    def listen(self, path: str):
+        """Binds the socket, readable and writable by the current user only"""
+        try:
+            request(path, "GET", "/health", timeout=1)
+        except DaemonUnavailable:
+            if os.path.exists(path):
+                # only a socket left behind by a daemon is removed, never another file
+                if not stat.S_ISSOCK(os.stat(path).st_mode):
+                    raise RuntimeError(f"{path} exists and is not a socket")
+                os.unlink(path)
+        else:
+            raise RuntimeError(f"A daemon is already serving on {path}")
+        handler = type("StakingDaemonHandler", (_Handler,), {"daemon": self})
+        umask = os.umask(0o177)
+        try:
+            self.server = _UnixHTTPServer(path, handler)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self):
+        """Serves until SIGINT or SIGTERM, then removes the socket"""
+        stopped = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stopped.set())
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        stopped.wait()
+        self.server.shutdown()
+        self.server.server_close()
+        os.unlink(self.server.server_address)
+
+
+def serve_cli(config: dict, signer: Optional[Signer], path: Optional[str] = None):
+    log = init_logging(config["log_level"].upper())
+    path = path or socket_path(config)
+    daemon = StakingDaemon(config, signer)
+    try:
+        daemon.warm_up()
+        daemon.listen(path)
+    except Exception as e:
+        log.error(f"Error while starting the daemon: {e}")
+        return
+    if signer is not None:
+        print_signer_notice(signer)
+        log.info(f"Operations are signed by {signer.get_address()}")
+    else:
+        log.info("Read-only: operations are refused")
+    log.info(f"Serving {config['rpc_url']} on {path}, stop with Ctrl+C")
+    daemon.serve_forever()
+    log.info("Daemon stopped")
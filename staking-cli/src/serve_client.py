@@ -0,0 +1,107 @@
+import http.client
+import json
+import os
+import socket
+from typing import Optional, Tuple
+
+from src.logger import init_logging
+from src.query_views import print_query_result, query_params
+from src.state import state_path
+
+# kept free of web3 imports: a query forwarded to the daemon must not pay for them
+
+CONNECT_TIMEOUT = 0.5
+# validator set scans page through the whole set
+REQUEST_TIMEOUT = 300
+
+
+class DaemonUnavailable(ConnectionError):
+    """No serve daemon answers on the socket, or it serves another network"""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(CONNECT_TIMEOUT)
+        self.sock.connect(self.socket_path)
+        self.sock.settimeout(self.timeout)
+
+
+def socket_path(config: dict) -> str:
+    """Unix socket of the serve daemon ([serve] socket, default: serve.sock in the state dir)"""
+    path = config.get("serve", {}).get("socket")
+    return os.path.expanduser(path) if path else state_path(config, "serve.sock")
+
+
+def network(config: dict) -> dict:
+    """What a daemon must serve for a client to use it"""
+    return {
+        "rpc_url": config["rpc_url"],
+        "contract_address": config["contract_address"].lower(),
+        "chain_id": config.get("chain_id"),
+    }
+
+
+def encode_value(value):
+    """JSON value of getter results: bytes become {"bytes": hex}, tuples lists"""
+    if isinstance(value, bytes):
+        return {"bytes": value.hex()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    return value
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        if list(value) == ["bytes"]:
+            return bytes.fromhex(value["bytes"])
+        return {key: decode_value(item) for key, item in value.items()}
+    return value
+
+
+def request(path: str, method: str, url: str, body: Optional[dict] = None, timeout: float = REQUEST_TIMEOUT) -> Tuple[int, dict]:
+    """Sends a JSON request to the daemon, returns the HTTP status and the JSON answer"""
+    if not os.path.exists(path):
+        raise DaemonUnavailable(f"No daemon socket at {path}")
+    connection = _UnixHTTPConnection(path, timeout)
+    try:
+        data = json.dumps(body).encode() if body is not None else None
+        connection.request(method, url, body=data, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    except (ConnectionRefusedError, FileNotFoundError) as e:
+        # socket file left behind by a daemon that did not exit cleanly
+        raise DaemonUnavailable(f"No daemon listening on {path}: {e}")
+    finally:
+        connection.close()
+
+
+def forward_query(config: dict, args) -> bool:
+    """
+    Runs a query sub-command through the serve daemon when one serves this network,
+    printing its result. Returns False when the query must run in this process.
+    """
+    log = init_logging(config["log_level"].upper())
+    path = socket_path(config)
+    body = {"query": args.query, "params": query_params(args), "network": network(config)}
+    try:
+        status, answer = request(path, "POST", "/query", body)
+    except (OSError, ValueError) as e:
+        log.debug(f"Not using the serve daemon: {e}")
+        return False
+    if status == 409:
+        log.debug(f"Not using the serve daemon: {answer.get('error')}")
+        return False
+    if status != 200:
+        log.error(f"Error! {answer.get('error')}")
+        return True
+    print_query_result(args.query, decode_value(answer["result"]))
+    return True
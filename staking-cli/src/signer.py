@@ -1,6 +1,7 @@
 import os
 
 from staking_sdk_py.signer_factory import Signer, LocalSigner, LedgerSigner
+from src.state import state_path
 from src.logger import init_logging
 
 
@@ -23,8 +24,9 @@ def create_signer(config: dict) -> Signer:
             raise ValueError(
                 "private_key is required as FUNDED_ADDRESS_PRIVATE_KEY env var or in config file"
             )
-        log.debug(f"Local signer initialized")
-        return LocalSigner(private_key)
+        signer = LocalSigner(private_key, config["staking"].get("signing_backend"))
+        log.debug(f"Local signer initialized with {signer.backend} backend")
+        return signer
 
     elif staking_type == "ledger":
         log.debug(f"Initializing ledger signer")
@@ -36,7 +38,7 @@ def create_signer(config: dict) -> Signer:
                 "derivation_path is required as DERIVATION_PATH env var or in config file"
             )
         log.debug(f"Ledger signer initialized")
-        return LedgerSigner(derivation_path)
+        return LedgerSigner(derivation_path, state_path(config, "ledger_addresses.json"))
 
     else:
         raise ValueError(
@@ -0,0 +1,10 @@
+import os
+
+DEFAULT_STATE_DIR = "~/.staking-cli"
+
+
+def state_path(config: dict, name: str) -> str:
+    """Path of a file or directory kept in the CLI state dir (config key: state_dir)"""
+    state_dir = os.path.expanduser(config.get("state_dir", DEFAULT_STATE_DIR))
+    os.makedirs(state_dir, exist_ok=True)
+    return os.path.join(state_dir, name)
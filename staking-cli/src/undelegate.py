@@ -1,15 +1,19 @@
-from web3 import Web3
 from staking_sdk_py.generateCalldata import undelegate
 from staking_sdk_py.callGetters import call_getter
+from staking_sdk_py.preflight import preflight
 from staking_sdk_py.signer_factory import Signer
+from staking_sdk_py.receiptTracker import wait_for_receipt
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from src.helpers import number_prompt, val_id_prompt, amount_prompt, wei, count_zeros, confirmation_prompt, send_transaction
+from src.helpers import number_prompt, val_id_prompt, amount_prompt, wei, count_zeros, confirmation_prompt, send_transaction, observe_gas, format_gas, receipt_events, format_event
 from src.logger import init_logging
+from src.rpc import get_w3
+from staking_sdk_py import tracing
 
 console = Console()
 
+@tracing.operation("undelegate")
 def undelegate_from_validator(config: dict, signer: Signer):
     log = init_logging(config["log_level"])
     # read config
@@ -18,12 +22,13 @@ def undelegate_from_validator(config: dict, signer: Signer):
     chain_id = config["chain_id"]
 
     # ===== UNDELEGATION PARAMETERS  =====
+    tracing.phase("input")
     delegation_amount = amount_prompt(config, description="to undelegate from validator")
     amount = wei(delegation_amount)
     validator_id = str(val_id_prompt(config))
     withdrawal_id = int(number_prompt("Enter Withdrawal ID", default="33"))
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     delegator_address = signer.get_address()
 
     table = Table(show_header=False,
@@ -46,38 +51,25 @@ def undelegate_from_validator(config: dict, signer: Signer):
 
     if is_confirmed:
         # PREFLIGHT CHECKS
+        tracing.phase("preflight")
         console.print(Panel("[bold yellow]Running Preflight Checks...[/]", title="[bold red]Preflight[/]", border_style="yellow"))
-        # 1. Check if withdrawal request already exists
         try:
-            withdrawal_request = call_getter(w3, 'get_withdrawal_request', contract_address, validator_id, delegator_address, withdrawal_id)
-            log.debug(f"Existing withdrawal request check: {withdrawal_request}")
-            if withdrawal_request and withdrawal_request[0] > 0:
-                log.error("Withdrawal request already exists for this ID!")
-                return
-            else:
-                log.debug("✅ No existing withdrawal request - can proceed")
+            report = preflight(w3, contract_address, "undelegate", validator_id, delegator_address, amount, withdrawal_id)
         except Exception as e:
-            log.error(f"Encountered error while checking withdrawals: {e}")
+            log.error(f"Encountered error while running preflight checks: {e}")
             return
-
-    # 2. Check delegator balance
-        try:
-            delegator_info = call_getter(w3, 'get_delegator', contract_address, int(validator_id), delegator_address)
-            current_stake = delegator_info[0] if delegator_info else 0  # activeStake field
-            if current_stake < amount:
-                log.error(f"Insufficient stake! Current: {current_stake}, Requested: {amount}")
-                console.print(f"Delegator Info: {delegator_info}")
-                return
-            else:
-                log.debug(f"✅ Sufficient stake available: {current_stake}")
-        except Exception as e:
-            log.error(f"Error checking delegator info: {e}")
+        if not report.ok:
+            for error in report.errors:
+                log.error(error)
+            console.print(f"Delegator Info: {report.delegator}")
             return
+        log.debug(f"✅ Sufficient stake available: {report.active_stake}")
 
         preflight_panel = Panel(
-            '''
+            f'''
             [cyan]Withdrawal request status:[/] [green]Clear ✅[/]
             [cyan]Delegator stake balance:[/] [green]Sufficient ✅[/]
+            [cyan]Checked at block:[/] [green]{report.block_number}[/]
             [cyan]Ready to proceed with undelegation[/]
             ''',
             title="[bold green]Preflight Results[/]",
@@ -93,22 +85,33 @@ def undelegate_from_validator(config: dict, signer: Signer):
             console.print(f"\n\n[cyan]Generated calldata:[/] [green]{calldata_undelegate}[/]")
 
         try:
-            tx_hash = send_transaction(w3, signer, contract_address, calldata_undelegate, chain_id, 0)
-            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            tracing.phase("transaction")
+            tx_hash = send_transaction(w3, signer, contract_address, calldata_undelegate, chain_id, 0, config=config)
+            tracing.phase("wait_receipt")
+            receipt = wait_for_receipt(w3, tx_hash)
         except Exception as e:
            console.print(f"Error! while sending tx: {e}")
            return
+        gas_limit = observe_gas(config, receipt)
 
         if config["log_level"] == "debug":
             console.print(f'\n\n[bold green]Transaction receipt:[/] {receipt}')
 
         # Check withdrawal request was created
-        withdrawal_request_after = call_getter(w3, 'get_withdrawal_request', contract_address, validator_id, delegator_address, withdrawal_id)
+        tracing.phase("post_check")
+        events = receipt_events(config, receipt, "Undelegate")
+        if events:
+            withdrawal_amount, withdrawal_epoch = events[0]["amount"], events[0]["activationEpoch"]
+        else:
+            # no Undelegate log in the receipt, read the withdrawal request instead
+            withdrawal_request_after = call_getter(w3, 'get_withdrawal_request', contract_address, validator_id, delegator_address, withdrawal_id)
+            withdrawal_amount = withdrawal_request_after[0] if withdrawal_request_after else 0
+            withdrawal_epoch = withdrawal_request_after[2] if withdrawal_request_after else 0
 
         validation_panel = Panel(
             f'''
-            [cyan]Withdrawal request amount:[/] [green]{withdrawal_request_after[0] if withdrawal_request_after else 0}[/]
-            [cyan]Withdrawal epoch:[/] [green]{withdrawal_request_after[2] if withdrawal_request_after else 0}[/]
+            [cyan]Withdrawal request amount:[/] [green]{withdrawal_amount}[/]
+            [cyan]Withdrawal epoch:[/] [green]{withdrawal_epoch}[/]
             ''',
             title="[bold green]Undelegation Complete[/]",
             border_style="green",
@@ -123,57 +126,50 @@ def undelegate_from_validator(config: dict, signer: Signer):
         tx_table.add_row("Status", "✅ Success" if receipt.status == 1 else "❌ Failed")
         tx_table.add_row("Transaction Hash", "0x"+receipt.transactionHash.hex())
         tx_table.add_row("Block Number", str(receipt.blockNumber))
+        tx_table.add_row("Gas Limit (Estimated)", format_gas(gas_limit))
         tx_table.add_row("Gas Used", f"{receipt.gasUsed:,}")
         tx_table.add_row("From", receipt['from'])
         tx_table.add_row("To (Contract)", receipt.to)
         console.print(tx_table)
 
+@tracing.operation("undelegate")
 def undelegate_from_validator_cli(config: dict, signer: Signer, val_id: int, amount: int, withdrawal_id: int):
     log = init_logging(config["log_level"])
     contract_address = config["contract_address"]
-    rpc_url = config["rpc_url"]
     chain_id = config["chain_id"]
 
-    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    w3 = get_w3(config)
     delegator_address = signer.get_address()
 
-    # check withdrawal id is usable
+    tracing.phase("preflight")
+    amount = wei(amount)
     try:
-        withdrawal_request = call_getter(w3, 'get_withdrawal_request', contract_address, val_id, delegator_address, withdrawal_id)
-        log.debug(f"Existing withdrawal request check: {withdrawal_request}")
-        if withdrawal_request and withdrawal_request[0] > 0:
-            log.error("Withdrawal request already exists for this ID!")
-            return
-        else:
-            log.debug("✅ No existing withdrawal request - can proceed")
+        report = preflight(w3, contract_address, "undelegate", val_id, delegator_address, amount, withdrawal_id)
     except Exception as e:
-        log.error(f"Encountered error while checking withdrawals: {e}")
+        log.error(f"Encountered error while running preflight checks: {e}")
         return
-
-    # check if stake is greater than undelegate amount
-    try:
-        delegator_info = call_getter(w3, 'get_delegator', contract_address, int(val_id), delegator_address)
-        current_stake = delegator_info[0] if delegator_info else 0  # activeStake field
-        if current_stake < amount:
-            log.error(f"Insufficient stake! Current: {current_stake}, Requested: {amount}")
-            log.error(f"Delegator Info: {delegator_info}")
-            return
-        else:
-            log.debug(f"✅ Sufficient stake available: {current_stake}")
-    except Exception as e:
-        log.error(f"Error checking delegator info: {e}")
+    if not report.ok:
+        for error in report.errors:
+            log.error(error)
+        log.error(f"Delegator Info: {report.delegator}")
         return
+    log.debug(f"✅ Sufficient stake available: {report.active_stake}")
 
-    amount = wei(amount)
     calldata_undelegate = undelegate(int(val_id), amount, withdrawal_id)
     log.debug(calldata_undelegate)
 
     # send tx
     try:
-        tx_hash = send_transaction(w3, signer, contract_address, calldata_undelegate, chain_id, 0)
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        tracing.phase("transaction")
+        tx_hash = send_transaction(w3, signer, contract_address, calldata_undelegate, chain_id, 0, config=config)
+        tracing.phase("wait_receipt")
+        receipt = wait_for_receipt(w3, tx_hash)
     except Exception as e:
         log.error(f"Error while sending tx: {e}")
         return
+    gas_limit = observe_gas(config, receipt)
     log.info(f"Tx status: {receipt.status}")
     log.info(f"Tx hash: 0x{receipt.transactionHash.hex()}")
+    log.info(f"Gas limit: {format_gas(gas_limit)}, used: {receipt.gasUsed:,}")
+    for event in receipt_events(config, receipt, "Undelegate"):
+        log.info(format_event(event))